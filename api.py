@@ -1,15 +1,20 @@
 import os
+import re
+import sys
+import csv
 import json
-import tempfile
+import shutil
+import zipfile
 import logging
+import multiprocessing
+import threading
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file, url_for
 from werkzeug.utils import secure_filename
-from src.basic_recom import BasicRecommendations
-from src.adv_recom import AdvancedRecommendations
 
-# Configure logging
+# Configure logging (before importing the pipeline modules, which set up their own defaults)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -17,19 +22,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ontology-api")
 
+from src.job_manager import JobManager, EvaluationJob, JobQueueFullError
+from src.result_cache import ResultCache, hash_file, hash_files, make_key
+from src.workspace import Workspace
+from src.upload_store import UploadStore, UploadError, UploadOffsetError, is_allowed_upload, split_filename
+from src.engine_client import EnginePool, EngineUnavailableError
+
+# The pipeline stages in src/ import each other (and the bundled verbalizer) as top-level
+# modules, so src/ goes on the path to run them in-process
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+from basic_recom import BasicRecommendations
+from adv_recom import AdvancedRecommendations
+from seed_terms_selector import SeedTermSelector
+from modular_recommendation import generate_modular_recommendations
+from module_extractor import OntologyModuleExtractor, StreamedModuleExtraction
+from telemetry import (REGISTRY, CallbackGauge, STAGE_DURATION, CACHE_REQUESTS, ONTOLOGY_BYTES,
+                       ONTOLOGY_TRIPLES, ONTOLOGY_CLASSES, timed, track_evaluation)
+try:
+    from owl_to_cnl import verbalize_ontology
+except ImportError as e:
+    logger.warning(f"Verbalizer unavailable, CNL generation will use the fallback: {str(e)}")
+    verbalize_ontology = None
+
 app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTH'] = 25 * 1024 * 1024  # 25MB max file size
+app.config['MAX_CONTENT_LENGTH'] = 25 * 1024 * 1024  # 25MB max request size; larger ontologies go through /api/uploads in chunks
 
 # Configure paths
 BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "output"
-TEMP_DIR = BASE_DIR / "temp"
+WORKSPACES_DIR = OUTPUT_DIR / "jobs"
 JAR_FILE = BASE_DIR / "target" / "calculation_engine-1.0-SNAPSHOT-jar-with-dependencies.jar"
 METRICS_DIR = BASE_DIR / "metrics"
+METRIC_RANGES_FILE = METRICS_DIR / "oquare_metrics.csv"
 
 # Create necessary directories
 OUTPUT_DIR.mkdir(exist_ok=True)
-TEMP_DIR.mkdir(exist_ok=True)
+WORKSPACES_DIR.mkdir(exist_ok=True)
 (OUTPUT_DIR / "ontologies").mkdir(exist_ok=True)
 (OUTPUT_DIR / "ontologies" / "seed_terms").mkdir(exist_ok=True)
 (OUTPUT_DIR / "ontologies" / "modules").mkdir(exist_ok=True)
@@ -41,26 +69,74 @@ os.environ['OQUARE_METRICS_PATH'] = str(METRICS_DIR / "oquare_metrics.csv")
 os.environ['METRICS_DESCRIPTIONS_PATH'] = str(METRICS_DIR / "framework_metrics_descriptions.csv")
 os.environ['OQUARE_OUTPUT_DIR'] = str(OUTPUT_DIR)
 
+# Background executor for job-submission mode
+job_manager = JobManager.from_env()
+
+# Chunked/resumable upload sessions
+upload_store = UploadStore.from_env(str(OUTPUT_DIR / "uploads"))
+
+# Warm calculation-engine JVMs (ENGINE_POOL_SIZE=0 starts a fresh JVM per ontology instead)
+engine_pool = EnginePool.from_env(str(JAR_FILE))
+
+# Counters and histograms of all processes (gunicorn workers, batch pool) are added up at scrape time
+REGISTRY.set_directory(os.getenv('TELEMETRY_DIR', str(OUTPUT_DIR / "telemetry")))
+
+# Scrape-time gauges for /metrics
+REGISTRY.register(CallbackGauge('ontoinsight_jobs_pending', 'Queued or running background jobs.',
+                                job_manager.pending_count))
+REGISTRY.register(CallbackGauge('ontoinsight_jobs_queue_limit', 'Maximum number of unfinished background jobs.',
+                                lambda: job_manager.max_pending))
+REGISTRY.register(CallbackGauge('ontoinsight_engine_restarts', 'Calculation-engine JVMs replaced after a failure.',
+                                lambda: engine_pool.restarts))
+
+# Content-addressed cache of stage artifacts (None when disabled)
+result_cache = ResultCache.from_env(str(OUTPUT_DIR / "cache"))
+
+# Engines keep HermiT's results next to the stage artifacts, under the same size limit
+if result_cache is not None:
+    os.environ.setdefault('ENGINE_REASONER_CACHE_DIR', str(result_cache.cache_dir))
+
+# Version of the glossaries and metric-range tables fed to the recommenders
+GLOSSARY_VERSION = hash_files([str(p) for p in METRICS_DIR.glob('*.csv')])
+
+# How much DL reasoning the engine runs before scoring: 'structural' (none), 'consistency'
+# (HermiT consistency check) or 'full' (consistency check and classification)
+SCORING_MODES = ('structural', 'consistency', 'full')
+DEFAULT_SCORING_MODE = os.getenv('ENGINE_SCORING_MODE', 'full')
+if DEFAULT_SCORING_MODE not in SCORING_MODES:
+    logger.warning(f"Unknown ENGINE_SCORING_MODE {DEFAULT_SCORING_MODE!r}, using 'full'")
+    DEFAULT_SCORING_MODE = 'full'
+
+# Version of the worst-band table the engine uses to pick seed terms
+METRIC_RANGES_VERSION = hash_files([str(METRIC_RANGES_FILE)]) if METRIC_RANGES_FILE.exists() else None
+
 # Utility functions
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'owl', 'rdf', 'ttl'}
+    return is_allowed_upload(filename)
 
-def preprocess_ontology(file_path):
+def link_or_copy(source, destination):
+    """Hard-link source to destination when possible so large ontologies are not copied"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+@timed('preprocessing')
+def preprocess_ontology(file_path, workspace):
     """Preprocess the ontology file and return the paths to the converted ontology"""
     try:
         # Get base name of input file without extension
         base_name = os.path.basename(file_path).rsplit('.', 1)[0]
         
         # Define standardized paths for all output files
-        converted_ontology = str(OUTPUT_DIR / "ontologies" / f"{base_name}_converted.owl")
+        converted_ontology = workspace.converted_ontology_path(base_name)
         
         # Copy input file to output directory if it's already an OWL file
         if file_path.endswith('.owl'):
             logger.info("Input file is already in OWL format. Copying to output directory...")
-            subprocess.run(['cp', file_path, converted_ontology], check=True)
         else:
             logger.info("Converting input file to OWL format...")
-            subprocess.run(['cp', file_path, converted_ontology], check=True)
+        link_or_copy(file_path, converted_ontology)
             
         return {
             'converted_ontology': converted_ontology,
@@ -70,12 +146,40 @@ def preprocess_ontology(file_path):
         logger.error(f"Error preprocessing ontology: {str(e)}")
         raise
 
-def run_oquare_scoring(ontology_path):
-    """Run OQuaRE scoring on the ontology"""
+@timed('oquare_scoring')
+def run_oquare_scoring(ontology_path, scoring_mode=DEFAULT_SCORING_MODE, content_hash=None):
+    """
+    Run OQuaRE scoring on the ontology, on a warm engine JVM when the pool is enabled. The
+    engine also extracts the seed terms of the worst metrics while the ontology is loaded,
+    so the metrics JSON carries 'worst_metrics' and 'seed_terms' when the ranges CSV exists.
+    content_hash is the file's SHA-256, which keys the engine's reasoner cache.
+    """
+    metric_ranges = str(METRIC_RANGES_FILE) if METRIC_RANGES_FILE.exists() else None
+    if engine_pool.enabled:
+        try:
+            logger.info(f"Running OQuaRE scoring on {ontology_path} (engine pool, {scoring_mode} mode)")
+            return engine_pool.score(ontology_path, metric_ranges, scoring_mode, content_hash)
+        except EngineUnavailableError as e:
+            # Only when no engine took the request; one that died or timed out while scoring is
+            # an error, as the ontology would most likely do the same to a one-shot JVM
+            logger.error(f"Engine pool unavailable, falling back to a one-shot JVM: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error running OQuaRE scoring: {str(e)}")
+            raise
+    return run_oquare_scoring_once(ontology_path, metric_ranges, scoring_mode, content_hash)
+
+def run_oquare_scoring_once(ontology_path, metric_ranges=None, scoring_mode=DEFAULT_SCORING_MODE, content_hash=None):
+    """Run OQuaRE scoring on the ontology in a fresh JVM"""
     try:
-        logger.info(f"Running OQuaRE scoring on {ontology_path}")
+        logger.info(f"Running OQuaRE scoring on {ontology_path} ({scoring_mode} mode)")
+        command = ['java', '-cp', str(JAR_FILE), 'com.calculation_engine.Main', ontology_path,
+                   '--mode', scoring_mode]
+        if metric_ranges:
+            command += ['--seed-terms', metric_ranges]
+        if content_hash:
+            command += ['--content-hash', content_hash]
         result = subprocess.run(
-            ['java', '-cp', str(JAR_FILE), 'com.calculation_engine.Main', ontology_path],
+            command,
             capture_output=True,
             text=True,
             check=True
@@ -89,6 +193,10 @@ def run_oquare_scoring(ontology_path):
             logger.error(f"Metrics file not created at {metrics_file}")
             raise FileNotFoundError(f"Metrics file not created at {metrics_file}")
         
+        # A failed run leaves a "failed" document and a timed-out one a "running" one
+        status = json.loads(read_text(metrics_file)).get('status')
+        if status not in ('complete', 'partial'):
+            raise RuntimeError(f"OQuaRE scoring did not finish ({status}) for {ontology_path}")
         return metrics_file
     except subprocess.CalledProcessError as e:
         logger.error(f"OQuaRE scoring failed: {e.stderr}")
@@ -97,69 +205,739 @@ def run_oquare_scoring(ontology_path):
         logger.error(f"Error running OQuaRE scoring: {str(e)}")
         raise
 
-def extract_seed_terms(ontology_path, metrics_file, base_name):
-    """Extract seed terms from ontology based on metrics"""
+# Seed term selector of this process, created on first use
+_seed_term_selector = None
+
+def get_seed_term_selector():
+    """Return this process's seed term selector (metric ranges are loaded once)"""
+    global _seed_term_selector
+    if _seed_term_selector is None:
+        _seed_term_selector = SeedTermSelector(str(METRIC_RANGES_FILE), str(JAR_FILE))
+    return _seed_term_selector
+
+@timed('seed_terms')
+def extract_seed_terms(ontology_path, metrics_content, base_name, workspace, on_metric=None):
+    """
+    Extract seed terms from ontology based on the (already loaded) metrics; returns (path, seed terms).
+    on_metric is called with (metric, seed terms) as each metric's terms become available.
+    """
     try:
-        seed_terms_json = str(OUTPUT_DIR / "ontologies" / "seed_terms" / f"{base_name}_seed_terms.json")
+        seed_terms_json = workspace.seed_terms_path(base_name)
         
         logger.info(f"Extracting seed terms from ontology based on worst metrics...")
-        subprocess.run(
-            ['python3', str(BASE_DIR / 'src' / 'seed_terms_selector.py'), 
-             ontology_path, metrics_file, seed_terms_json],
-            check=True
-        )
+        seed_terms = get_seed_term_selector().select_seed_terms(ontology_path, metrics_content, on_metric=on_metric)
         
-        if not os.path.exists(seed_terms_json):
-            logger.error(f"Seed terms file not created at {seed_terms_json}")
-            raise FileNotFoundError(f"Seed terms file not created at {seed_terms_json}")
+        with open(seed_terms_json, 'w', encoding='utf-8') as f:
+            json.dump(seed_terms, f, indent=2)
         
-        return seed_terms_json
+        return seed_terms_json, seed_terms
     except Exception as e:
         logger.error(f"Error extracting seed terms: {str(e)}")
         raise
 
-def generate_cnl(ontology_path, base_name):
-    """Generate controlled natural language representation"""
+def fallback_cnl(ontology_path):
+    """Basic CNL listing the ontology's first classes, used when the verbalizer is unavailable"""
+    lines = ["# Simple Ontology Description\n\n",
+             "This is a basic description of the ontology.\n\n",
+             "## Sample Terms\n\n"]
+    
+    # Extract some content from the ontology file
+    with open(ontology_path, 'r') as onto_file:
+        content = onto_file.read()
+        classes = re.findall(r'Class rdf:about="([^"]*)"', content)
+        for class_uri in classes[:20]:
+            local_name = class_uri.split('/')[-1].split('#')[-1]
+            lines.append(f"- {local_name}\n")
+    return ''.join(lines)
+
+@timed('cnl')
+def generate_cnl(ontology_path, base_name, workspace):
+    """Generate controlled natural language representation; returns (path, CNL text)"""
     try:
         logger.info(f"Generating CNL for {ontology_path}")
-        subprocess.run(
-            ['python3', str(BASE_DIR / 'src' / 'owl_to_cnl.py'), ontology_path],
-            check=True
-        )
+        cnl_output = workspace.cnl_path(base_name)
         
-        # Check if CNL file exists in expected location
-        cnl_file = f"{os.path.splitext(ontology_path)[0]}.txt"
-        cnl_output = str(OUTPUT_DIR / "cnl" / f"{base_name}.txt")
-        
-        if os.path.exists(cnl_file):
-            # Copy to standard location
-            subprocess.run(['cp', cnl_file, cnl_output], check=True)
-            
-            # Optionally remove the original if it's not in the output directory
-            if cnl_file != cnl_output:
-                os.remove(cnl_file)
+        if verbalize_ontology is not None:
+            stats = {}
+            cnl_text = verbalize_ontology(ontology_path, stats)
+            ONTOLOGY_TRIPLES.observe(stats['triples'])
+            ONTOLOGY_CLASSES.observe(stats['classes'])
+            STAGE_DURATION.observe(stats['parse_seconds'], stage='cnl:rdflib_parse')
+            STAGE_DURATION.observe(stats['verbalize_seconds'], stage='cnl:verbalize')
         else:
-            # Generate a basic fallback CNL
-            logger.warning(f"CNL file not generated at {cnl_file}. Creating fallback CNL.")
-            with open(cnl_output, 'w') as f:
-                f.write("# Simple Ontology Description\n\n")
-                f.write("This is a basic description of the ontology.\n\n")
-                f.write("## Sample Terms\n\n")
-                
-                # Extract some content from the ontology file
-                with open(ontology_path, 'r') as onto_file:
-                    content = onto_file.read()
-                    import re
-                    classes = re.findall(r'Class rdf:about="([^"]*)"', content)
-                    for i, class_uri in enumerate(classes[:20]):
-                        local_name = class_uri.split('/')[-1].split('#')[-1]
-                        f.write(f"- {local_name}\n")
+            logger.warning("Verbalizer unavailable. Creating fallback CNL.")
+            cnl_text = fallback_cnl(ontology_path)
         
-        return cnl_output
+        with open(cnl_output, 'w', encoding='utf-8') as f:
+            f.write(cnl_text)
+        
+        return cnl_output, cnl_text
     except Exception as e:
         logger.error(f"Error generating CNL: {str(e)}")
         raise
 
+def engine_version():
+    """Identify the calculation engine build so that a rebuilt JAR invalidates cached metrics"""
+    try:
+        stat = JAR_FILE.stat()
+        return f"{stat.st_size}-{int(stat.st_mtime)}"
+    except OSError:
+        return "unknown"
+
+def stage_keys(ontology_path, mode, modular=False, ontology_hash=None, scoring_mode=DEFAULT_SCORING_MODE):
+    """
+    Build the cache key of every pipeline stage. Each key covers the ontology content
+    hash plus the parameters of that stage and of the stages it depends on. The hash
+    computed while the upload streamed in can be passed to avoid re-reading the file.
+    """
+    ontology_hash = ontology_hash or hash_file(ontology_path)
+    keys = {'ontology': ontology_hash}
+    keys['metrics'] = make_key('metrics', ontology_hash, engine_version(), METRIC_RANGES_VERSION, scoring_mode)
+    keys['seed_terms'] = make_key('seed_terms', keys['metrics'])
+    keys['cnl'] = make_key('cnl', ontology_hash)
+    keys['report'] = make_key('modular_report' if modular else 'report', mode, os.getenv('MODEL_NAME'),
+                              GLOSSARY_VERSION, keys['metrics'], keys['seed_terms'], keys['cnl'])
+    return keys
+
+def cached_artifact(key, dest_path, producer, stage, cacheable=None):
+    """
+    Restore dest_path from the result cache, or run producer() and cache the file it returns.
+    A None key bypasses the cache, and a produced file is only cached if cacheable(path) allows it.
+    """
+    if key is None:
+        return producer()
+    if result_cache is not None and result_cache.restore(key, dest_path):
+        logger.info(f"Cache hit for {stage}, skipping stage")
+        CACHE_REQUESTS.inc(stage=stage, result='hit')
+        return dest_path
+    
+    if result_cache is not None:
+        CACHE_REQUESTS.inc(stage=stage, result='miss')
+    produced_path = producer()
+    if result_cache is not None and (cacheable is None or cacheable(produced_path)):
+        result_cache.put_file(key, produced_path)
+    return produced_path
+
+def cached_stage(key, dest_path, producer, stage, load):
+    """
+    Like cached_artifact, for stages whose producer returns (path, value) so the value can be
+    passed on in memory. On a cache hit the value is read back from the restored file with load().
+    """
+    if key is None:
+        return producer()
+    if result_cache is not None and result_cache.restore(key, dest_path):
+        logger.info(f"Cache hit for {stage}, skipping stage")
+        CACHE_REQUESTS.inc(stage=stage, result='hit')
+        return dest_path, load(dest_path)
+    
+    if result_cache is not None:
+        CACHE_REQUESTS.inc(stage=stage, result='miss')
+    produced_path, value = producer()
+    if result_cache is not None:
+        result_cache.put_file(key, produced_path)
+    return produced_path, value
+
+def metrics_complete(metrics_path):
+    """False when the engine left some metrics out (timed out or failed); older files count as complete"""
+    return read_json(metrics_path).get('status', 'complete') == 'complete'
+
+def skip_cache_if_partial(keys, metrics_content):
+    """
+    Stages downstream of partial metrics still run on the metrics that finished, but their
+    results must not be cached under the keys of the complete metrics.
+    """
+    status = metrics_content.get('status', 'complete')
+    if status == 'complete':
+        return keys
+    missing = [name for name, state in metrics_content.get('metric_status', {}).items() if state != 'ok']
+    logger.warning(f"Metrics are {status} (missing: {', '.join(missing) or 'unknown'}), "
+                   f"continuing with the metrics that finished without caching later stages")
+    return dict(keys, seed_terms=None, report=None)
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+# Recommenders load the glossary CSVs and build an API client, so each process keeps one per mode
+_recommenders = {}
+_recommenders_lock = threading.Lock()
+
+def get_recommender(mode):
+    """Return this process's shared recommender for mode, creating it on first use"""
+    with _recommenders_lock:
+        if mode not in _recommenders:
+            _recommenders[mode] = BasicRecommendations() if mode == 'basic' else AdvancedRecommendations()
+        return _recommenders[mode]
+
+# Set once warm_up() has loaded everything the request path needs
+_ready = threading.Event()
+_warm_up_lock = threading.Lock()
+
+def warm_up(start_engines=True):
+    """
+    Load both recommenders (glossaries, metric-range tables, LLM client) up front. The
+    production server calls this before forking its workers so that they share the
+    loaded state instead of building it on their first request. Engine JVMs cannot be
+    shared across a fork, so the production server starts them per worker instead.
+    Only the first call does anything.
+
+    Files left over from a previous run are removed here rather than at import time,
+    because batch pool processes import this module too.
+    """
+    with _warm_up_lock:
+        if not _ready.is_set():
+            _warm_up(start_engines)
+
+def _warm_up(start_engines):
+    # Workspaces of evaluations that outlived the job TTL (e.g. after a crash), uploads and telemetry
+    Workspace.reap_stale(str(WORKSPACES_DIR), job_manager.ttl_seconds)
+    upload_store.remove_leftovers()
+    REGISTRY.clear_directory()
+    for mode in ('basic', 'advanced'):
+        get_recommender(mode)
+    if start_engines and engine_pool.enabled and JAR_FILE.exists():
+        logger.info(f"Started {engine_pool.start()} calculation engine(s)")
+    _ready.set()
+    logger.info("Warm-up complete: recommenders and glossaries loaded")
+
+@app.before_request
+def warm_up_on_first_request():
+    """Warm up servers that never called warm_up(), such as `flask --app api run`"""
+    if not _ready.is_set():
+        warm_up()
+
+@timed('recommendations')
+def generate_report(mode, cnl_text, metrics_data, seed_terms_file, output_file):
+    """Generate basic or advanced recommendations into output_file and return the report path"""
+    if mode == 'basic':
+        try:
+            recommender = get_recommender('basic')
+            result, report_path = recommender.generate_basic_recommendations(cnl_text, metrics_data, seed_terms_file,
+                                                                                 output_file=output_file)
+        except Exception as rec_error:
+            logger.error(f"Basic recommendation generation error: {str(rec_error)}")
+            raise RuntimeError(f"Error generating basic recommendations: {str(rec_error)}") from rec_error
+    else:
+        try:
+            recommender = get_recommender('advanced')
+            result, report_path = recommender.generate_advanced_recommendations(cnl_text, metrics_data, seed_terms_file,
+                                                                                    output_file=output_file)
+        except Exception as rec_error:
+            logger.error(f"Advanced recommendation generation error: {str(rec_error)}")
+            raise RuntimeError(f"Error generating advanced recommendations: {str(rec_error)}") from rec_error
+    return report_path
+
+def run_scoring_stages(job, workspace, upload_path, mode, modular=False, ontology_hash=None,
+                       scoring_mode=DEFAULT_SCORING_MODE):
+    """
+    Preprocess and score the ontology, the first stages of both pipelines, restoring the
+    metrics from the result cache when possible. Returns the state the later stages need:
+    converted_ontology, base_name, the stage cache keys and the metrics (file, text, JSON).
+    """
+    # Process the ontology
+    job.set_stage('preprocessing')
+    process_result = preprocess_ontology(upload_path, workspace)
+    converted_ontology = process_result['converted_ontology']
+    job.add_artifact('converted_ontology', converted_ontology)
+    ONTOLOGY_BYTES.observe(os.path.getsize(converted_ontology))
+    keys = stage_keys(converted_ontology, mode, modular=modular, ontology_hash=ontology_hash, scoring_mode=scoring_mode)
+    
+    # Run OQuaRE scoring
+    job.set_stage('oquare_scoring')
+    metrics_file = cached_artifact(keys['metrics'], f"{converted_ontology}_metrics.json",
+                                   lambda: run_oquare_scoring(converted_ontology, scoring_mode, keys['ontology']),
+                                   'oquare_scoring',
+                                   cacheable=metrics_complete)
+    metrics_data = read_text(metrics_file)
+    metrics_content = json.loads(metrics_data)
+    job.add_artifact('metrics', metrics_file, metrics_content)
+    
+    return {
+        'converted_ontology': converted_ontology,
+        'base_name': process_result['base_name'],
+        'keys': skip_cache_if_partial(keys, metrics_content),
+        'metrics_file': metrics_file,
+        'metrics_data': metrics_data,
+        'metrics_content': metrics_content,
+    }
+
+def run_description_stages(job, workspace, state, on_seed_terms=None):
+    """
+    Extract the seed terms and generate the CNL of a scored ontology, restoring each from
+    the result cache when possible, and add seed_terms_file, seed_terms and cnl_text to state.
+    on_seed_terms receives (metric, seed terms) as they are extracted, not on a cache hit.
+    """
+    converted_ontology = state['converted_ontology']
+    base_name = state['base_name']
+    keys = state['keys']
+    
+    # Extract seed terms
+    job.set_stage('seed_terms')
+    state['seed_terms_file'], state['seed_terms'] = cached_stage(
+        keys['seed_terms'], workspace.seed_terms_path(base_name),
+        lambda: extract_seed_terms(converted_ontology, state['metrics_content'], base_name, workspace,
+                                   on_metric=on_seed_terms),
+        'seed_terms', read_json)
+    job.add_artifact('seed_terms', state['seed_terms_file'], state['seed_terms'])
+    
+    # Generate CNL
+    job.set_stage('cnl')
+    cnl_file, state['cnl_text'] = cached_stage(keys['cnl'], workspace.cnl_path(base_name),
+                                               lambda: generate_cnl(converted_ontology, base_name, workspace),
+                                               'cnl', read_text)
+    job.add_artifact('cnl', cnl_file)
+    return state
+
+def pipeline_result(state, mode, scoring_mode, **fields):
+    """The response payload both pipelines share, with their own fields added"""
+    return {
+        'status': 'success',
+        'mode': mode,
+        'scoring_mode': state['metrics_content'].get('scoring_mode', scoring_mode),
+        'base_name': state['base_name'],
+        **fields,
+        'metrics': state['metrics_content'],
+        'seed_terms': state['seed_terms'],
+        'cnl': state['cnl_text']
+    }
+
+@track_evaluation('full')
+def run_full_pipeline(job, workspace, upload_path, mode, ontology_hash=None, scoring_mode=DEFAULT_SCORING_MODE):
+    """Run the full-ontology evaluation pipeline and return the response payload"""
+    state = run_scoring_stages(job, workspace, upload_path, mode, ontology_hash=ontology_hash,
+                               scoring_mode=scoring_mode)
+    run_description_stages(job, workspace, state)
+    base_name = state['base_name']
+    
+    # Generate recommendations based on mode
+    job.set_stage('recommendations')
+    report_file = workspace.report_path(base_name, mode)
+    report_path = cached_artifact(state['keys']['report'], report_file,
+                                  lambda: generate_report(mode, state['cnl_text'], state['metrics_data'],
+                                                          state['seed_terms_file'], report_file),
+                                  'recommendations')
+    
+    # Read the generated report
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report_content = f.read()
+    job.add_artifact('report', report_path, report_content)
+    
+    return pipeline_result(state, mode, scoring_mode, report=report_content)
+
+@track_evaluation('modular')
+def run_modular_pipeline(job, workspace, upload_path, mode, ontology_hash=None, scoring_mode=DEFAULT_SCORING_MODE):
+    """Run the modular evaluation pipeline and return the response payload"""
+    state = run_scoring_stages(job, workspace, upload_path, mode, modular=True, ontology_hash=ontology_hash,
+                               scoring_mode=scoring_mode)
+    keys = state['keys']
+    modules_dir = workspace.modules_dir
+    reports_dir = workspace.reports_dir
+    
+    report_cache = result_cache if keys['report'] is not None else None
+    cached_files = report_cache.get(keys['report']) if report_cache is not None else None
+    if report_cache is not None:
+        CACHE_REQUESTS.inc(stage='modular_recommendations', result='hit' if cached_files else 'miss')
+    
+    # Unless the modules are cached, extract each one in the background as soon as the seed
+    # terms of its metric arrive, overlapping ROBOT with the rest of seed terms and CNL
+    module_extraction = None
+    if not cached_files:
+        module_extraction = StreamedModuleExtraction(OntologyModuleExtractor(str(METRIC_RANGES_FILE)),
+                                                     state['converted_ontology'], state['metrics_file'],
+                                                     str(modules_dir))
+    try:
+        run_description_stages(job, workspace, state,
+                               on_seed_terms=module_extraction.seed_terms_ready if module_extraction else None)
+        
+        # Run the modular recommendation workflow, unless its modules and reports are cached
+        job.set_stage('modular_recommendations')
+        if cached_files:
+            logger.info("Cache hit for modular_recommendations, skipping stage")
+            for name, path in cached_files.items():
+                target_dir = modules_dir if name.endswith('.owl') else reports_dir
+                shutil.copyfile(path, target_dir / name)
+        else:
+            logger.info(f"Running modular recommendation workflow with mode: {mode}")
+            
+            def report_written(report_file):
+                job.add_artifact(f"report:{os.path.basename(report_file)}", report_file, read_text(report_file))
+            
+            with STAGE_DURATION.time(stage='modular_recommendations'):
+                module_paths = None
+                if module_extraction.started:
+                    job.set_stage('module_extraction')
+                    module_paths = module_extraction.module_paths()
+                completed = generate_modular_recommendations(
+                    state['converted_ontology'], state['metrics_file'], state['seed_terms_file'], mode=mode,
+                    output_dir=str(reports_dir), modules_dir=str(modules_dir), cnl_dir=str(workspace.cnl_dir),
+                    basic_recommender=get_recommender('basic') if mode == 'basic' else None,
+                    advanced_recommender=get_recommender('advanced') if mode == 'advanced' else None,
+                    on_stage=job.set_stage, on_report=report_written, module_paths=module_paths)
+            if not completed:
+                logger.warning("Modular recommendation workflow did not complete")
+    finally:
+        if module_extraction is not None:
+            module_extraction.close()
+    
+    # Check for modules
+    module_files = list(modules_dir.glob("*.owl"))
+    
+    # Collect all recommendation files; the workspace only holds this evaluation's reports
+    recommendation_files = list(reports_dir.glob("*recommendations*.txt"))
+    recommendation_files.extend(list(reports_dir.glob("*recommendations*.md")))
+    
+    if not cached_files and report_cache is not None and recommendation_files:
+        result_cache.put(keys['report'], [str(p) for p in module_files + recommendation_files])
+    
+    # Read all recommendation files
+    recommendations = []
+    for rec_file in recommendation_files:
+        with open(rec_file, 'r', encoding='utf-8') as f:
+            recommendations.append({
+                'filename': rec_file.name,
+                'content': f.read()
+            })
+        if f"report:{rec_file.name}" not in job.artifacts:
+            job.add_artifact(f"report:{rec_file.name}", str(rec_file))
+    
+    return pipeline_result(state, mode, scoring_mode,
+                           modules_created=len(module_files) > 0,
+                           module_count=len(module_files),
+                           module_names=[m.name for m in module_files],
+                           recommendations=recommendations)
+
+# Process pool for batch evaluations, created on first use
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def warm_batch_worker(engine_threads):
+    """
+    Build the recommenders once per worker process so batch items do not pay for it, and
+    limit the worker to one warm engine JVM with engine_threads metric threads.
+    """
+    # Engines start on the first item, after this, and inherit the environment
+    os.environ['ENGINE_METRIC_THREADS'] = str(engine_threads)
+    engine_pool.size = min(engine_pool.size, 1)
+    for mode in ('basic', 'advanced'):
+        try:
+            get_recommender(mode)
+        except Exception as e:
+            logger.warning(f"Could not preload {mode} recommender in batch worker: {str(e)}")
+
+def get_batch_pool():
+    """
+    Return the batch process pool. Each worker scores with one engine JVM running
+    BATCH_ENGINE_THREADS metric threads (default 1), so the pool has as many workers as
+    that leaves cores for; BATCH_WORKERS can lower that, but not raise it.
+    The pool is created from a request thread, so its workers are not forked from this
+    multi-threaded process (which holds engine pipes, locks and the job executor): they
+    come from a forkserver, or are spawned where that is unavailable, and import the
+    API module afresh.
+    """
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            engine_threads = max(1, int(os.getenv('BATCH_ENGINE_THREADS', '1')))
+            max_workers = max(1, (os.cpu_count() or 1) // engine_threads)
+            workers = int(os.getenv('BATCH_WORKERS', str(max_workers)))
+            if workers > max_workers:
+                logger.warning(f"BATCH_WORKERS={workers} would run more engine threads than there are cores, "
+                               f"using {max_workers} workers")
+                workers = max_workers
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _batch_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                                              initializer=warm_batch_worker, initargs=(engine_threads,))
+            logger.info(f"Started batch process pool with {workers} workers of {engine_threads} engine thread(s)")
+        return _batch_pool
+
+def evaluate_batch_item(workspace, upload_path, mode, ontology_hash, scoring_mode=DEFAULT_SCORING_MODE):
+    """Run the full pipeline for one batch item inside a pool worker"""
+    try:
+        return run_full_pipeline(EvaluationJob('batch-item', {'mode': mode}), workspace, upload_path, mode,
+                                 ontology_hash, scoring_mode)
+    finally:
+        # Pool workers exit without running atexit handlers, so write the item's telemetry now
+        REGISTRY.flush()
+
+def write_metrics_table(rows, output_file):
+    """Write the aggregated batch metrics as CSV and return the column names"""
+    metric_names = []
+    for row in rows:
+        for name in row['metrics']:
+            if name not in metric_names:
+                metric_names.append(name)
+    columns = ['ontology', 'sha256', 'status'] + metric_names
+    
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row['ontology'], row['sha256'], row['status']] +
+                            [row['metrics'].get(name, '') for name in metric_names])
+    return columns
+
+@track_evaluation('batch')
+def run_batch_pipeline(job, batch_workspace, items, mode, scoring_mode=DEFAULT_SCORING_MODE):
+    """
+    Evaluate every batch item on the process pool and return the aggregated metrics
+    table together with each ontology's report. Failed items are reported, not fatal.
+    """
+    pool = get_batch_pool()
+    futures = {pool.submit(evaluate_batch_item, item['workspace'], item['upload_path'], mode, item['sha256'],
+                           scoring_mode): item
+               for item in items}
+    
+    rows = []
+    results = []
+    job.set_stage(f"batch: 0/{len(items)}")
+    for done, future in enumerate(as_completed(futures), 1):
+        item = futures[future]
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Batch item {item['name']} failed: {str(e)}")
+            rows.append({'ontology': item['name'], 'sha256': item['sha256'], 'status': 'failed', 'metrics': {}})
+            results.append({'ontology': item['name'], 'sha256': item['sha256'], 'status': 'failed', 'error': str(e)})
+        else:
+            metrics = result['metrics'].get('metrics', {})
+            rows.append({'ontology': item['name'], 'sha256': item['sha256'], 'status': 'success', 'metrics': metrics})
+            results.append({'ontology': item['name'], 'sha256': item['sha256'], 'status': 'success',
+                            'scoring_mode': result['scoring_mode'], 'metrics': result['metrics'],
+                            'seed_terms': result['seed_terms'], 'report': result['report']})
+            job.add_artifact(f"report:{item['name']}", item['workspace'].report_path(result['base_name'], mode))
+        job.set_stage(f"batch: {done}/{len(items)}")
+    
+    # Keep the table in input order regardless of completion order
+    order = {item['name']: index for index, item in enumerate(items)}
+    rows.sort(key=lambda row: order[row['ontology']])
+    results.sort(key=lambda result: order[result['ontology']])
+    
+    table_file = str(batch_workspace.reports_dir / "metrics_table.csv")
+    columns = write_metrics_table(rows, table_file)
+    job.add_artifact('metrics_table', table_file)
+    
+    return {
+        'status': 'success',
+        'mode': mode,
+        'scoring_mode': scoring_mode,
+        'count': len(items),
+        'failed': sum(1 for row in rows if row['status'] != 'success'),
+        'metrics_table': {
+            'columns': columns,
+            'rows': [[row['ontology'], row['sha256'], row['status']] +
+                     [row['metrics'].get(name) for name in columns[3:]] for row in rows]
+        },
+        'results': results
+    }
+
+def extract_batch_archive(archive_file, batch_workspace):
+    """Unpack every ontology in an uploaded zip archive into its own workspace"""
+    archive_path = batch_workspace.upload_path(secure_filename(archive_file.filename) or 'batch.zip')
+    archive_file.save(archive_path)
+    
+    items = []
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                member_name = os.path.basename(info.filename)
+                if info.is_dir() or not allowed_file(member_name) or split_filename(member_name)[1] is not None:
+                    continue
+                if info.file_size > upload_store.max_bytes:
+                    raise UploadError(f"{info.filename} exceeds the maximum size of {upload_store.max_bytes} bytes")
+                
+                workspace = Workspace(str(WORKSPACES_DIR))
+                upload_path = workspace.upload_path(secure_filename(member_name))
+                with archive.open(info) as source, open(upload_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                items.append({'name': info.filename, 'workspace': workspace, 'upload_path': upload_path,
+                              'sha256': hash_file(upload_path)})
+    except zipfile.BadZipFile as e:
+        for item in items:
+            item['workspace'].cleanup()
+        raise UploadError(f"Invalid zip archive: {str(e)}") from e
+    except Exception:
+        for item in items:
+            item['workspace'].cleanup()
+        raise
+    finally:
+        os.remove(archive_path)
+    return items
+
+def wants_async():
+    """Check whether the client asked for job-submission mode (?async=true or form field async=true)"""
+    return request.values.get('async', 'false').lower() in ('1', 'true', 'yes')
+
+def save_upload(session):
+    """Place a completed upload into a fresh workspace and return (workspace, upload_path)"""
+    workspace = Workspace(str(WORKSPACES_DIR))
+    upload_path = workspace.upload_path(secure_filename(session.ontology_name))
+    try:
+        # Hard-link when possible so that large uploads are not copied again
+        os.link(session.path, upload_path)
+    except OSError:
+        shutil.copyfile(session.path, upload_path)
+    return workspace, upload_path
+
+def resolve_upload():
+    """
+    Return the completed upload session for an evaluation request, taken either from a
+    previous chunked upload (upload_id) or from a multipart 'ontology' file, which may be
+    gzip/xz/zip compressed. Returns (session, None) or (None, error response).
+    """
+    upload_id = request.values.get('upload_id')
+    if upload_id:
+        session = upload_store.get(upload_id)
+        if session is None:
+            return None, (jsonify({'error': 'Unknown upload ID'}), 404)
+        if not session.completed:
+            return None, (jsonify({'error': 'Upload is not complete', 'offset': session.received}), 409)
+        return session, None
+    
+    # Check if ontology file was uploaded
+    if 'ontology' not in request.files:
+        return None, (jsonify({'error': 'No ontology file provided'}), 400)
+        
+    file = request.files['ontology']
+    if file.filename == '':
+        return None, (jsonify({'error': 'No selected file'}), 400)
+        
+    if not allowed_file(file.filename):
+        return None, (jsonify({'error': 'File format not supported. Use .owl, .rdf, or .ttl (optionally .gz, .xz or .zip)'}), 400)
+    
+    try:
+        return upload_store.ingest(secure_filename(file.filename), file.stream), None
+    except UploadError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+
+# Top-level fields of each evaluation result that clients can select with fields=
+RESPONSE_FIELDS = {
+    'evaluate-full': ('report', 'metrics', 'seed_terms', 'cnl'),
+    'evaluate-modular': ('modules_created', 'module_count', 'module_names', 'recommendations',
+                         'metrics', 'seed_terms', 'cnl'),
+    'evaluate-batch': ('count', 'failed', 'metrics_table', 'results'),
+}
+# Fields that are always returned, whatever was selected
+RESPONSE_ALWAYS = ('status', 'mode', 'scoring_mode', 'base_name')
+# Text fields streamed from their artifact file in ndjson responses
+STREAMED_TEXT_FIELDS = ('cnl', 'report')
+NDJSON_CHUNK_SIZE = 64 * 1024
+
+def response_options(kind):
+    """
+    Read the response options of a request: fields= (comma-separated result fields),
+    format= ('json' or 'ndjson') and links= (return artifact URLs instead of inlining
+    artifacts). Raises ValueError for invalid options.
+    """
+    fields = request.values.get('fields')
+    if fields:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in RESPONSE_FIELDS.get(kind, ()) + RESPONSE_ALWAYS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. "
+                             f"Available: {', '.join(RESPONSE_FIELDS.get(kind, ()))}")
+    else:
+        fields = None
+    
+    response_format = request.values.get('format', 'json').lower()
+    if response_format not in ('json', 'ndjson'):
+        raise ValueError('Invalid format. Use "json" or "ndjson"')
+    
+    links = request.values.get('links', 'false').lower() in ('1', 'true', 'yes')
+    return {'fields': fields, 'format': response_format, 'links': links}
+
+def generate_ndjson(job, payload, envelope=None):
+    """
+    Yield a result as newline-delimited JSON, one {"field", "value"} object per field.
+    Large text fields are read from their artifact file and sent as a series of
+    {"field", "chunk"} objects, so the whole text is never serialized at once.
+    """
+    if envelope is not None:
+        yield json.dumps({'job': envelope}) + "\n"
+    for key, value in payload.items():
+        artifact_path = job.artifacts.get(key)
+        if key in STREAMED_TEXT_FIELDS and isinstance(value, str) and artifact_path and os.path.exists(artifact_path):
+            with open(artifact_path, 'r', encoding='utf-8') as f:
+                while True:
+                    chunk = f.read(NDJSON_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield json.dumps({'field': key, 'chunk': chunk}) + "\n"
+        else:
+            yield json.dumps({'field': key, 'value': value}) + "\n"
+
+def render_result(job, result, options, envelope=None):
+    """Build the response for a finished result, applying the fields/format/links options"""
+    fields = options['fields']
+    payload = {key: value for key, value in result.items()
+               if fields is None or key in fields or key in RESPONSE_ALWAYS}
+    
+    if options['links']:
+        for key in payload:
+            if key in job.artifacts:
+                payload[key] = {'artifact': url_for('get_job_artifact', job_id=job.job_id, name=key)}
+    
+    if options['format'] == 'ndjson':
+        return Response(generate_ndjson(job, payload, envelope), mimetype='application/x-ndjson')
+    if envelope is not None:
+        return jsonify(dict(envelope, result=payload))
+    return jsonify(payload)
+
+def respond_sync(job, result, options, cleanups):
+    """
+    Respond to a synchronous evaluation. Workspaces are removed once the response has
+    been sent, unless artifact links were requested: then the finished job is kept
+    (and its artifacts stay downloadable) until it expires like any queued job.
+    """
+    if options['links']:
+        job.finish(result=result)
+        for cleanup in cleanups:
+            job.add_cleanup(cleanup)
+        job_manager.register(job)
+        return render_result(job, result, options)
+    
+    response = render_result(job, result, options)
+    for cleanup in cleanups:
+        response.call_on_close(cleanup)
+    return response
+
+def run_evaluation(kind, pipeline, session, mode, options, scoring_mode=DEFAULT_SCORING_MODE):
+    """
+    Run a pipeline synchronously, or queue it when the client asked for async mode.
+    Synchronous evaluations remove their workspace once the response is sent; queued
+    jobs keep it (so artifacts stay downloadable) until the job expires.
+    """
+    workspace, upload_path = save_upload(session)
+    job = EvaluationJob(kind, {'mode': mode, 'scoring_mode': scoring_mode, 'sha256': session.sha256})
+    if not wants_async():
+        try:
+            result = pipeline(job, workspace, upload_path, mode, session.sha256, scoring_mode)
+        except Exception:
+            workspace.cleanup()
+            raise
+        return respond_sync(job, result, options, [workspace.cleanup])
+    
+    job.add_cleanup(workspace.cleanup)
+    try:
+        job_manager.submit(kind, pipeline, workspace, upload_path, mode, session.sha256, scoring_mode, job=job)
+    except JobQueueFullError as e:
+        workspace.cleanup()
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    
+    return accepted_response(job)
+
+def accepted_response(job):
+    """202 response pointing the client at a queued job"""
+    return jsonify({
+        'status': 'accepted',
+        'job_id': job.job_id,
+        'status_url': url_for('get_job_status', job_id=job.job_id),
+        'events_url': url_for('stream_job_events', job_id=job.job_id)
+    }), 202
+
 # API endpoints
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -169,97 +947,53 @@ def health_check():
         'message': 'Ontology evaluation API is running'
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Stage latencies, ontology sizes, cache hits, queue depth and LLM usage in Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: passes only once warm-up has completed"""
+    if not _ready.is_set():
+        return jsonify({'status': 'warming_up', 'ready': False}), 503
+    response = {
+        'status': 'ok',
+        'ready': True,
+        'engine_available': JAR_FILE.exists()
+    }
+    if engine_pool.enabled:
+        response['engine_pool'] = engine_pool.health()
+    return jsonify(response)
+
 @app.route('/api/evaluate-full', methods=['POST'])
 def evaluate_full_ontology():
     """Evaluate a full ontology with either basic or advanced recommendations"""
     try:
-        # Check if ontology file was uploaded
-        if 'ontology' not in request.files:
-            return jsonify({'error': 'No ontology file provided'}), 400
-            
-        file = request.files['ontology']
-        if file.filename == '':
-            return jsonify({'error': 'No selected file'}), 400
-            
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'File format not supported. Use .owl, .rdf, or .ttl'}), 400
-        
         # Get recommendation mode
         mode = request.form.get('mode', 'basic')
         if mode not in ['basic', 'advanced']:
             return jsonify({'error': 'Invalid mode. Use "basic" or "advanced"'}), 400
         
-        # Save uploaded file to temporary location
-        temp_file_path = os.path.join(TEMP_DIR, secure_filename(file.filename))
-        file.save(temp_file_path)
+        scoring_mode = request.values.get('scoring_mode', DEFAULT_SCORING_MODE)
+        if scoring_mode not in SCORING_MODES:
+            return jsonify({'error': 'Invalid scoring_mode. Use "structural", "consistency" or "full"'}), 400
         
-        # Process the ontology
-        process_result = preprocess_ontology(temp_file_path)
-        converted_ontology = process_result['converted_ontology']
-        base_name = process_result['base_name']
+        try:
+            options = response_options('evaluate-full')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Run OQuaRE scoring
-        metrics_file = run_oquare_scoring(converted_ontology)
+        session, error = resolve_upload()
+        if error:
+            return error
         
-        # Extract seed terms
-        seed_terms_file = extract_seed_terms(converted_ontology, metrics_file, base_name)
-        
-        # Generate CNL
-        cnl_file = generate_cnl(converted_ontology, base_name)
-        
-        # Read the necessary files
-        with open(cnl_file, 'r', encoding='utf-8') as f:
-            cnl_text = f.read()
-            
-        with open(metrics_file, 'r', encoding='utf-8') as f:
-            metrics_data = f.read()
-        
-        # Generate recommendations based on mode
-        if mode == 'basic':
-            try:
-                recommender = BasicRecommendations()
-                result, report_path = recommender.generate_basic_recommendations(cnl_text, metrics_data, seed_terms_file)
-            except Exception as rec_error:
-                logger.error(f"Basic recommendation generation error: {str(rec_error)}")
-                return jsonify({
-                    'status': 'error',
-                    'message': f"Error generating basic recommendations: {str(rec_error)}"
-                }), 500
-        else:
-            try:
-                recommender = AdvancedRecommendations()
-                result, report_path = recommender.generate_advanced_recommendations(cnl_text, metrics_data, seed_terms_file)
-            except Exception as rec_error:
-                logger.error(f"Advanced recommendation generation error: {str(rec_error)}")
-                return jsonify({
-                    'status': 'error',
-                    'message': f"Error generating advanced recommendations: {str(rec_error)}"
-                }), 500
-        
-        # Read the generated report
-        with open(report_path, 'r', encoding='utf-8') as f:
-            report_content = f.read()
-        
-        # Read metrics and seed terms for response
-        with open(metrics_file, 'r', encoding='utf-8') as f:
-            metrics_content = json.load(f)
-        
-        with open(seed_terms_file, 'r', encoding='utf-8') as f:
-            seed_terms_content = json.load(f)
-        
-        # Clean up temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        
-        return jsonify({
-            'status': 'success',
-            'mode': mode,
-            'base_name': base_name,
-            'report': report_content,
-            'metrics': metrics_content,
-            'seed_terms': seed_terms_content,
-            'cnl': cnl_text
-        })
+        # Direct uploads are single-use; chunked uploads stay available until they expire
+        try:
+            return run_evaluation('evaluate-full', run_full_pipeline, session, mode, options, scoring_mode)
+        finally:
+            if 'upload_id' not in request.values:
+                upload_store.discard(session.upload_id)
     
     except Exception as e:
         logger.error(f"Error in evaluate_full_ontology: {str(e)}")
@@ -272,99 +1006,262 @@ def evaluate_full_ontology():
 def evaluate_modular_ontology():
     """Evaluate an ontology with modularization approach"""
     try:
-        # Check if ontology file was uploaded
-        if 'ontology' not in request.files:
-            return jsonify({'error': 'No ontology file provided'}), 400
-            
-        file = request.files['ontology']
-        if file.filename == '':
-            return jsonify({'error': 'No selected file'}), 400
-            
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'File format not supported. Use .owl, .rdf, or .ttl'}), 400
-        
         # Get recommendation mode
         mode = request.form.get('mode', 'basic')
         if mode not in ['basic', 'advanced']:
             return jsonify({'error': 'Invalid mode. Use "basic" or "advanced"'}), 400
         
-        # Save uploaded file to temporary location
-        temp_file_path = os.path.join(TEMP_DIR, secure_filename(file.filename))
-        file.save(temp_file_path)
-        
-        # Process the ontology
-        process_result = preprocess_ontology(temp_file_path)
-        converted_ontology = process_result['converted_ontology']
-        base_name = process_result['base_name']
+        scoring_mode = request.values.get('scoring_mode', DEFAULT_SCORING_MODE)
+        if scoring_mode not in SCORING_MODES:
+            return jsonify({'error': 'Invalid scoring_mode. Use "structural", "consistency" or "full"'}), 400
         
-        # Run OQuaRE scoring
-        metrics_file = run_oquare_scoring(converted_ontology)
+        try:
+            options = response_options('evaluate-modular')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Extract seed terms
-        seed_terms_file = extract_seed_terms(converted_ontology, metrics_file, base_name)
+        session, error = resolve_upload()
+        if error:
+            return error
         
-        # Generate CNL for backup/reference
-        cnl_file = generate_cnl(converted_ontology, base_name)
-        
-        # Run the modular recommendation workflow
-        logger.info(f"Running modular recommendation workflow with mode: {mode}")
-        result = subprocess.run(
-            ['python3', str(BASE_DIR / 'src' / 'modular_recommendation.py'),
-             converted_ontology, metrics_file, seed_terms_file, '--mode', mode],
-            capture_output=True,
-            text=True
-        )
-        
-        # Check for modules
-        modules_dir = OUTPUT_DIR / "ontologies" / "modules"
-        module_files = list(modules_dir.glob("*.owl"))
+        # Direct uploads are single-use; chunked uploads stay available until they expire
+        try:
+            return run_evaluation('evaluate-modular', run_modular_pipeline, session, mode, options, scoring_mode)
+        finally:
+            if 'upload_id' not in request.values:
+                upload_store.discard(session.upload_id)
+    
+    except Exception as e:
+        logger.error(f"Error in evaluate_modular_ontology: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/evaluate-batch', methods=['POST'])
+def evaluate_batch():
+    """
+    Evaluate many ontologies at once, given either a zip 'archive' of ontologies or the
+    SHA-256 'hashes' of completed uploads, and return an aggregated metrics table plus
+    the report of every ontology
+    """
+    batch_workspace = None
+    items = []
+    try:
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode') or request.form.get('mode', 'basic')
+        if mode not in ['basic', 'advanced']:
+            return jsonify({'error': 'Invalid mode. Use "basic" or "advanced"'}), 400
         
-        # Collect all recommendation files
-        recommendation_files = list((OUTPUT_DIR / "reports").glob(f"*{base_name}*recommendations*.txt"))
-        recommendation_files.extend(list((OUTPUT_DIR / "reports").glob(f"*{base_name}*recommendations*.md")))
+        scoring_mode = data.get('scoring_mode') or request.values.get('scoring_mode', DEFAULT_SCORING_MODE)
+        if scoring_mode not in SCORING_MODES:
+            return jsonify({'error': 'Invalid scoring_mode. Use "structural", "consistency" or "full"'}), 400
         
-        # Read all recommendation files
-        recommendations = []
-        for rec_file in recommendation_files:
-            with open(rec_file, 'r', encoding='utf-8') as f:
-                recommendations.append({
-                    'filename': rec_file.name,
-                    'content': f.read()
-                })
+        try:
+            options = response_options('evaluate-batch')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Read metrics and seed terms for response
-        with open(metrics_file, 'r', encoding='utf-8') as f:
-            metrics_content = json.load(f)
+        batch_workspace = Workspace(str(WORKSPACES_DIR))
+        if 'archive' in request.files:
+            try:
+                items = extract_batch_archive(request.files['archive'], batch_workspace)
+            except UploadError as e:
+                batch_workspace.cleanup()
+                return jsonify({'error': str(e)}), 400
+        else:
+            hashes = data.get('hashes') or request.form.getlist('hashes')
+            if isinstance(hashes, str):
+                hashes = [hashes]
+            missing = []
+            for sha256 in dict.fromkeys(hashes):
+                session = upload_store.find_by_hash(sha256)
+                if session is None:
+                    missing.append(sha256)
+                    continue
+                workspace, upload_path = save_upload(session)
+                items.append({'name': f"{session.ontology_name} ({sha256[:12]})", 'workspace': workspace,
+                              'upload_path': upload_path, 'sha256': sha256})
+            if missing:
+                raise LookupError(f"No completed upload for hashes: {', '.join(missing)}")
         
-        with open(seed_terms_file, 'r', encoding='utf-8') as f:
-            seed_terms_content = json.load(f)
-            
-        with open(cnl_file, 'r', encoding='utf-8') as f:
-            cnl_text = f.read()
+        if not items:
+            batch_workspace.cleanup()
+            return jsonify({'error': 'No ontologies provided. Send a zip "archive" or a list of upload "hashes"'}), 400
         
-        # Clean up temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        workspaces = [batch_workspace] + [item['workspace'] for item in items]
+        job = EvaluationJob('evaluate-batch', {'mode': mode, 'scoring_mode': scoring_mode, 'count': len(items)})
+        if not wants_async():
+            try:
+                result = run_batch_pipeline(job, batch_workspace, items, mode, scoring_mode)
+            except Exception:
+                for workspace in workspaces:
+                    workspace.cleanup()
+                raise
+            return respond_sync(job, result, options, [workspace.cleanup for workspace in workspaces])
         
-        return jsonify({
-            'status': 'success',
-            'mode': mode,
-            'base_name': base_name,
-            'modules_created': len(module_files) > 0,
-            'module_count': len(module_files),
-            'module_names': [m.name for m in module_files],
-            'recommendations': recommendations,
-            'metrics': metrics_content,
-            'seed_terms': seed_terms_content,
-            'cnl': cnl_text
-        })
+        for workspace in workspaces:
+            job.add_cleanup(workspace.cleanup)
+        try:
+            job_manager.submit('evaluate-batch', run_batch_pipeline, batch_workspace, items, mode, scoring_mode, job=job)
+        except JobQueueFullError as e:
+            job.cleanup()
+            return jsonify({'status': 'error', 'message': str(e)}), 503
+        return accepted_response(job)
     
+    except LookupError as e:
+        for workspace in [batch_workspace] + [item['workspace'] for item in items]:
+            workspace.cleanup()
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
-        logger.error(f"Error in evaluate_modular_ontology: {str(e)}")
+        logger.error(f"Error in evaluate_batch: {str(e)}")
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+@app.route('/api/uploads', methods=['POST'])
+def create_upload():
+    """Start a chunked upload; the body carries 'filename' and optionally the total 'size' in bytes"""
+    data = request.get_json(silent=True) or request.form
+    filename = secure_filename(data.get('filename', ''))
+    if not filename:
+        return jsonify({'error': 'No filename provided'}), 400
+    
+    size = data.get('size')
+    try:
+        session = upload_store.create(filename, int(size) if size is not None else None)
+    except (UploadError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = session.to_dict()
+    response['upload_url'] = url_for('upload_chunk', upload_id=session.upload_id)
+    return jsonify(response), 201
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """Report how many bytes of an upload have arrived, so that an interrupted client can resume"""
+    session = upload_store.get(upload_id)
+    if session is None:
+        return jsonify({'error': 'Unknown upload ID'}), 404
+    return jsonify(session.to_dict())
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT', 'PATCH'])
+def upload_chunk(upload_id):
+    """
+    Append the raw request body to an upload. The chunk's starting byte is taken from the
+    Upload-Offset header (or a 'Content-Range: bytes start-end/total' header) and must match
+    the current offset; otherwise 409 is returned together with the offset to resume from.
+    """
+    session = upload_store.get(upload_id)
+    if session is None:
+        return jsonify({'error': 'Unknown upload ID'}), 404
+    
+    offset = request.headers.get('Upload-Offset')
+    content_range = request.headers.get('Content-Range', '')
+    if offset is None and content_range.startswith('bytes '):
+        offset = content_range[len('bytes '):].split('-', 1)[0]
+    try:
+        offset = int(offset) if offset is not None else session.received
+    except ValueError:
+        return jsonify({'error': 'Invalid upload offset'}), 400
+    
+    with session.lock:
+        try:
+            session.write_chunk(request.stream, offset)
+        except UploadOffsetError as e:
+            return jsonify({'error': str(e), 'offset': e.expected_offset}), 409
+        except UploadError as e:
+            upload_store.discard(upload_id)
+            return jsonify({'error': str(e)}), 400
+        return jsonify(session.to_dict())
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Finish a chunked upload; the response carries the ontology's SHA-256"""
+    session = upload_store.get(upload_id)
+    if session is None:
+        return jsonify({'error': 'Unknown upload ID'}), 404
+    
+    with session.lock:
+        try:
+            return jsonify(session.complete())
+        except UploadError as e:
+            return jsonify({'error': str(e), 'offset': session.received}), 400
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def delete_upload(upload_id):
+    """Abort an upload and remove its data"""
+    if not upload_store.discard(upload_id):
+        return jsonify({'error': 'Unknown upload ID'}), 404
+    return jsonify({'status': 'deleted', 'upload_id': upload_id})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """
+    Return the status of a submitted job, including its result once it has finished.
+    The result honours the same fields=, format= and links= options as the evaluate endpoints.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job ID'}), 404
+    
+    try:
+        options = response_options(job.kind)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if job.result is None:
+        return jsonify(job.to_dict())
+    return render_result(job, job.result, options, envelope=job.to_dict(include_result=False))
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Server-sent events for a job: stage-start/stage-end (with elapsed seconds), artifact
+    (metrics and seed terms include their content) and finally succeeded or failed.
+    Reconnecting clients send Last-Event-ID and only receive the events they missed.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job ID'}), 404
+    
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', request.args.get('last_event_id', -1)))
+    except ValueError:
+        last_event_id = -1
+    
+    def generate():
+        last_id = last_event_id
+        while True:
+            events = job.wait_for_events(last_id, timeout=15)
+            if not events:
+                if job.finished:
+                    return
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                last_id = event['id']
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs/<job_id>/artifacts/<path:name>', methods=['GET'])
+def get_job_artifact(job_id, name):
+    """Download a finished artifact (metrics, seed_terms, cnl, report...) of a job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job ID'}), 404
+    
+    artifact_path = job.artifacts.get(name)
+    if artifact_path is None or not os.path.exists(artifact_path):
+        return jsonify({'error': f"Artifact '{name}' is not available", 'artifacts': sorted(job.artifacts.keys())}), 404
+    return send_file(artifact_path, as_attachment=True, download_name=os.path.basename(artifact_path))
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8000)
+    warm_up()
+    # The Werkzeug debugger allows arbitrary code execution, so it is opt-in for local development
+    debug = os.getenv('API_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, host='0.0.0.0', port=8000)
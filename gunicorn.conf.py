@@ -0,0 +1,33 @@
+import os
+
+# Gunicorn settings for the production API server (see wsgi.py)
+bind = os.getenv('API_BIND', '0.0.0.0:8000')
+# Jobs and upload sessions live in the memory of the worker process, so the API
+# supports a single worker only; scale with threads (and BATCH_WORKERS for batches)
+workers = int(os.getenv('API_WORKERS', '1'))
+threads = int(os.getenv('API_THREADS', str(max(4, 2 * (os.cpu_count() or 1)))))
+
+# Import the app (and warm up the recommenders) once in the master, then fork
+preload_app = True
+
+# Synchronous evaluations wait for the LLM report, so allow long requests
+timeout = int(os.getenv('API_TIMEOUT', '900'))
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('API_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    if workers > 1:
+        server.log.warning(f"Running {workers} workers: job status, events, artifact links and chunked "
+                           f"uploads only work when every request of a client reaches the worker that "
+                           f"created them. Use API_WORKERS=1 and raise API_THREADS instead.")
+
+
+def post_fork(server, worker):
+    """Give each worker its own warm calculation-engine JVMs (pipes cannot be shared across fork)"""
+    from api import engine_pool, JAR_FILE
+    if engine_pool.enabled and JAR_FILE.exists():
+        engine_pool.start()
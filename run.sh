@@ -169,6 +169,9 @@ CNL_OUTPUT="$OUTPUT_DIR/cnl/${BASE_NAME}.txt"
 
 # Set environment variables for output locations
 export OQUARE_OUTPUT_DIR="$OUTPUT_DIR"
+# HermiT's results are cached by file hash, so re-running on an unchanged ontology skips reasoning,
+# and so does scoring the module extracted from it (--module-of)
+export ENGINE_REASONER_CACHE_DIR="${ENGINE_REASONER_CACHE_DIR:-$OUTPUT_DIR/reasoner_cache}"
 export PYTHONPATH="$PYTHONPATH:$SCRIPT_DIR"
 
 # Copy input file to output directory if it's already an OWL file
@@ -215,7 +218,10 @@ fi
 case $choice in
     1)
         print_step "1" "Running OQuaRE scoring on full ontology"
-        java -cp "$JAR_FILE" com.calculation_engine.Main "$CONVERTED_ONTOLOGY" > /dev/null 2>&1
+        if ! java -cp "$JAR_FILE" com.calculation_engine.Main "$CONVERTED_ONTOLOGY" --seed-terms "$OQUARE_METRICS_PATH" > /dev/null 2>&1; then
+            print_error "OQuaRE scoring failed (inconsistent or unreadable ontology, or timeout)"
+            exit 1
+        fi
         
         # Check if metrics file was created
         ACTUAL_METRICS_JSON="${CONVERTED_ONTOLOGY}_metrics.json"
@@ -361,7 +367,10 @@ case $choice in
         ;;
     2)
         print_step "1" "Running OQuaRE scoring and preparing for modularization"
-        java -cp "$JAR_FILE" com.calculation_engine.Main "$CONVERTED_ONTOLOGY" > /dev/null 2>&1
+        if ! java -cp "$JAR_FILE" com.calculation_engine.Main "$CONVERTED_ONTOLOGY" --seed-terms "$OQUARE_METRICS_PATH" > /dev/null 2>&1; then
+            print_error "OQuaRE scoring failed (inconsistent or unreadable ontology, or timeout)"
+            exit 1
+        fi
         
         # Java outputs the metrics file with a _metrics.json suffix
         ACTUAL_METRICS_JSON="${CONVERTED_ONTOLOGY}_metrics.json"
@@ -406,7 +415,10 @@ case $choice in
             
             # Recalculate metrics on the extracted module
             print_step "4" "Calculating metrics for the extracted module"
-            java -cp "$JAR_FILE" com.calculation_engine.Main "$MODULE_PATH" > /dev/null 2>&1
+            if ! java -cp "$JAR_FILE" com.calculation_engine.Main "$MODULE_PATH" --module-of "$CONVERTED_ONTOLOGY" > /dev/null 2>&1; then
+                print_error "Module metrics calculation failed"
+                exit 1
+            fi
             MODULE_METRICS="${MODULE_PATH}_metrics.json"
             
             if [ ! -f "$MODULE_METRICS" ]; then
@@ -34,6 +34,11 @@ if [ -z "$OPENAI_API_KEY" ] && [ ! -f .env ]; then
     echo "OPENAI_API_KEY=your_key_here" > .env
 fi
 
-# Start the Flask API
+# Start the API: the Flask development server with --dev, otherwise gunicorn
+if [ "$1" == "--dev" ]; then
+    echo "Starting the Ontology Evaluation API server (development)..."
+    exec python3 api.py
+fi
+
 echo "Starting the Ontology Evaluation API server..."
-flask --app api run --host=0.0.0.0 --port=8000
+exec gunicorn -c gunicorn.conf.py wsgi:app
@@ -8,6 +8,9 @@ from openai import OpenAI  # Changed from Google's Gemini API to OpenAI client
 from pathlib import Path
 import sys
 import argparse
+import time
+from telemetry import record_llm_response
+from seed_terms_selector import parse_worst_range
 
 # Configure logging
 logging.basicConfig(
@@ -175,25 +178,14 @@ class AdvancedRecommendations:
             if not metric_row.empty:
                 worst_range = metric_row['1 (Worst)'].iloc[0]
                 
-                # Check if the score falls in the worst range
+                # Check if the score falls in the worst range, parsed like the seed term selector does
                 is_worst = False
-                if worst_range.startswith('<'):
-                    # Format: "< 0.2"
-                    try:
-                        threshold = float(worst_range.split()[1])
-                        is_worst = score < threshold
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"Error parsing threshold from '{worst_range}': {e}")
-                elif worst_range.startswith('>'):
-                    # Format: "> 12" or ">0. 8" (with typo)
-                    try:
-                        # Fix any typos in the CSV
-                        cleaned = worst_range.replace('>0.', '> 0.').replace('>0 .', '> 0.')
-                        cleaned = cleaned.replace('>', '').strip()
-                        threshold = float(cleaned)
-                        is_worst = score > threshold
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"Error parsing threshold from '{worst_range}': {e}")
+                parsed = parse_worst_range(str(worst_range))
+                if parsed is not None:
+                    range_type, threshold = parsed
+                    is_worst = score < threshold if range_type == 'less_than' else score > threshold
+                else:
+                    logger.warning(f"Error parsing threshold from '{worst_range}'")
                 
                 if is_worst:
                     worst_metrics.append((metric_name, score))
@@ -512,6 +504,7 @@ Remember:
             ]
 
             # Changed from Gemini to OpenAI API call
+            started = time.time()
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -519,6 +512,8 @@ Remember:
                 max_tokens=4096
             )
 
+            record_llm_response('advanced', response, time.time() - started)
+
             # Extract text from the response (different for OpenAI vs Gemini)
             result = response.choices[0].message.content
             
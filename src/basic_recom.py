@@ -8,6 +8,9 @@ from openai import OpenAI
 from pathlib import Path
 import sys
 import argparse  # Add this import
+import time
+from telemetry import record_llm_response
+from seed_terms_selector import parse_worst_range
 
 # Configure logging
 logging.basicConfig(
@@ -166,18 +169,14 @@ class BasicRecommendations:
             if not metric_row.empty:
                 worst_range = metric_row['1 (Worst)'].iloc[0]
                 
-                # Check if the score falls in the worst range
+                # Check if the score falls in the worst range, parsed like the seed term selector does
                 is_worst = False
-                if worst_range.startswith('<'):
-                    # Format: "< 0.2"
-                    threshold = float(worst_range.split()[1])
-                    is_worst = score < threshold
-                elif worst_range.startswith('>'):
-                    # Format: "> 12" or ">0. 8" (with typo)
-                    # Fix any typos in the CSV
-                    cleaned = worst_range.replace('>0.', '> 0.').replace('>0 .', '> 0.')
-                    threshold = float(cleaned.split()[1])
-                    is_worst = score > threshold
+                parsed = parse_worst_range(str(worst_range))
+                if parsed is not None:
+                    range_type, threshold = parsed
+                    is_worst = score < threshold if range_type == 'less_than' else score > threshold
+                else:
+                    logger.warning(f"Error parsing threshold from '{worst_range}'")
                 
                 if is_worst:
                     worst_metrics.append((metric_name, score))
@@ -321,6 +320,7 @@ Remember:
                 }
             ]
 
+            started = time.time()
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -328,6 +328,7 @@ Remember:
                 max_tokens=2048
             )
 
+            record_llm_response('basic', response, time.time() - started)
             result = response.choices[0].message.content
             
             # Set default path if we don't have a specific output file
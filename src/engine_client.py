@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENGINE_MAIN_CLASS = 'com.calculation_engine.Main'
+
+
+class EngineError(Exception):
+    """Raised when the calculation engine reports an error for an ontology."""
+
+
+class EngineUnavailableError(EngineError):
+    """Raised when no engine JVM could be started or a borrowed one would not take the request."""
+
+
+class EngineLostError(EngineError):
+    """Raised when an engine died or stopped answering while it handled a request."""
+
+
+class EngineProcess:
+    """
+    One warm calculation-engine JVM running ``Main --daemon``. Requests and responses are
+    single JSON lines on stdin/stdout; the engine's console output arrives on stderr and is
+    forwarded to the debug log.
+    """
+
+    def __init__(self, command: List[str], startup_timeout: float):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        self.pid = self.process.pid
+        self.requests_served = 0
+        self.last_used = time.time()
+        self._responses: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+        try:
+            ready = self._next_response(startup_timeout)
+        except EngineLostError as e:
+            raise EngineUnavailableError(f"Engine {self.pid} did not start: {str(e)}") from e
+        if ready.get('status') != 'ready':
+            self.kill()
+            raise EngineUnavailableError(f"Engine {self.pid} did not start: {ready}")
+        logger.info(f"Calculation engine {self.pid} is ready")
+
+    def _read_responses(self):
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self._responses.put(json.loads(line))
+            except ValueError:
+                logger.warning(f"Engine {self.pid} wrote a non-JSON line: {line}")
+        # End of stdout: the JVM exited
+        self._responses.put(None)
+
+    def _drain_stderr(self):
+        for line in self.process.stderr:
+            logger.debug(f"[engine {self.pid}] {line.rstrip()}")
+
+    def _next_response(self, timeout: float) -> Dict:
+        try:
+            response = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise EngineLostError(f"Engine {self.pid} did not answer within {timeout} seconds")
+        if response is None:
+            raise EngineLostError(f"Engine {self.pid} exited with code {self.process.poll()}")
+        return response
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, payload: Dict, timeout: float) -> Dict:
+        """Send one request and wait for its response."""
+        payload = dict(payload, id=uuid.uuid4().hex)
+        try:
+            self.process.stdin.write(json.dumps(payload) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise EngineUnavailableError(f"Engine {self.pid} is not accepting requests: {str(e)}") from e
+
+        while True:
+            response = self._next_response(timeout)
+            # Skip anything left over from an earlier request that was abandoned
+            if response.get('id') == payload['id']:
+                break
+        self.last_used = time.time()
+        self.requests_served += 1
+        return response
+
+    def ping(self, timeout: float = 10) -> bool:
+        try:
+            return self.request({'command': 'ping'}, timeout).get('status') == 'ok'
+        except EngineError:
+            return False
+
+    def stop(self):
+        """Close stdin so the engine exits after its current request, then make sure it is gone."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def detach(self):
+        """Close this process's copies of the pipes of an engine owned by the parent process."""
+        # The parent's reader threads did not survive the fork but may have held the stream
+        # locks, so closing the streams could block forever: the pipe descriptors are replaced
+        # by /dev/null underneath them instead
+        devnull = os.open(os.devnull, os.O_RDWR)
+        try:
+            for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+                try:
+                    os.dup2(devnull, stream.fileno())
+                except (OSError, ValueError):
+                    pass
+        finally:
+            os.close(devnull)
+
+    def kill(self):
+        if self.is_alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Engine {self.pid} did not exit after being killed")
+
+
+class EnginePool:
+    """
+    Small pool of warm calculation-engine JVMs. Engines are started on demand (or all at
+    once by ``start``) up to ``size``; a request checks one out, and engines that died, timed
+    out or fail a ping after sitting idle are replaced. A pool inherited through fork (the
+    gunicorn workers) drops the parent's engines and starts its own.
+    """
+
+    def __init__(self, jar_file: str, size: int = 2, request_timeout: float = 330,
+                 startup_timeout: float = 120, health_check_interval: float = 60,
+                 java_options: Optional[List[str]] = None):
+        self.command = ['java'] + (java_options or []) + ['-cp', str(jar_file), ENGINE_MAIN_CLASS, '--daemon']
+        self.size = size
+        self.request_timeout = request_timeout
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+        self.restarts = 0
+        self._idle: List[EngineProcess] = []
+        self._running = 0
+        self._pid = os.getpid()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls, jar_file: str) -> 'EnginePool':
+        """
+        Create an engine pool configured through ENGINE_POOL_SIZE, ENGINE_TIMEOUT,
+        ENGINE_STARTUP_TIMEOUT and ENGINE_JAVA_OPTS.
+        """
+        return cls(
+            jar_file,
+            size=int(os.getenv('ENGINE_POOL_SIZE', '2')),
+            request_timeout=float(os.getenv('ENGINE_TIMEOUT', '330')),
+            startup_timeout=float(os.getenv('ENGINE_STARTUP_TIMEOUT', '120')),
+            java_options=os.getenv('ENGINE_JAVA_OPTS', '').split()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _check_fork(self):
+        """Forget engines owned by the parent process. Must be called with the lock held."""
+        if self._pid != os.getpid():
+            for engine in self._idle:
+                engine.detach()
+            self._pid = os.getpid()
+            self._idle = []
+            self._running = 0
+            self._closed = False
+
+    def start(self):
+        """Start engines until the pool is full, so the first requests do not pay for JVM startup."""
+        started = []
+        while True:
+            with self._lock:
+                self._check_fork()
+                if self._running >= self.size:
+                    break
+                self._running += 1
+            try:
+                started.append(EngineProcess(self.command, self.startup_timeout))
+            except Exception as e:
+                with self._lock:
+                    self._running -= 1
+                logger.error(f"Could not start calculation engine: {str(e)}")
+                break
+        for engine in started:
+            self._release(engine)
+        return len(started)
+
+    def _acquire(self) -> EngineProcess:
+        while True:
+            with self._available:
+                self._check_fork()
+                while not self._idle and self._running >= self.size:
+                    self._available.wait()
+                if self._idle:
+                    engine = self._idle.pop()
+                else:
+                    self._running += 1
+                    engine = None
+
+            if engine is None:
+                try:
+                    return EngineProcess(self.command, self.startup_timeout)
+                except Exception:
+                    self._discard(None)
+                    raise
+
+            stale = time.time() - engine.last_used > self.health_check_interval
+            if engine.is_alive() and (not stale or engine.ping()):
+                return engine
+            logger.warning(f"Calculation engine {engine.pid} failed its health check, replacing it")
+            engine.kill()
+            self._discard(engine)
+
+    def _release(self, engine: EngineProcess):
+        with self._available:
+            if not self._closed:
+                self._idle.append(engine)
+                self._available.notify()
+                return
+            self._running -= 1
+        engine.stop()
+
+    def _discard(self, engine: Optional[EngineProcess]):
+        with self._available:
+            self._running -= 1
+            if engine is not None:
+                self.restarts += 1
+            self._available.notify()
+
+    def score(self, ontology_path: str, metric_ranges: Optional[str] = None,
+              scoring_mode: Optional[str] = None, content_hash: Optional[str] = None) -> str:
+        """
+        Compute the OQuaRE metrics of an ontology and return the path of its metrics JSON.
+        With a metric_ranges CSV, the seed terms of the worst metrics go into the same JSON.
+        scoring_mode is 'structural', 'consistency' or 'full' (the engine's default). When
+        the engine times out after writing some metrics, the partial JSON is returned.
+        content_hash, the SHA-256 of the file when the caller already has it, spares the
+        engine hashing it again for its reasoner cache. Raises EngineUnavailableError when
+        no engine took the request, and EngineLostError when the engine died or did not
+        answer within request_timeout while scoring.
+        """
+        request = {'ontology': os.path.abspath(ontology_path)}
+        if metric_ranges:
+            request['metric_ranges'] = os.path.abspath(metric_ranges)
+        if scoring_mode:
+            request['scoring_mode'] = scoring_mode
+        if content_hash:
+            request['content_hash'] = content_hash
+        engine = self._acquire()
+        try:
+            response = engine.request(request, self.request_timeout)
+        except EngineError:
+            engine.kill()
+            self._discard(engine)
+            raise
+
+        if response.get('restart') or not engine.is_alive():
+            engine.kill()
+            self._discard(engine)
+        else:
+            self._release(engine)
+
+        if response.get('status') != 'ok':
+            if response.get('partial') and response.get('metrics_file'):
+                logger.warning(f"Engine {engine.pid} timed out on {ontology_path}, using its partial metrics: "
+                               f"{response.get('message')}")
+                return response['metrics_file']
+            raise EngineError(response.get('message') or 'Calculation engine failed')
+        logger.info(f"Engine {engine.pid} scored {ontology_path} in {response.get('elapsed_ms')} ms")
+        return response['metrics_file']
+
+    def health(self) -> Dict:
+        """Ping the idle engines, replacing dead ones, and describe the pool."""
+        with self._lock:
+            self._check_fork()
+            idle, self._idle = self._idle, []
+        healthy = 0
+        for engine in idle:
+            if engine.is_alive() and engine.ping():
+                healthy += 1
+                self._release(engine)
+            else:
+                logger.warning(f"Calculation engine {engine.pid} failed its health check")
+                engine.kill()
+                self._discard(engine)
+        with self._lock:
+            return {
+                'size': self.size,
+                'running': self._running,
+                'idle': len(self._idle),
+                'healthy_idle': healthy,
+                'busy': self._running - len(self._idle),
+                'restarts': self.restarts,
+            }
+
+    def close(self):
+        """Stop all idle engines; busy ones are stopped when they are returned."""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._running -= len(idle)
+        for engine in idle:
+            engine.stop()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job manager already holds its maximum number of unfinished jobs."""
+
+
+class EvaluationJob:
+    """State of a single evaluation: status, current stage, produced artifacts and final result."""
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = 'queued'
+        self.stage = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.artifacts: Dict[str, str] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._stage_started_at = None
+        self._cleanup_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _emit(self, event: str, data: Dict[str, Any]):
+        """Append a progress event and wake up listeners. Must be called with the lock held."""
+        data = dict(data, time=time.time())
+        self.events.append({'id': len(self.events), 'event': event, 'data': data})
+        self._changed.notify_all()
+
+    def _end_stage(self):
+        """Emit stage-end for the running stage, if any. Must be called with the lock held."""
+        if self.stage is not None and self._stage_started_at is not None:
+            self._emit('stage-end', {'stage': self.stage,
+                                     'elapsed': round(time.time() - self._stage_started_at, 3)})
+            self._stage_started_at = None
+
+    def set_stage(self, stage: str):
+        """Record the pipeline stage that is currently running, closing the previous one."""
+        with self._lock:
+            self._end_stage()
+            self.stage = stage
+            self._stage_started_at = time.time()
+            self._emit('stage-start', {'stage': stage})
+        logger.info(f"[job {self.job_id}] stage: {stage}")
+
+    def add_artifact(self, name: str, path: str, content: Any = None):
+        """
+        Register a finished artifact (metrics JSON, seed terms, CNL, report...) by name.
+        Small artifacts can pass their parsed content along so that event listeners
+        receive it right away instead of downloading it once the job has finished.
+        """
+        with self._lock:
+            self.artifacts[name] = str(path)
+            data = {'name': name}
+            if content is not None:
+                data['content'] = content
+            self._emit('artifact', data)
+
+    def finish(self, result: Any = None, error: Optional[str] = None):
+        """Close the running stage and record the outcome of the job."""
+        with self._lock:
+            self._end_stage()
+            self.result = result
+            self.error = error
+            self.status = 'failed' if error is not None else 'succeeded'
+            self.finished_at = time.time()
+            self._emit(self.status, {'elapsed': round(self.finished_at - (self.started_at or self.created_at), 3),
+                                     **({'error': error} if error is not None else {})})
+
+    def wait_for_events(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """Return the events with an id greater than ``after``, waiting up to timeout seconds for one."""
+        with self._lock:
+            self._changed.wait_for(lambda: len(self.events) > after + 1 or self.finished, timeout)
+            return self.events[after + 1:]
+
+    def add_cleanup(self, callback: Callable[[], None]):
+        """Register a callback (e.g. removing the job's workspace) to run when the job expires."""
+        self._cleanup_callbacks.append(callback)
+
+    def cleanup(self):
+        """Run the registered cleanup callbacks."""
+        for callback in self._cleanup_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cleanup of job {self.job_id} failed: {e}")
+        self._cleanup_callbacks = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Serialize the job state for the status endpoint."""
+        with self._lock:
+            data = {
+                'job_id': self.job_id,
+                'kind': self.kind,
+                'status': self.status,
+                'stage': self.stage,
+                'params': self.params,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'artifacts': sorted(self.artifacts.keys()),
+            }
+            if self.error:
+                data['error'] = self.error
+            if include_result and self.result is not None:
+                data['result'] = self.result
+            return data
+
+
+class JobManager:
+    """
+    Runs evaluation jobs on a bounded background thread pool.
+
+    At most ``max_workers`` jobs run at the same time and at most ``max_pending``
+    jobs may be unfinished (queued or running); further submissions are rejected
+    with JobQueueFullError. Finished jobs are forgotten after ``ttl_seconds``, checked
+    whenever jobs are submitted, registered or looked up.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, ttl_seconds: int = 3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evaluation-job")
+        self._jobs: Dict[str, EvaluationJob] = {}
+        self._lock = threading.Lock()
+        logger.info(f"Job manager started with {max_workers} workers (max {max_pending} pending jobs)")
+
+    @classmethod
+    def from_env(cls) -> 'JobManager':
+        """Create a job manager configured through JOB_WORKERS, JOB_QUEUE_LIMIT and JOB_TTL_SECONDS."""
+        return cls(
+            max_workers=int(os.getenv('JOB_WORKERS', '2')),
+            max_pending=int(os.getenv('JOB_QUEUE_LIMIT', '32')),
+            ttl_seconds=int(os.getenv('JOB_TTL_SECONDS', '3600'))
+        )
+
+    def pending_count(self) -> int:
+        """Number of queued or running jobs."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def submit(self, kind: str, func: Callable, *args, params: Optional[Dict[str, Any]] = None,
+               job: Optional[EvaluationJob] = None) -> EvaluationJob:
+        """
+        Queue ``func(job, *args)`` for background execution and return the job immediately.
+        The return value of ``func`` becomes the job result. A pre-built job may be passed
+        in when resources (such as its workspace) have to be attached before submission.
+        """
+        self._expire_finished()
+        job = job or EvaluationJob(kind, params)
+        with self._lock:
+            unfinished = sum(1 for j in self._jobs.values() if not j.finished)
+            if unfinished >= self.max_pending:
+                raise JobQueueFullError(f"Too many pending jobs ({unfinished}). Try again later.")
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func, args)
+        logger.info(f"Queued {kind} job {job.job_id}")
+        return job
+
+    def register(self, job: EvaluationJob):
+        """Track a job that was run outside the pool (e.g. synchronously) so it can be looked up until it expires."""
+        self._expire_finished()
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+    def get(self, job_id: str) -> Optional[EvaluationJob]:
+        """Look up a job by its ID."""
+        self._expire_finished()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[EvaluationJob]:
+        """Return all known jobs, newest first."""
+        self._expire_finished()
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def _run(self, job: EvaluationJob, func: Callable, args: tuple):
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            result = func(job, *args)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}")
+            job.finish(error=str(e))
+        else:
+            logger.info(f"Job {job.job_id} finished successfully")
+            job.finish(result=result)
+
+    def _expire_finished(self):
+        """Drop finished jobs older than the configured TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            expired_jobs = [self._jobs.pop(job_id) for job_id in expired]
+        for job in expired_jobs:
+            job.cleanup()
+        if expired:
+            logger.info(f"Expired {len(expired)} finished jobs")
@@ -0,0 +1,143 @@
+package com.calculation_engine;
+
+import java.util.Arrays;
+
+/**
+ * The asserted subclass hierarchy as a DAG: the named SubClassOf graph condensed into its
+ * strongly connected components, so that the classes on a SubClassOf cycle (classes that
+ * are in fact equivalent) form one component and every other class is a component of its
+ * own. Built once per OntologyIndex, in time linear in the classes and named SubClassOf
+ * axioms, it provides:
+ *
+ * - a topological order of the classes, every class after its superclasses outside its
+ *   own component, for dynamic programs over the hierarchy;
+ * - the depth of every class: the number of classes on the longest chain of named
+ *   SubClassOf axioms from a root down to the class, where a root is a class without any
+ *   superclass axiom and has depth 1. A cycle counts as one level, and classes that no
+ *   root reaches, such as those whose only superclasses are anonymous, have depth 0.
+ *
+ * Unlike a depth-first search with a shared visited set, neither depends on the order in
+ * which classes are visited.
+ */
+final class HierarchyDag {
+    final int[] component;
+    final int[] order;
+    final int[] depths;
+
+    HierarchyDag(int[][] subClasses, boolean[] hasSuperClassAxiom) {
+        int n = subClasses.length;
+        component = new int[n];
+        int components = condense(subClasses, component);
+
+        // Group the classes by component
+        int[] start = new int[components + 1];
+        for (int cls = 0; cls < n; cls++) {
+            start[component[cls] + 1]++;
+        }
+        for (int c = 0; c < components; c++) {
+            start[c + 1] += start[c];
+        }
+        int[] members = new int[n];
+        int[] next = Arrays.copyOf(start, components);
+        for (int cls = 0; cls < n; cls++) {
+            members[next[component[cls]]++] = cls;
+        }
+
+        // Components are numbered sinks first, so the highest number comes first topologically
+        order = new int[n];
+        int position = 0;
+        for (int c = components - 1; c >= 0; c--) {
+            for (int m = start[c]; m < start[c + 1]; m++) {
+                order[position++] = members[m];
+            }
+        }
+
+        // A root is never part of a cycle, so its component is the root alone
+        int[] componentDepth = new int[components];
+        for (int cls = 0; cls < n; cls++) {
+            if (!hasSuperClassAxiom[cls]) {
+                componentDepth[component[cls]] = 1;
+            }
+        }
+        for (int c = components - 1; c >= 0; c--) {
+            int depth = componentDepth[c];
+            if (depth == 0) {
+                continue;
+            }
+            for (int m = start[c]; m < start[c + 1]; m++) {
+                for (int sub : subClasses[members[m]]) {
+                    int subComponent = component[sub];
+                    if (subComponent != c && componentDepth[subComponent] < depth + 1) {
+                        componentDepth[subComponent] = depth + 1;
+                    }
+                }
+            }
+        }
+
+        depths = new int[n];
+        for (int cls = 0; cls < n; cls++) {
+            depths[cls] = componentDepth[component[cls]];
+        }
+    }
+
+    /**
+     * Tarjan's strongly connected components over the subclass edges, without recursion so
+     * that deep hierarchies cannot overflow the stack. Fills component[] and returns the
+     * number of components; a component is numbered after every component it reaches.
+     */
+    private static int condense(int[][] subClasses, int[] component) {
+        int n = subClasses.length;
+        int[] discovered = new int[n];
+        int[] low = new int[n];
+        int[] nextEdge = new int[n];
+        int[] stack = new int[n];
+        int[] callStack = new int[n];
+        Arrays.fill(discovered, -1);
+        Arrays.fill(component, -1);
+        int stackSize = 0;
+        int counter = 0;
+        int components = 0;
+
+        for (int first = 0; first < n; first++) {
+            if (discovered[first] >= 0) {
+                continue;
+            }
+            int top = 0;
+            callStack[0] = first;
+            discovered[first] = low[first] = counter++;
+            stack[stackSize++] = first;
+
+            while (top >= 0) {
+                int cls = callStack[top];
+                int[] subs = subClasses[cls];
+                if (nextEdge[cls] < subs.length) {
+                    int sub = subs[nextEdge[cls]++];
+                    if (discovered[sub] < 0) {
+                        discovered[sub] = low[sub] = counter++;
+                        stack[stackSize++] = sub;
+                        callStack[++top] = sub;
+                    } else if (component[sub] < 0) {
+                        // Still on the stack: sub is an ancestor in the current search
+                        low[cls] = Math.min(low[cls], discovered[sub]);
+                    }
+                    continue;
+                }
+
+                if (low[cls] == discovered[cls]) {
+                    int member;
+                    do {
+                        member = stack[--stackSize];
+                        component[member] = components;
+                    } while (member != cls);
+                    components++;
+                }
+                top--;
+                if (top >= 0) {
+                    int parent = callStack[top];
+                    low[parent] = Math.min(low[parent], low[cls]);
+                }
+            }
+        }
+        return components;
+    }
+}
@@ -7,48 +7,285 @@ import org.semanticweb.owlapi.model.OWLOntologyManager;
 import org.semanticweb.owlapi.model.OWLOntologyCreationException;
 import com.google.gson.Gson;
 import com.google.gson.GsonBuilder;
+import com.google.gson.JsonArray;
+import com.google.gson.JsonElement;
+import com.google.gson.JsonNull;
 import com.google.gson.JsonObject;
+import com.google.gson.JsonParser;
+import com.calculation_engine.seedTermsExtraction.RunGenericExtractor;
+import org.semanticweb.owlapi.model.OWLClass;
 
+import java.io.BufferedReader;
 import java.io.File;
-import java.io.FileWriter;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.AtomicMoveNotSupportedException;
+import java.nio.file.Files;
 import java.nio.file.Path;
 import java.nio.file.Paths;
+import java.nio.file.StandardCopyOption;
 import java.time.Instant;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
 import java.util.concurrent.*;
+import java.util.regex.Pattern;
 
 public class Main {
+    private static final long TIMEOUT_MINUTES = 5;
+    // Metrics that timed out or failed are NaN; they are written as null
+    private static final Gson JSON = new GsonBuilder().serializeSpecialFloatingPointValues().setPrettyPrinting().create();
+    // A content hash from the caller is only trusted in the form ReasonerCache.hashFile produces
+    private static final Pattern SHA256_HEX = Pattern.compile("[0-9a-f]{64}");
+
     public static void main(String[] args) {
         if (args.length == 0) {
             System.err.println("Error: Please provide the path to the ontology file as an argument.");
             System.exit(1);
         }
 
+        if (args[0].equals("--daemon")) {
+            try {
+                runDaemon();
+            } catch (IOException e) {
+                System.err.println("Error: daemon I/O failed: " + e.getMessage());
+                System.exit(1);
+            }
+            return;
+        }
+
         String ontologyPath = args[0];
+        // Optional: --seed-terms <oquare_metrics.csv> also extracts the seed terms of the worst metrics,
+        // --mode structural|consistency|full selects how much reasoning runs (default full),
+        // --content-hash <sha256> is the file's SHA-256 when the caller already has it,
+        // --module-of <source ontology> names the ontology a module was extracted from
+        String metricRangesArg = null;
+        String contentHashArg = null;
+        String sourcePathArg = null;
+        OQuaRE.ScoringMode modeArg = OQuaRE.ScoringMode.FULL;
+        for (int i = 1; i + 1 < args.length; i += 2) {
+            if (args[i].equals("--seed-terms")) {
+                metricRangesArg = args[i + 1];
+            } else if (args[i].equals("--content-hash")) {
+                contentHashArg = args[i + 1];
+            } else if (args[i].equals("--module-of")) {
+                sourcePathArg = args[i + 1];
+            } else if (args[i].equals("--mode")) {
+                try {
+                    modeArg = OQuaRE.ScoringMode.parse(args[i + 1]);
+                } catch (IllegalArgumentException e) {
+                    System.err.println("Error: " + e.getMessage());
+                    System.exit(1);
+                }
+            }
+        }
+        String metricRangesPath = metricRangesArg;
+        String contentHash = contentHashArg;
+        String sourcePath = sourcePathArg;
+        OQuaRE.ScoringMode scoringMode = modeArg;
         
         ExecutorService executor = Executors.newSingleThreadExecutor();
         Future<Void> future = executor.submit(() -> {
             try {
-                processOntology(ontologyPath);
+                processOntology(ontologyPath, metricRangesPath, scoringMode, contentHash, sourcePath);
             } catch (Exception e) {
                 System.err.println("Error processing the ontology: " + e.getMessage());
                 System.err.println("Please ensure the file is a valid ontology and you have the necessary permissions.");
+                throw e;
             }
             return null;
         });
 
+        // A failed or timed-out run exits non-zero, so callers never take its document for a result
+        int exitCode = 0;
         try {
-            future.get(5, TimeUnit.MINUTES); // Set a 5-minute timeout
+            future.get(TIMEOUT_MINUTES, TimeUnit.MINUTES); // Set a 5-minute timeout
         } catch (TimeoutException e) {
             System.err.println("Error: Ontology processing timed out after 5 minutes.");
-        } catch (InterruptedException | ExecutionException e) {
+            exitCode = 2;
+        } catch (ExecutionException e) {
+            exitCode = 1;
+        } catch (InterruptedException e) {
             System.err.println("Error: " + e.getMessage());
+            exitCode = 1;
         } finally {
             executor.shutdownNow();
         }
+        if (exitCode != 0) {
+            System.exit(exitCode);
+        }
+    }
+
+    /**
+     * Serve scoring requests over stdin/stdout so that one warm JVM handles many ontologies.
+     *
+     * Each request is one line of JSON, either {"ontology": "/path/to/file.owl"} or
+     * {"command": "ping"}, optionally with an "id" that is echoed back. An ontology request
+     * with a "metric_ranges" CSV path also extracts seed terms, as with --seed-terms, and a
+     * "scoring_mode" selects the reasoning mode, as with --mode, and a "content_hash" passes
+     * the SHA-256 of the file, as with --content-hash, and a "module_of" path the source of
+     * a module, as with --module-of. Each response is one
+     * line of JSON with a "status" of "ok" (plus "metrics_file" and "elapsed_ms") or "error"
+     * (plus "message"). Console output of the calculators is redirected to stderr so that
+     * stdout only carries responses. A request that exceeds the timeout is answered with an
+     * error flagged "restart" and the daemon exits, since a stuck reasoner thread cannot be
+     * reclaimed. If metrics were already written by then, the error also carries their
+     * "metrics_file" and is flagged "partial". The same goes for a metric that timed out:
+     * its calculator does not stop when cancelled, so once it has answered, a daemon with a
+     * calculator still running flags its response "restart" and exits.
+     */
+    private static void runDaemon() throws IOException {
+        PrintStream responses = new PrintStream(System.out, true, "UTF-8");
+        System.setOut(System.err);
+
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        ExecutorService executor = Executors.newSingleThreadExecutor();
+        Gson gson = new Gson();
+
+        JsonObject ready = new JsonObject();
+        ready.addProperty("status", "ready");
+        responses.println(gson.toJson(ready));
+
+        String line;
+        while ((line = requests.readLine()) != null) {
+            line = line.trim();
+            if (line.isEmpty()) {
+                continue;
+            }
+
+            JsonObject response = new JsonObject();
+            boolean restart = false;
+            try {
+                JsonObject request = JsonParser.parseString(line).getAsJsonObject();
+                if (request.has("id")) {
+                    response.add("id", request.get("id"));
+                }
+
+                if (request.has("command") && request.get("command").getAsString().equals("ping")) {
+                    response.addProperty("status", "ok");
+                    response.addProperty("pong", true);
+                } else if (request.has("ontology")) {
+                    final String ontologyPath = request.get("ontology").getAsString();
+                    final String metricRangesPath = request.has("metric_ranges") ? request.get("metric_ranges").getAsString() : null;
+                    final OQuaRE.ScoringMode scoringMode = request.has("scoring_mode")
+                            ? OQuaRE.ScoringMode.parse(request.get("scoring_mode").getAsString())
+                            : OQuaRE.ScoringMode.FULL;
+                    final String contentHash = request.has("content_hash") ? request.get("content_hash").getAsString() : null;
+                    final String sourcePath = request.has("module_of") ? request.get("module_of").getAsString() : null;
+                    long started = System.currentTimeMillis();
+                    Future<String> future = executor.submit(() -> processOntology(ontologyPath, metricRangesPath, scoringMode, contentHash, sourcePath));
+                    try {
+                        String metricsFile = future.get(TIMEOUT_MINUTES, TimeUnit.MINUTES);
+                        response.addProperty("status", "ok");
+                        response.addProperty("metrics_file", metricsFile);
+                        response.addProperty("elapsed_ms", System.currentTimeMillis() - started);
+                    } catch (TimeoutException e) {
+                        future.cancel(true);
+                        restart = true;
+                        response.addProperty("status", "error");
+                        response.addProperty("message", "Ontology processing timed out after " + TIMEOUT_MINUTES + " minutes.");
+                        response.addProperty("restart", true);
+                        File partialMetrics = new File(metricsJsonPath(ontologyPath));
+                        if (partialMetrics.exists()) {
+                            response.addProperty("metrics_file", partialMetrics.getPath());
+                            response.addProperty("partial", true);
+                        }
+                    } catch (ExecutionException e) {
+                        Throwable cause = e.getCause() != null ? e.getCause() : e;
+                        response.addProperty("status", "error");
+                        response.addProperty("message", String.valueOf(cause.getMessage()));
+                    }
+                    if (!restart && OQuaRE.runningCalculators() > 0) {
+                        // A metric cancelled over its budget ignored the interrupt and still holds
+                        // a calculator thread; a fresh engine gets the whole pool back
+                        response.addProperty("restart", true);
+                        restart = true;
+                    }
+                } else {
+                    response.addProperty("status", "error");
+                    response.addProperty("message", "Request needs an \"ontology\" path or a \"command\"");
+                }
+            } catch (Exception e) {
+                response.addProperty("status", "error");
+                response.addProperty("message", "Invalid request: " + e.getMessage());
+            }
+
+            responses.println(gson.toJson(response));
+            if (restart) {
+                executor.shutdownNow();
+                System.exit(2);
+            }
+        }
+        executor.shutdownNow();
+    }
+
+    /**
+     * Load the ontology once, score it and write <ontology>_metrics.json. When
+     * metricRangesPath is given, the seed terms of the metrics in the worst band are extracted
+     * from the same loaded ontology and written to the same document. The scoring mode used
+     * is recorded as "scoring_mode". contentHash, the SHA-256 of the file if the caller
+     * already computed it, keys the reasoner cache; without it the file is hashed, but only
+     * when HermiT runs with the cache enabled. sourcePath, when the ontology is a module
+     * extracted from another one, lets a cached result of that source answer for it.
+     *
+     * The document is rewritten as each metric is settled, with "status" "running", so a
+     * metric that hangs past its budget (or the overall timeout) still leaves the others
+     * behind. The final document has "status" "complete", or "partial" when a metric timed
+     * out or failed; "metric_status" tells which, and such metrics are null. When scoring
+     * fails as a whole, e.g. on an inconsistent ontology, a document already written is
+     * replaced by one with "status" "failed" and the error as "message".
+     */
+    private static String processOntology(String ontologyPath, String metricRangesPath,
+                                          OQuaRE.ScoringMode scoringMode, String contentHash,
+                                          String sourcePath) throws Exception {
+        try {
+            return scoreOntology(ontologyPath, metricRangesPath, scoringMode, contentHash, sourcePath);
+        } catch (Exception e) {
+            // An interrupt is the overall timeout, which reports the document as partial instead
+            if (!interrupted(e)) {
+                markFailed(ontologyPath, scoringMode, e);
+            }
+            throw e;
+        }
+    }
+
+    private static boolean interrupted(Throwable error) {
+        for (Throwable cause = error; cause != null; cause = cause.getCause()) {
+            if (cause instanceof InterruptedException || cause instanceof CancellationException) {
+                return true;
+            }
+        }
+        return Thread.currentThread().isInterrupted();
+    }
+
+    /** Overwrite a started metrics document so no reader takes the metrics written so far as a result. */
+    private static void markFailed(String ontologyPath, OQuaRE.ScoringMode scoringMode, Exception error) {
+        String jsonFilePath = metricsJsonPath(ontologyPath);
+        if (!new File(jsonFilePath).exists()) {
+            return;
+        }
+        JsonObject rootObject = new JsonObject();
+        rootObject.addProperty("name", Paths.get(ontologyPath).getFileName().toString());
+        rootObject.addProperty("timestamp", Instant.now().toString());
+        rootObject.addProperty("scoring_mode", scoringMode.label());
+        rootObject.addProperty("status", "failed");
+        rootObject.addProperty("message", String.valueOf(error.getMessage()));
+        try {
+            writeJson(jsonFilePath, rootObject);
+        } catch (IOException e) {
+            System.err.println("Could not mark " + jsonFilePath + " as failed, removing it: " + e.getMessage());
+            new File(jsonFilePath).delete();
+        }
     }
 
-    private static void processOntology(String ontologyPath) throws Exception {
-        OWLOntologyManager manager = OWLManager.createOWLOntologyManager();
+    private static String scoreOntology(String ontologyPath, String metricRangesPath,
+                                        OQuaRE.ScoringMode scoringMode, String contentHash,
+                                        String sourcePath) throws Exception {
+        // Scoring reads the ontology from several threads (HermiT next to the calculator pool)
+        OWLOntologyManager manager = OWLManager.createConcurrentOWLOntologyManager();
         File ontologyFile = new File(ontologyPath);
 
         if (!ontologyFile.exists()) {
@@ -67,8 +304,23 @@ public class Main {
                 throw new IllegalStateException("Failed to load ontology: null ontology returned");
             }
 
-            // Calculate OQuaRE metrics
-            OQuaRE.Scores metrics = OQuaRE.calculateScores(ontology);
+            // One hierarchy index serves both the metric calculators and the seed term extractors
+            OntologyIndex index = OntologyIndex.build(ontology);
+
+            // Calculate OQuaRE metrics, writing each one as soon as it is settled; the file hash
+            // keys HermiT's results in the reasoner cache
+            String jsonFilePath = metricsJsonPath(ontologyPath);
+            Callable<String> fileHash = contentHash != null && SHA256_HEX.matcher(contentHash).matches()
+                    ? () -> contentHash
+                    : () -> ReasonerCache.hashFile(ontologyFile.toPath());
+            Callable<String> sourceHash = sourcePath != null ? () -> ReasonerCache.hashFile(Paths.get(sourcePath)) : null;
+            OQuaRE.Scores metrics = OQuaRE.calculateScores(index, scoringMode, fileHash, sourceHash, (metric, scores) -> {
+                try {
+                    writeJson(jsonFilePath, metricsDocument(scores, null, ontologyPath, scoringMode, "running"));
+                } catch (IOException e) {
+                    System.err.println("Error saving partial metrics to JSON: " + e.getMessage());
+                }
+            });
             
             // Calculate Sub-characteristics
             SubcharacteristicsCalculator.Scores subCharScores = SubcharacteristicsCalculator.calculateScores(metrics);
@@ -81,8 +333,50 @@ public class Main {
             System.out.println("Sub-characteristics Scores:");
             System.out.println(subCharScores);
 
+            // Extract seed terms for the worst metrics from the already loaded ontology
+            JsonObject seedTermsObject = null;
+            JsonArray worstMetricsArray = null;
+            Map<String, Long> seedTermTimingsMs = new LinkedHashMap<>();
+            MetricRanges ranges = null;
+            if (metricRangesPath != null) {
+                try {
+                    ranges = MetricRanges.load(metricRangesPath);
+                } catch (IOException e) {
+                    System.err.println("Skipping seed terms, could not read metric ranges: " + e.getMessage());
+                }
+            }
+            if (ranges != null) {
+                List<String> worstMetrics = ranges.worstMetrics(toJsonObject(metrics));
+                System.out.println("\nMetrics in the worst range: " + String.join(", ", worstMetrics));
+
+                // No worst metrics: extract seed terms for all metrics, like the Python selector
+                Map<String, Map<OWLClass, Double>> seedTerms = RunGenericExtractor.runExtractors(
+                        index, RunGenericExtractor.selectExtractors(worstMetrics), null, seedTermTimingsMs);
+
+                worstMetricsArray = new JsonArray();
+                for (String metric : worstMetrics) {
+                    worstMetricsArray.add(metric);
+                }
+                seedTermsObject = new JsonObject();
+                for (Map.Entry<String, Map<OWLClass, Double>> entry : seedTerms.entrySet()) {
+                    seedTermsObject.add(entry.getKey(), RunGenericExtractor.toJson(entry.getValue()));
+                }
+            }
+
+            // The OWL 2 profiles are only reported, so they are checked once nothing waits on them
+            if (metrics.reasoning != null) {
+                metrics.reasoning.checkProfiles();
+            }
+
             // Save to JSON file
-            saveScoresToJson(metrics, subCharScores, ontologyPath);
+            if (!metrics.isComplete()) {
+                System.err.println("Metrics not calculated: " + metrics.metricStatus);
+            }
+            if (saveScoresToJson(metrics, subCharScores, ontologyPath, scoringMode, worstMetricsArray, seedTermsObject,
+                    seedTermTimingsMs) == null) {
+                throw new IllegalStateException("Failed to save metrics JSON for " + ontologyPath);
+            }
+            return jsonFilePath;
             
         } catch (OWLOntologyCreationException e) {
             System.err.println("Error loading ontology: " + e.getMessage());
@@ -94,31 +388,82 @@ public class Main {
         }
     }
 
-    private static void saveScoresToJson(OQuaRE.Scores metrics, SubcharacteristicsCalculator.Scores subCharScores, String ontologyPath) {
-        try {
-            Path inputPath = Paths.get(ontologyPath);
-            String baseName = inputPath.getFileName().toString();
-            String jsonFilePath = inputPath.getParent().resolve(baseName + "_metrics.json").toString();
-
-            JsonObject rootObject = new JsonObject();
-            rootObject.addProperty("name", baseName);
-            rootObject.addProperty("timestamp", Instant.now().toString());
-            
-            Gson gson = new GsonBuilder().setPrettyPrinting().create();
-            JsonObject metricsObject = gson.toJsonTree(metrics).getAsJsonObject();
-            JsonObject subCharObject = gson.toJsonTree(subCharScores).getAsJsonObject();
-            
-            rootObject.add("metrics", metricsObject);
-            rootObject.add("subcharacteristics", subCharObject);
+    private static String metricsJsonPath(String ontologyPath) {
+        Path inputPath = Paths.get(ontologyPath);
+        return inputPath.getParent().resolve(inputPath.getFileName().toString() + "_metrics.json").toString();
+    }
 
-            try (FileWriter writer = new FileWriter(jsonFilePath)) {
-                gson.toJson(rootObject, writer);
+    private static String saveScoresToJson(OQuaRE.Scores metrics, SubcharacteristicsCalculator.Scores subCharScores, String ontologyPath,
+                                           OQuaRE.ScoringMode scoringMode, JsonArray worstMetrics, JsonObject seedTerms,
+                                           Map<String, Long> seedTermTimingsMs) {
+        try {
+            String jsonFilePath = metricsJsonPath(ontologyPath);
+            JsonObject rootObject = metricsDocument(metrics, subCharScores, ontologyPath, scoringMode,
+                    metrics.isComplete() ? "complete" : "partial");
+            if (seedTerms != null) {
+                rootObject.add("worst_metrics", worstMetrics);
+                rootObject.add("seed_terms", seedTerms);
+                rootObject.add("seed_term_timings_ms", JSON.toJsonTree(seedTermTimingsMs));
             }
 
+            writeJson(jsonFilePath, rootObject);
+
             System.out.println("\nMetrics saved to: " + jsonFilePath);
+            return jsonFilePath;
 
         } catch (Exception e) {
             System.err.println("Error saving metrics to JSON: " + e.getMessage());
+            return null;
+        }
+    }
+
+    /** The metrics document; subcharacteristics are left empty until all metrics are settled. */
+    private static JsonObject metricsDocument(OQuaRE.Scores metrics, SubcharacteristicsCalculator.Scores subCharScores,
+                                              String ontologyPath, OQuaRE.ScoringMode scoringMode, String status) {
+        JsonObject rootObject = new JsonObject();
+        rootObject.addProperty("name", Paths.get(ontologyPath).getFileName().toString());
+        rootObject.addProperty("timestamp", Instant.now().toString());
+        rootObject.addProperty("scoring_mode", scoringMode.label());
+        rootObject.addProperty("status", status);
+        rootObject.add("metrics", toJsonObject(metrics));
+        rootObject.add("subcharacteristics", subCharScores != null ? toJsonObject(subCharScores) : new JsonObject());
+        rootObject.add("metric_status", JSON.toJsonTree(metrics.metricStatus));
+        rootObject.add("metric_timings_ms", JSON.toJsonTree(metrics.metricTimingsMs));
+        if (metrics.reasoning != null) {
+            rootObject.add("reasoning", metrics.reasoning.toJson());
+        }
+        if (metrics.reasonerCache != null) {
+            rootObject.addProperty("reasoner_cache", metrics.reasonerCache);
+        }
+        return rootObject;
+    }
+
+    /** Serialize scores, turning NaN and infinite values into null. */
+    private static JsonObject toJsonObject(Object scores) {
+        JsonObject object = JSON.toJsonTree(scores).getAsJsonObject();
+        for (Map.Entry<String, JsonElement> entry : object.entrySet()) {
+            JsonElement value = entry.getValue();
+            if (value.isJsonPrimitive() && value.getAsJsonPrimitive().isNumber()) {
+                double number = value.getAsDouble();
+                if (Double.isNaN(number) || Double.isInfinite(number)) {
+                    entry.setValue(JsonNull.INSTANCE);
+                }
+            }
+        }
+        return object;
+    }
+
+    /** Write through a temporary file so a reader never sees a half-written document. */
+    private static void writeJson(String jsonFilePath, JsonObject rootObject) throws IOException {
+        Path target = Paths.get(jsonFilePath);
+        Path temp = target.resolveSibling(target.getFileName() + ".tmp");
+        try (Writer writer = Files.newBufferedWriter(temp, StandardCharsets.UTF_8)) {
+            JSON.toJson(rootObject, writer);
+        }
+        try {
+            Files.move(temp, target, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+        } catch (AtomicMoveNotSupportedException e) {
+            Files.move(temp, target, StandardCopyOption.REPLACE_EXISTING);
         }
     }
 }
@@ -3,5 +3,9 @@ package com.calculation_engine;
 import org.semanticweb.owlapi.model.OWLOntology;
 
 public interface MetricCalculator {
-    double calculate(OWLOntology ontology);
-}
\ No newline at end of file
+    double calculate(OntologyIndex index);
+
+    default double calculate(OWLOntology ontology) {
+        return calculate(OntologyIndex.build(ontology));
+    }
+}
@@ -0,0 +1,143 @@
+package com.calculation_engine;
+
+import com.google.gson.GsonBuilder;
+import com.google.gson.JsonElement;
+import com.google.gson.JsonObject;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.regex.Pattern;
+
+/**
+ * Worst-band thresholds of the OQuaRE metrics, read from the "1 (Worst)" column of
+ * metrics/oquare_metrics.csv (e.g. "< 0.2" or "> 12"). parse_worst_range in
+ * seed_terms_selector.py applies the same rules, so the Python pipeline picks the same
+ * metrics for seed-term extraction; run this class with the CSV path to print the table
+ * it parsed as JSON.
+ */
+public class MetricRanges {
+    private static final String METRIC_COLUMN = "Metric";
+    private static final String WORST_COLUMN = "1 (Worst)";
+    private static final Pattern NUMBER = Pattern.compile("[+-]?(\\d+\\.?\\d*|\\.\\d+)([eE][+-]?\\d+)?");
+
+    private final Map<String, Double> lessThan = new LinkedHashMap<>();
+    private final Map<String, Double> greaterThan = new LinkedHashMap<>();
+
+    public static MetricRanges load(String csvPath) throws IOException {
+        MetricRanges ranges = new MetricRanges();
+        try (BufferedReader reader = Files.newBufferedReader(Paths.get(csvPath), StandardCharsets.UTF_8)) {
+            String header = reader.readLine();
+            if (header == null) {
+                throw new IOException("Empty metric ranges file: " + csvPath);
+            }
+            List<String> columns = splitCsvLine(header.replace("\uFEFF", ""));
+            int metricIndex = columns.indexOf(METRIC_COLUMN);
+            int worstIndex = columns.indexOf(WORST_COLUMN);
+            if (metricIndex < 0 || worstIndex < 0) {
+                throw new IOException("Metric ranges file needs \"" + METRIC_COLUMN + "\" and \"" + WORST_COLUMN + "\" columns: " + csvPath);
+            }
+
+            String line;
+            while ((line = reader.readLine()) != null) {
+                List<String> values = splitCsvLine(line);
+                if (values.size() <= Math.max(metricIndex, worstIndex)) {
+                    continue;
+                }
+                ranges.addRange(values.get(metricIndex), values.get(worstIndex));
+            }
+        }
+        return ranges;
+    }
+
+    private void addRange(String metricName, String worstRange) {
+        String range = worstRange.trim();
+        // Whitespace inside the number is ignored, which fixes typos such as ">0. 8" in the CSV
+        String threshold = range.isEmpty() ? "" : range.substring(1).replaceAll("\\s", "");
+        if (!NUMBER.matcher(threshold).matches()) {
+            System.err.println("Unknown range format: " + worstRange + " for " + metricName);
+        } else if (range.startsWith("<")) {
+            lessThan.put(metricName, Double.parseDouble(threshold));
+        } else if (range.startsWith(">")) {
+            greaterThan.put(metricName, Double.parseDouble(threshold));
+        } else {
+            System.err.println("Unknown range format: " + worstRange + " for " + metricName);
+        }
+    }
+
+    public boolean isWorstScore(String metricName, double value) {
+        if (lessThan.containsKey(metricName)) {
+            return value < lessThan.get(metricName);
+        }
+        if (greaterThan.containsKey(metricName)) {
+            return value > greaterThan.get(metricName);
+        }
+        return false;
+    }
+
+    /**
+     * Names of the metrics in the worst band, without the "Onto" suffix (the names the seed
+     * term extractors use), given the "metrics" object of the metrics JSON.
+     */
+    public List<String> worstMetrics(JsonObject metrics) {
+        List<String> worst = new ArrayList<>();
+        for (Map.Entry<String, JsonElement> entry : metrics.entrySet()) {
+            String metricName = entry.getKey();
+            JsonElement value = entry.getValue();
+            if (!value.isJsonPrimitive() || !value.getAsJsonPrimitive().isNumber()) {
+                continue;
+            }
+            if (isWorstScore(metricName, value.getAsDouble())) {
+                worst.add(metricName.endsWith("Onto") ? metricName.substring(0, metricName.length() - 4) : metricName);
+            }
+        }
+        return worst;
+    }
+
+    /** The parsed table, {"<metric>": {"type": "less_than" | "greater_than", "threshold": x}}. */
+    public JsonObject toJson() {
+        JsonObject table = new JsonObject();
+        for (Map.Entry<String, Double> entry : lessThan.entrySet()) {
+            table.add(entry.getKey(), band("less_than", entry.getValue()));
+        }
+        for (Map.Entry<String, Double> entry : greaterThan.entrySet()) {
+            table.add(entry.getKey(), band("greater_than", entry.getValue()));
+        }
+        return table;
+    }
+
+    private static JsonObject band(String type, double threshold) {
+        JsonObject band = new JsonObject();
+        band.addProperty("type", type);
+        band.addProperty("threshold", threshold);
+        return band;
+    }
+
+    public static void main(String[] args) throws IOException {
+        if (args.length != 1) {
+            System.err.println("Usage: java -cp <classpath> com.calculation_engine.MetricRanges <oquare_metrics.csv>");
+            System.exit(1);
+        }
+        System.out.println(new GsonBuilder().setPrettyPrinting().create().toJson(load(args[0]).toJson()));
+    }
+
+    // The ranges CSV has no quoted commas, but tolerate quoted cells
+    private static List<String> splitCsvLine(String line) {
+        List<String> values = new ArrayList<>(Arrays.asList(line.split(",", -1)));
+        for (int i = 0; i < values.size(); i++) {
+            String value = values.get(i).trim();
+            if (value.length() >= 2 && value.startsWith("\"") && value.endsWith("\"")) {
+                value = value.substring(1, value.length() - 1);
+            }
+            values.set(i, value);
+        }
+        return values;
+    }
+}
@@ -9,14 +9,74 @@ import org.semanticweb.owlapi.reasoner.SimpleConfiguration;
 
 import com.calculation_engine.oquareMetrics.*;
 
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.Callable;
+import java.util.concurrent.CompletionService;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorCompletionService;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.function.BiConsumer;
+
 public class OQuaRE {
 
         public static class Scores {
-                public double ANOnto, AROnto, CBOnto, CROnto, DITOnto, INROnto, LCOMOnto, NACOnto, NOCOnto, NOMOnto,
-                                POnto,
-                                PROnto, RFCOnto, RROnto, TMOnto, WMCOnto;
-                public double modularityScore, reusabilityScore, analysabilityScore, changeabilityScore,
-                                modificationStabilityScore, testabilityScore;
+                /** Metrics that timed out, failed or have not finished yet stay NaN. */
+                public double ANOnto = Double.NaN, AROnto = Double.NaN, CBOnto = Double.NaN, CROnto = Double.NaN,
+                                DITOnto = Double.NaN, INROnto = Double.NaN, LCOMOnto = Double.NaN, NACOnto = Double.NaN,
+                                NOCOnto = Double.NaN, NOMOnto = Double.NaN, POnto = Double.NaN, PROnto = Double.NaN,
+                                RFCOnto = Double.NaN, RROnto = Double.NaN, TMOnto = Double.NaN, WMCOnto = Double.NaN;
+                public double modularityScore = Double.NaN, reusabilityScore = Double.NaN,
+                                analysabilityScore = Double.NaN, changeabilityScore = Double.NaN,
+                                modificationStabilityScore = Double.NaN, testabilityScore = Double.NaN;
+                /** Milliseconds each metric took; transient, so it stays out of the "metrics" object. */
+                public transient Map<String, Long> metricTimingsMs = new LinkedHashMap<>();
+                /** "pending", "ok", "timeout" or "failed" for every metric. */
+                public transient Map<String, String> metricStatus = new LinkedHashMap<>();
+                /** "hit", "source" (a module reusing its source's entry) or "miss" in the reasoner cache; null when HermiT did not run or nothing is cached. */
+                public transient String reasonerCache;
+                /** The reasoning chosen for the ontology and scoring mode, and why. */
+                public transient ReasoningPlan reasoning;
+
+                /** True when every metric was calculated. */
+                public boolean isComplete() {
+                        for (String status : metricStatus.values()) {
+                                if (!status.equals(STATUS_OK)) {
+                                        return false;
+                                }
+                        }
+                        return true;
+                }
+
+                void setMetric(String name, double value) {
+                        switch (name) {
+                                case "ANOnto": ANOnto = value; break;
+                                case "AROnto": AROnto = value; break;
+                                case "CBOnto": CBOnto = value; break;
+                                case "CROnto": CROnto = value; break;
+                                case "DITOnto": DITOnto = value; break;
+                                case "INROnto": INROnto = value; break;
+                                case "LCOMOnto": LCOMOnto = value; break;
+                                case "NACOnto": NACOnto = value; break;
+                                case "NOCOnto": NOCOnto = value; break;
+                                case "NOMOnto": NOMOnto = value; break;
+                                case "POnto": POnto = value; break;
+                                case "PROnto": PROnto = value; break;
+                                case "RFCOnto": RFCOnto = value; break;
+                                case "RROnto": RROnto = value; break;
+                                case "TMOnto": TMOnto = value; break;
+                                case "WMCOnto": WMCOnto = value; break;
+                                default: throw new IllegalArgumentException("Unknown metric: " + name);
+                        }
+                }
 
                 @Override
                 public String toString() {
@@ -33,44 +93,250 @@ public class OQuaRE {
                 }
         }
 
+        /**
+         * How much DL reasoning runs before the metrics are calculated. The calculators only
+         * read asserted axioms, so the scores are the same in every mode; the modes differ in
+         * whether an inconsistent ontology is rejected and in how long HermiT takes.
+         */
+        public enum ScoringMode {
+                /** Asserted axioms only, no DL reasoner is created. */
+                STRUCTURAL,
+                /** HermiT consistency check without classification. */
+                CONSISTENCY,
+                /** HermiT consistency check and classification (precomputeInferences). */
+                FULL;
+
+                public static ScoringMode parse(String value) {
+                        try {
+                                return valueOf(value.trim().toUpperCase(Locale.ROOT));
+                        } catch (IllegalArgumentException e) {
+                                throw new IllegalArgumentException(
+                                                "Unknown scoring mode: " + value + " (use structural, consistency or full)");
+                        }
+                }
+
+                public String label() {
+                        return name().toLowerCase(Locale.ROOT);
+                }
+        }
+
+        public static final String STATUS_PENDING = "pending";
+        public static final String STATUS_OK = "ok";
+        public static final String STATUS_TIMEOUT = "timeout";
+        public static final String STATUS_FAILED = "failed";
+
         public static Scores calculateScores(OWLOntology ontology) {
+                return calculateScores(ontology, ScoringMode.FULL);
+        }
+
+        public static Scores calculateScores(OWLOntology ontology, ScoringMode mode) {
+                return calculateScores(OntologyIndex.build(ontology), mode);
+        }
+
+        public static Scores calculateScores(OntologyIndex index, ScoringMode mode) {
+                return calculateScores(index, mode, null, null);
+        }
+
+        /**
+         * Threads for the metric calculators: ENGINE_METRIC_THREADS, or one per available core.
+         * The calculators only read the immutable OntologyIndex, so they run side by side.
+         */
+        private static final ExecutorService CALCULATOR_POOL = Executors.newFixedThreadPool(calculatorThreads(),
+                        daemonThreads("oquare-calculator"));
+
+        /**
+         * Calculators running right now. The calculators do not check for interrupts, so one
+         * cancelled over its budget keeps its pool thread until it finishes on its own.
+         */
+        private static final AtomicInteger RUNNING_CALCULATORS = new AtomicInteger();
+
+        /** HermiT runs beside the calculators so that metrics are reported while it reasons. */
+        private static final ExecutorService REASONER_POOL = Executors.newCachedThreadPool(daemonThreads("oquare-reasoner"));
+
+        /** HermiT's earlier results by ontology file hash (ENGINE_REASONER_CACHE_DIR), or null. */
+        private static final ReasonerCache REASONER_CACHE = ReasonerCache.fromEnv();
+
+        /**
+         * Calculators still running on the shared pool. Between scorings, anything above zero
+         * is a timed-out calculator holding a thread that later scorings cannot use.
+         */
+        public static int runningCalculators() {
+                return RUNNING_CALCULATORS.get();
+        }
+
+        private static ThreadFactory daemonThreads(String name) {
+                return runnable -> {
+                        Thread thread = new Thread(runnable, name);
+                        thread.setDaemon(true);
+                        return thread;
+                };
+        }
+
+        public static int calculatorThreads() {
+                return positiveEnv("ENGINE_METRIC_THREADS", Runtime.getRuntime().availableProcessors());
+        }
+
+        /** Seconds each metric may run (ENGINE_METRIC_TIMEOUT, default 120) before it is cancelled. */
+        static int metricTimeoutSeconds() {
+                return positiveEnv("ENGINE_METRIC_TIMEOUT", 120);
+        }
+
+        private static int positiveEnv(String name, int defaultValue) {
+                String configured = System.getenv(name);
+                if (configured != null && !configured.trim().isEmpty()) {
+                        try {
+                                return Math.max(1, Integer.parseInt(configured.trim()));
+                        } catch (NumberFormatException e) {
+                                System.err.println("Ignoring invalid " + name + ": " + configured);
+                        }
+                }
+                return defaultValue;
+        }
+
+        /** The calculators by metric name, in the order of the Scores fields. */
+        private static Map<String, MetricCalculator> calculators() {
+                Map<String, MetricCalculator> calculators = new LinkedHashMap<>();
+                calculators.put("ANOnto", new ANOntoCalculator());
+                calculators.put("AROnto", new AROntoCalculator());
+                calculators.put("CBOnto", new CBOntoCalculator());
+                // calculators.put("CBOnto2", new CBOnto2Calculator());
+                calculators.put("CROnto", new CROntoCalculator());
+                calculators.put("DITOnto", new DITOntoCalculator());
+                calculators.put("INROnto", new INROntoCalculator());
+                calculators.put("LCOMOnto", new LCOMOntoCalculator());
+                calculators.put("NACOnto", new NACOntoCalculator());
+                calculators.put("NOCOnto", new NOCOntoCalculator());
+                calculators.put("NOMOnto", new NOMOntoCalculator());
+                calculators.put("POnto", new POntoCalculator());
+                calculators.put("PROnto", new PROntoCalculator());
+                calculators.put("RFCOnto", new RFCOntoCalculator());
+                calculators.put("RROnto", new RROntoCalculator());
+                calculators.put("TMOnto", new TMOntoCalculator());
+                // calculators.put("TMOnto2", new TMOnto2Calculator());
+                calculators.put("WMCOnto", new WMCOntoCalculator());
+                // calculators.put("WMCOnto2", new WMCOnto2Calculator());
+                return calculators;
+        }
+
+        private static class MetricResult {
+                final String name;
+                final double value;
+                final long elapsedMs;
+                final Throwable error;
+
+                MetricResult(String name, double value, long elapsedMs, Throwable error) {
+                        this.name = name;
+                        this.value = value;
+                        this.elapsedMs = elapsedMs;
+                        this.error = error;
+                }
+        }
+
+        /**
+         * Score an ontology from its hierarchy index, which the caller can share with the
+         * seed term extractors. The calculators run on the calculator pool while the reasoner
+         * the ReasoningPlan picks, if any, runs on the reasoner pool. Each metric has its own
+         * time budget (ENGINE_METRIC_TIMEOUT), counted from when it starts: a metric over budget is
+         * cancelled and marked "timeout", a metric that throws is marked "failed", and both
+         * stay NaN while the others are still scored. onMetric, when given, is called on this
+         * thread with the metric name and the scores so far as soon as each metric is settled.
+         * An inconsistent ontology still fails the whole scoring. contentHash, when given,
+         * returns the SHA-256 of the ontology file; HermiT's results are looked up in and saved
+         * to the reasoner cache under it, so an unchanged ontology is only reasoned over once.
+         * It is only called when HermiT runs and the cache is enabled.
+         */
+        public static Scores calculateScores(OntologyIndex index, ScoringMode mode, Callable<String> contentHash,
+                                             BiConsumer<String, Scores> onMetric) {
+                return calculateScores(index, mode, contentHash, null, onMetric);
+        }
+
+        /**
+         * Score a module, i.e. a subset of the axioms of a source ontology, as above. sourceHash
+         * returns the SHA-256 of the source's file: when the module itself misses the reasoner
+         * cache, a consistent source's entry answers for it.
+         */
+        public static Scores calculateScores(OntologyIndex index, ScoringMode mode, Callable<String> contentHash,
+                                             Callable<String> sourceHash, BiConsumer<String, Scores> onMetric) {
+                OWLOntology ontology = index.getOntology();
                 Scores scores = new Scores();
+                long budgetNanos = TimeUnit.SECONDS.toNanos(metricTimeoutSeconds());
+                CompletionService<MetricResult> completion = new ExecutorCompletionService<>(CALCULATOR_POOL);
+                Map<String, Future<MetricResult>> pending = new LinkedHashMap<>();
+                Map<String, Long> startedAt = new ConcurrentHashMap<>();
+                Future<String> reasoning = null;
                 try {
-                        // Create and run reasoner
-                        ConsoleProgressMonitor progressMonitor = new ConsoleProgressMonitor();
-                        OWLReasonerConfiguration config = new SimpleConfiguration(progressMonitor);
-                        OWLReasoner reasoner = new ReasonerFactory().createReasoner(ontology, config);
+                        for (Map.Entry<String, MetricCalculator> entry : calculators().entrySet()) {
+                                String name = entry.getKey();
+                                MetricCalculator calculator = entry.getValue();
+                                scores.metricStatus.put(name, STATUS_PENDING);
+                                pending.put(name, completion.submit(() -> {
+                                        RUNNING_CALCULATORS.incrementAndGet();
+                                        long started = System.nanoTime();
+                                        startedAt.put(name, started);
+                                        try {
+                                                double value = calculator.calculate(index);
+                                                return new MetricResult(name, value, (System.nanoTime() - started) / 1_000_000, null);
+                                        } catch (Exception | StackOverflowError e) {
+                                                return new MetricResult(name, Double.NaN, (System.nanoTime() - started) / 1_000_000, e);
+                                        } finally {
+                                                RUNNING_CALCULATORS.decrementAndGet();
+                                        }
+                                }));
+                        }
 
-                        // Check consistency
-                        if (!reasoner.isConsistent()) {
-                                throw new RuntimeException("Ontology is inconsistent");
+                        // The calculators are already running while the ontology is analysed
+                        ReasoningPlan plan = ReasoningPlan.choose(ontology, mode);
+                        scores.reasoning = plan;
+                        System.out.println("Reasoning: " + plan.getPath().label() + " (" + plan.getReason() + ")");
+                        // On the structural path the asserted hierarchy is the inferred one: nothing to run
+                        if (plan.getPath() == ReasoningPlan.Path.HERMIT) {
+                                reasoning = REASONER_POOL.submit(() -> reason(ontology, mode, contentHash, sourceHash));
                         }
 
-                        // Precompute inferences
-                        reasoner.precomputeInferences();
-
-                        // Calculate individual metrics
-                        scores.ANOnto = new ANOntoCalculator().calculate(ontology);
-                        scores.AROnto = new AROntoCalculator().calculate(ontology);
-                        scores.CBOnto = new CBOntoCalculator().calculate(ontology);
-                        // scores.CBOnto2 = new CBOnto2Calculator().calculate(ontology);
-                        scores.CROnto = new CROntoCalculator().calculate(ontology);
-                        scores.DITOnto = new DITOntoCalculator().calculate(ontology);
-                        scores.INROnto = new INROntoCalculator().calculate(ontology);
-                        scores.LCOMOnto = new LCOMOntoCalculator().calculate(ontology);
-                        scores.NACOnto = new NACOntoCalculator().calculate(ontology);
-                        scores.NOCOnto = new NOCOntoCalculator().calculate(ontology);
-                        scores.NOMOnto = new NOMOntoCalculator().calculate(ontology);
-                        scores.POnto = new POntoCalculator().calculate(ontology);
-                        scores.PROnto = new PROntoCalculator().calculate(ontology);
-                        scores.RFCOnto = new RFCOntoCalculator().calculate(ontology);
-                        scores.RROnto = new RROntoCalculator().calculate(ontology);
-                        scores.TMOnto = new TMOntoCalculator().calculate(ontology);
-                        // scores.TMOnto2 = new TMOnto2Calculator().calculate(ontology);
-                        scores.WMCOnto = new WMCOntoCalculator().calculate(ontology);
-                        // scores.WMCOnto2 = new WMCOnto2Calculator().calculate(ontology);
-                        // Calculate composite scores
+                        // Collect individual metrics as they finish, cancelling those over budget
+                        while (!pending.isEmpty()) {
+                                long now = System.nanoTime();
+                                long wait = budgetNanos;
+                                Iterator<Map.Entry<String, Future<MetricResult>>> it = pending.entrySet().iterator();
+                                while (it.hasNext()) {
+                                        Map.Entry<String, Future<MetricResult>> entry = it.next();
+                                        Long started = startedAt.get(entry.getKey());
+                                        if (started == null) {
+                                                continue;
+                                        }
+                                        long left = started + budgetNanos - now;
+                                        if (left > 0) {
+                                                wait = Math.min(wait, left);
+                                                continue;
+                                        }
+                                        entry.getValue().cancel(true);
+                                        it.remove();
+                                        System.err.println("Metric " + entry.getKey() + " timed out after "
+                                                        + metricTimeoutSeconds() + " seconds");
+                                        settle(scores, entry.getKey(), STATUS_TIMEOUT, Double.NaN,
+                                                        (now - started) / 1_000_000, onMetric);
+                                }
+                                if (pending.isEmpty()) {
+                                        break;
+                                }
 
+                                Future<MetricResult> done = completion.poll(wait, TimeUnit.NANOSECONDS);
+                                if (done == null || done.isCancelled()) {
+                                        continue;
+                                }
+                                MetricResult result = done.get();
+                                if (pending.remove(result.name) == null) {
+                                        continue;
+                                }
+                                if (result.error != null) {
+                                        System.err.println("Failed to calculate " + result.name + ": " + result.error.getMessage());
+                                        settle(scores, result.name, STATUS_FAILED, Double.NaN, result.elapsedMs, onMetric);
+                                } else {
+                                        settle(scores, result.name, STATUS_OK, result.value, result.elapsedMs, onMetric);
+                                }
+                        }
+
+                        // Calculate composite scores; a missing metric leaves its composites NaN
                         scores.modularityScore = scores.CBOnto + scores.WMCOnto;
                         scores.reusabilityScore = scores.WMCOnto + scores.RFCOnto + scores.NOMOnto + scores.CBOnto
                                         + scores.DITOnto
@@ -84,14 +350,118 @@ public class OQuaRE {
                         scores.testabilityScore = scores.WMCOnto + scores.DITOnto + scores.RFCOnto
                                         + scores.NOMOnto + scores.CBOnto + scores.LCOMOnto;
 
-                        // Don't forget to dispose the reasoner
-                        reasoner.dispose();
+                        if (reasoning != null) {
+                                try {
+                                        scores.reasonerCache = reasoning.get();
+                                } catch (ExecutionException e) {
+                                        throw new RuntimeException(e.getCause().getMessage(), e.getCause());
+                                }
+                        }
 
                 } catch (Exception e) {
                         System.err.println("Error calculating metrics: " + e.getMessage());
                         throw new RuntimeException("Failed to calculate metrics", e);
+                } finally {
+                        // Stop calculators and the reasoner still running after a failure or an interrupt
+                        for (Future<MetricResult> future : pending.values()) {
+                                future.cancel(true);
+                        }
+                        if (reasoning != null) {
+                                reasoning.cancel(true);
+                        }
                 }
 
                 return scores;
         }
+
+        private static void settle(Scores scores, String name, String status, double value, long elapsedMs,
+                                   BiConsumer<String, Scores> onMetric) {
+                scores.setMetric(name, value);
+                scores.metricStatus.put(name, status);
+                scores.metricTimingsMs.put(name, elapsedMs);
+                if (onMetric != null) {
+                        onMetric.accept(name, scores);
+                }
+        }
+
+        /**
+         * Run HermiT as the scoring mode asks. It is skipped when the reasoner cache already
+         * has its results for this ontology, or for the source ontology of a module when the
+         * source is consistent; ontologies with imports are not cached. An inconsistent
+         * ontology is an error. Returns "hit", "source" or "miss" in the cache, or null when
+         * nothing is cached.
+         */
+        private static String reason(OWLOntology ontology, ScoringMode mode, Callable<String> contentHash,
+                                     Callable<String> sourceHash) {
+                ReasonerCache cache = contentHash != null ? REASONER_CACHE : null;
+                String cacheKey = null;
+                // The key only covers the ontology's own file, so imported axioms would go unnoticed
+                if (cache != null && ontology.directImportsDocuments().findAny().isPresent()) {
+                        System.out.println("Not caching reasoner results, the ontology has imports");
+                        cache = null;
+                }
+                if (cache != null) {
+                        try {
+                                cacheKey = contentHash.call();
+                        } catch (Exception e) {
+                                System.err.println("Not caching reasoner results, could not hash the ontology: " + e.getMessage());
+                                cache = null;
+                        }
+                }
+                if (cache != null) {
+                        ReasonerCache.Classification cached = cache.load(cacheKey);
+                        // A consistency check is answered by any entry, classification only by a classified one
+                        if (cached != null && (mode != ScoringMode.FULL || cached.isClassified())) {
+                                System.out.println("Reusing cached " + (cached.isClassified() ? "classification" : "consistency check"));
+                                if (!cached.isConsistent()) {
+                                        throw new IllegalStateException("Ontology is inconsistent");
+                                }
+                                return "hit";
+                        }
+                        // A module holds a subset of its source's axioms, so it is consistent whenever the
+                        // source is; an inconsistent source says nothing about the module
+                        ReasonerCache.Classification source = loadSource(cache, sourceHash);
+                        if (source != null && source.isConsistent() && (mode != ScoringMode.FULL || source.isClassified())) {
+                                System.out.println("Reusing the cached results of the module's source ontology");
+                                cache.store(cacheKey, ReasonerCache.capture(true, source.isClassified()));
+                                return "source";
+                        }
+                }
+
+                // Create and run reasoner
+                ConsoleProgressMonitor progressMonitor = new ConsoleProgressMonitor();
+                OWLReasonerConfiguration config = new SimpleConfiguration(progressMonitor);
+                OWLReasoner reasoner = new ReasonerFactory().createReasoner(ontology, config);
+                try {
+                        // Check consistency
+                        boolean consistent = reasoner.isConsistent();
+
+                        // Precompute inferences
+                        if (consistent && mode == ScoringMode.FULL) {
+                                reasoner.precomputeInferences();
+                        }
+                        if (cache != null) {
+                                cache.store(cacheKey, ReasonerCache.capture(consistent, mode == ScoringMode.FULL));
+                        }
+                        if (!consistent) {
+                                throw new IllegalStateException("Ontology is inconsistent");
+                        }
+                        return cache != null ? "miss" : null;
+                } finally {
+                        // Don't forget to dispose the reasoner
+                        reasoner.dispose();
+                }
+        }
+
+        private static ReasonerCache.Classification loadSource(ReasonerCache cache, Callable<String> sourceHash) {
+                if (sourceHash == null) {
+                        return null;
+                }
+                try {
+                        return cache.load(sourceHash.call());
+                } catch (Exception e) {
+                        System.err.println("Not reusing the source's reasoner results, could not hash it: " + e.getMessage());
+                        return null;
+                }
+        }
 }
@@ -2,83 +2,104 @@ package com.calculation_engine;
 
 import org.semanticweb.owlapi.apibinding.OWLManager;
 import org.semanticweb.owlapi.model.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
+import com.google.gson.GsonBuilder;
+import com.google.gson.JsonArray;
+import com.google.gson.JsonObject;
 
 import java.io.File;
+import java.util.Collections;
 import java.util.HashMap;
+import java.util.HashSet;
 import java.util.Map;
-import java.util.stream.Stream;
+import java.util.Set;
 
+/**
+ * Per-class counts of an ontology: the SubClassOf axioms with the class as superclass and
+ * the data and object properties whose domain mentions the class. Use analyze() as a
+ * library call, or run it with an ontology path to print the JSON.
+ */
 public class OntologyAnalyzer {
 
     public static void main(String[] args) {
-        try {
-            // Load the ontology
-            OWLOntologyManager manager = OWLManager.createOWLOntologyManager();
-            OWLOntology ontology = manager.loadOntologyFromOntologyDocument(new File("ontologies/ontologycosylab.rdf"));
-
-            // Maps to store counts for each class
-            Map<OWLClass, Integer> subclassCounts = new HashMap<>();
-            Map<OWLClass, Integer> dataPropertyCounts = new HashMap<>();
-            Map<OWLClass, Integer> objectPropertyCounts = new HashMap<>();
+        if (args.length == 0) {
+            System.err.println("Usage: java -cp <classpath> com.calculation_engine.OntologyAnalyzer <ontology_path>");
+            System.exit(1);
+        }
 
-            // Iterate over all classes in the ontology
-            for (OWLClass cls : ontology.getClassesInSignature()) {
-                // Count subclasses
-                int subclassCount = ontology.getSubClassAxiomsForSuperClass(cls).size();
-                subclassCounts.put(cls, subclassCount);
+        try {
+            JsonObject result = analyze(args[0]);
+            System.out.println(new GsonBuilder().setPrettyPrinting().create().toJson(result));
+        } catch (OWLOntologyCreationException e) {
+            System.err.println("Error loading ontology: " + e.getMessage());
+            System.exit(1);
+        }
+    }
 
-                // Count data properties that have this class in their domain
-                int dataPropertyCount = (int) ontology.getDataPropertiesInSignature().stream()
-                    .filter(prop -> {
-                        try (Stream<OWLClassExpression> domains = EntitySearcher.getDomains(prop, ontology)) {
-                            return domains.anyMatch(domain -> domain.containsEntityInSignature(cls));
-                        }
-                    })
-                    .count();
-                dataPropertyCounts.put(cls, dataPropertyCount);
+    public static JsonObject analyze(String ontologyPath) throws OWLOntologyCreationException {
+        File ontologyFile = new File(ontologyPath);
+        if (!ontologyFile.exists()) {
+            throw new IllegalArgumentException("The specified ontology file does not exist: " + ontologyPath);
+        }
+        OWLOntologyManager manager = OWLManager.createOWLOntologyManager();
+        OWLOntology ontology = manager.loadOntologyFromOntologyDocument(ontologyFile);
+        return analyze(ontology);
+    }
 
-                // Count object properties that have this class in their domain
-                int objectPropertyCount = (int) ontology.getObjectPropertiesInSignature().stream()
-                    .filter(prop -> {
-                        try (Stream<OWLClassExpression> domains = EntitySearcher.getDomains(prop, ontology)) {
-                            return domains.anyMatch(domain -> domain.containsEntityInSignature(cls));
-                        }
-                    })
-                    .count();
-                objectPropertyCounts.put(cls, objectPropertyCount);
+    /**
+     * Count per class and in total. The domain axioms are read once into a class to properties
+     * index, so each class's property counts are lookups.
+     */
+    public static JsonObject analyze(OWLOntology ontology) {
+        Map<OWLClass, Set<OWLDataProperty>> dataPropertiesByDomain = new HashMap<>();
+        for (OWLDataPropertyDomainAxiom axiom : ontology.getAxioms(AxiomType.DATA_PROPERTY_DOMAIN)) {
+            OWLDataProperty property = axiom.getProperty().asOWLDataProperty();
+            for (OWLClass cls : axiom.getDomain().getClassesInSignature()) {
+                dataPropertiesByDomain.computeIfAbsent(cls, key -> new HashSet<>()).add(property);
             }
+        }
+        Map<OWLClass, Set<OWLObjectProperty>> objectPropertiesByDomain = new HashMap<>();
+        for (OWLObjectPropertyDomainAxiom axiom : ontology.getAxioms(AxiomType.OBJECT_PROPERTY_DOMAIN)) {
+            // Domains of inverse property expressions are not domains of a named property
+            if (!axiom.getProperty().isNamed()) {
+                continue;
+            }
+            OWLObjectProperty property = axiom.getProperty().asOWLObjectProperty();
+            for (OWLClass cls : axiom.getDomain().getClassesInSignature()) {
+                objectPropertiesByDomain.computeIfAbsent(cls, key -> new HashSet<>()).add(property);
+            }
+        }
 
-            // Print the results
-            int totalSubclasses = 0;
-            int totalDataProperties = 0;
-            int totalObjectProperties = 0;
+        JsonArray classes = new JsonArray();
+        int totalSubclasses = 0;
+        int totalDataProperties = 0;
+        int totalObjectProperties = 0;
 
-            for (OWLClass cls : ontology.getClassesInSignature()) {
-                String classIRI = cls.getIRI().getShortForm();
-                int subCount = subclassCounts.get(cls);
-                int dataCount = dataPropertyCounts.get(cls);
-                int objCount = objectPropertyCounts.get(cls);
-                
-                totalSubclasses += subCount;
-                totalDataProperties += dataCount;
-                totalObjectProperties += objCount;
+        for (OWLClass cls : ontology.getClassesInSignature()) {
+            int subCount = ontology.getSubClassAxiomsForSuperClass(cls).size();
+            int dataCount = dataPropertiesByDomain.getOrDefault(cls, Collections.emptySet()).size();
+            int objCount = objectPropertiesByDomain.getOrDefault(cls, Collections.emptySet()).size();
 
-                System.out.println("Class: " + classIRI);
-                System.out.println("Subclasses Count: " + subCount);
-                System.out.println("Data Properties Count: " + dataCount);
-                System.out.println("Object Properties Count: " + objCount);
-                System.out.println();
-            }
+            totalSubclasses += subCount;
+            totalDataProperties += dataCount;
+            totalObjectProperties += objCount;
 
-            // Print totals
-            System.out.println("=== TOTALS ===");
-            System.out.println("Total Subclasses: " + totalSubclasses);
-            System.out.println("Total Data Properties: " + totalDataProperties);
-            System.out.println("Total Object Properties: " + totalObjectProperties);
-
-        } catch (OWLOntologyCreationException e) {
-            e.printStackTrace();
+            JsonObject classCounts = new JsonObject();
+            classCounts.addProperty("class", cls.getIRI().getShortForm());
+            classCounts.addProperty("iri", cls.getIRI().toString());
+            classCounts.addProperty("subclasses", subCount);
+            classCounts.addProperty("data_properties", dataCount);
+            classCounts.addProperty("object_properties", objCount);
+            classes.add(classCounts);
         }
+
+        JsonObject totals = new JsonObject();
+        totals.addProperty("subclasses", totalSubclasses);
+        totals.addProperty("data_properties", totalDataProperties);
+        totals.addProperty("object_properties", totalObjectProperties);
+
+        JsonObject result = new JsonObject();
+        result.add("classes", classes);
+        result.add("totals", totals);
+        return result;
     }
 }
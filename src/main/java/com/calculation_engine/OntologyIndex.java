@@ -0,0 +1,616 @@
+package com.calculation_engine;
+
+import org.semanticweb.owlapi.model.IRI;
+import org.semanticweb.owlapi.model.OWLAnnotationAssertionAxiom;
+import org.semanticweb.owlapi.model.OWLAxiom;
+import org.semanticweb.owlapi.model.OWLClass;
+import org.semanticweb.owlapi.model.OWLClassAssertionAxiom;
+import org.semanticweb.owlapi.model.OWLClassExpression;
+import org.semanticweb.owlapi.model.OWLDataPropertyAssertionAxiom;
+import org.semanticweb.owlapi.model.OWLDataPropertyDomainAxiom;
+import org.semanticweb.owlapi.model.OWLEquivalentClassesAxiom;
+import org.semanticweb.owlapi.model.OWLIndividual;
+import org.semanticweb.owlapi.model.OWLObjectPropertyDomainAxiom;
+import org.semanticweb.owlapi.model.OWLObjectPropertyRangeAxiom;
+import org.semanticweb.owlapi.model.OWLOntology;
+import org.semanticweb.owlapi.model.OWLProperty;
+import org.semanticweb.owlapi.model.OWLPropertyDomainAxiom;
+import org.semanticweb.owlapi.model.OWLSubClassOfAxiom;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.Iterator;
+import java.util.LinkedHashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
+
+/**
+ * Class hierarchy and axiom counts of an ontology, built in a single pass over its axioms
+ * and shared by the metric calculators and the seed term extractors.
+ *
+ * Classes are numbered in the order of getClassesInSignature() (owl:Thing included when it
+ * appears in the signature) and every per-class lookup takes that id. The super- and
+ * subclasses are the direct named ones, i.e. the SubClassOf axioms between two named
+ * classes, as the metric calculators read them. The seed term extractors read the "told"
+ * hierarchy instead (toldSuperClasses, toldSubClasses and the lookups built on them): every
+ * class in the signature of a super- or subclass expression, so that B is a told superclass
+ * of A in A SubClassOf r some B. The index is immutable: the arrays it hands out are shared
+ * and must not be modified.
+ */
+public final class OntologyIndex {
+    private static final int[] NO_IDS = new int[0];
+
+    private final OWLOntology ontology;
+    private final OWLClass[] classes;
+    private final Map<OWLClass, Integer> ids;
+    private final int thing;
+
+    private final int[][] superClasses;
+    private final int[][] subClasses;
+    private final boolean[] hasSuperClassAxiom;
+    private final int[] roots;
+    private final int[] leaves;
+    private final boolean[] isRoot;
+    private final HierarchyDag hierarchy;
+    private final int maxDepth;
+
+    private final int[][] toldSuperClasses;
+    private final int[][] toldSubClasses;
+    private final boolean[] hasSubClassExpression;
+    private final int[] toldRoots;
+    private final HierarchyDag toldHierarchy;
+
+    private final int[] subClassAxiomsAsSubClass;
+    private final int[] subClassAxiomsAsSuperClass;
+    private final int[] objectPropertiesOnSubClassAxioms;
+    private final List<Set<OWLProperty>> propertiesAsSubClass;
+    private final List<Set<OWLProperty>> propertiesAsSuperClass;
+    private final int[] propertyUsageAsSubClass;
+    private final int[] toldSubClassAxiomCounts;
+    private final int[] toldObjectPropertiesOnSubClassAxioms;
+    private final int[] domainCounts;
+    private final int[] rangeCounts;
+    private final int[] annotationCounts;
+    private final int[] instanceCounts;
+    private final int[] dataPropertyAssertionCounts;
+
+    private final int ontologyAnnotationCount;
+    private final int subClassOfAxiomCount;
+    private final int dataPropertyAssertionAxiomCount;
+    private final int classAssertionAxiomCount;
+    private final int propertyDomainAxiomCount;
+    private final int annotationAssertionAxiomCount;
+    private final int objectPropertiesOnClasses;
+
+    public static OntologyIndex build(OWLOntology ontology) {
+        return new OntologyIndex(ontology);
+    }
+
+    private OntologyIndex(OWLOntology ontology) {
+        this.ontology = ontology;
+        Set<OWLClass> signature = ontology.getClassesInSignature();
+        int n = signature.size();
+        classes = signature.toArray(new OWLClass[0]);
+        ids = new HashMap<>(n * 2);
+        for (int i = 0; i < n; i++) {
+            ids.put(classes[i], i);
+        }
+        thing = idOf(new OWLDataFactoryImpl().getOWLThing());
+
+        List<Set<Integer>> supers = new ArrayList<>(Collections.<Set<Integer>>nCopies(n, null));
+        List<Set<Integer>> subs = new ArrayList<>(Collections.<Set<Integer>>nCopies(n, null));
+        List<List<Integer>> toldSupers = new ArrayList<>(Collections.<List<Integer>>nCopies(n, null));
+        List<List<Integer>> toldSubs = new ArrayList<>(Collections.<List<Integer>>nCopies(n, null));
+        hasSuperClassAxiom = new boolean[n];
+        hasSubClassExpression = new boolean[n];
+        subClassAxiomsAsSubClass = new int[n];
+        subClassAxiomsAsSuperClass = new int[n];
+        objectPropertiesOnSubClassAxioms = new int[n];
+        propertiesAsSubClass = new ArrayList<>(Collections.<Set<OWLProperty>>nCopies(n, Collections.<OWLProperty>emptySet()));
+        propertiesAsSuperClass = new ArrayList<>(Collections.<Set<OWLProperty>>nCopies(n, Collections.<OWLProperty>emptySet()));
+        propertyUsageAsSubClass = new int[n];
+        toldSubClassAxiomCounts = new int[n];
+        toldObjectPropertiesOnSubClassAxioms = new int[n];
+        domainCounts = new int[n];
+        rangeCounts = new int[n];
+        annotationCounts = new int[n];
+        instanceCounts = new int[n];
+        dataPropertyAssertionCounts = new int[n];
+
+        Map<IRI, Integer> annotationsBySubject = new HashMap<>();
+        Map<OWLIndividual, Integer> dataAssertionsBySubject = new HashMap<>();
+        List<OWLClassAssertionAxiom> namedClassAssertions = new ArrayList<>();
+        int subClassOfAxioms = 0;
+        int dataPropertyAssertionAxioms = 0;
+        int classAssertionAxioms = 0;
+        int propertyDomainAxioms = 0;
+        int annotationAssertionAxioms = 0;
+        int objectPropertiesOnAllClasses = 0;
+
+        Iterator<OWLAxiom> axioms = ontology.axioms().iterator();
+        while (axioms.hasNext()) {
+            OWLAxiom axiom = axioms.next();
+            if (axiom instanceof OWLSubClassOfAxiom) {
+                subClassOfAxioms++;
+                OWLSubClassOfAxiom subClassAxiom = (OWLSubClassOfAxiom) axiom;
+                OWLClassExpression subExpression = subClassAxiom.getSubClass();
+                OWLClassExpression superExpression = subClassAxiom.getSuperClass();
+                int sub = namedId(subExpression);
+                int sup = namedId(superExpression);
+                int objectProperties = (int) subClassAxiom.objectPropertiesInSignature().count();
+                if (sub >= 0) {
+                    hasSuperClassAxiom[sub] = true;
+                    subClassAxiomsAsSubClass[sub]++;
+                    objectPropertiesOnSubClassAxioms[sub] += objectProperties;
+                    objectPropertiesOnAllClasses += objectProperties;
+                    addProperties(propertiesAsSubClass, sub, superExpression);
+                    propertyUsageAsSubClass[sub] += propertyCount(superExpression);
+                    for (OWLClass cls : superExpression.getClassesInSignature()) {
+                        appendId(toldSupers, sub, idOf(cls));
+                    }
+                }
+                if (sup >= 0) {
+                    subClassAxiomsAsSuperClass[sup]++;
+                    addProperties(propertiesAsSuperClass, sup, subExpression);
+                    if (!subExpression.isOWLNothing()) {
+                        hasSubClassExpression[sup] = true;
+                    }
+                    for (OWLClass cls : subExpression.getClassesInSignature()) {
+                        appendId(toldSubs, sup, idOf(cls));
+                    }
+                }
+                // Every class mentioned on either side, each side counted once per axiom
+                for (OWLClass cls : subExpression.getClassesInSignature()) {
+                    int id = idOf(cls);
+                    if (id >= 0) {
+                        toldSubClassAxiomCounts[id]++;
+                        toldObjectPropertiesOnSubClassAxioms[id] += objectProperties;
+                    }
+                }
+                for (OWLClass cls : superExpression.getClassesInSignature()) {
+                    increment(toldSubClassAxiomCounts, cls);
+                }
+                if (sub >= 0 && sup >= 0) {
+                    addId(supers, sub, sup);
+                    addId(subs, sup, sub);
+                }
+            } else if (axiom instanceof OWLEquivalentClassesAxiom) {
+                Set<OWLClassExpression> expressions = ((OWLEquivalentClassesAxiom) axiom).getClassExpressions();
+                for (OWLClassExpression named : expressions) {
+                    int id = namedId(named);
+                    if (id < 0) {
+                        continue;
+                    }
+                    for (OWLClassExpression expression : expressions) {
+                        if (!expression.equals(named)) {
+                            addProperties(propertiesAsSubClass, id, expression);
+                            propertyUsageAsSubClass[id] += propertyCount(expression);
+                        }
+                    }
+                }
+            } else if (axiom instanceof OWLObjectPropertyDomainAxiom || axiom instanceof OWLDataPropertyDomainAxiom) {
+                propertyDomainAxioms++;
+                ((OWLPropertyDomainAxiom<?>) axiom).getDomain().classesInSignature()
+                        .forEach(cls -> increment(domainCounts, cls));
+            } else if (axiom instanceof OWLObjectPropertyRangeAxiom) {
+                ((OWLObjectPropertyRangeAxiom) axiom).getRange().classesInSignature()
+                        .forEach(cls -> increment(rangeCounts, cls));
+            } else if (axiom instanceof OWLClassAssertionAxiom) {
+                classAssertionAxioms++;
+                OWLClassAssertionAxiom classAssertion = (OWLClassAssertionAxiom) axiom;
+                int id = namedId(classAssertion.getClassExpression());
+                if (id >= 0) {
+                    instanceCounts[id]++;
+                    namedClassAssertions.add(classAssertion);
+                }
+            } else if (axiom instanceof OWLDataPropertyAssertionAxiom) {
+                dataPropertyAssertionAxioms++;
+                dataAssertionsBySubject.merge(((OWLDataPropertyAssertionAxiom) axiom).getSubject(), 1, Integer::sum);
+            } else if (axiom instanceof OWLAnnotationAssertionAxiom) {
+                annotationAssertionAxioms++;
+                OWLAnnotationAssertionAxiom annotation = (OWLAnnotationAssertionAxiom) axiom;
+                if (annotation.getSubject() instanceof IRI) {
+                    annotationsBySubject.merge((IRI) annotation.getSubject(), 1, Integer::sum);
+                }
+            }
+        }
+        ontologyAnnotationCount = ontology.getAnnotations().size();
+        subClassOfAxiomCount = subClassOfAxioms;
+        dataPropertyAssertionAxiomCount = dataPropertyAssertionAxioms;
+        classAssertionAxiomCount = classAssertionAxioms;
+        propertyDomainAxiomCount = propertyDomainAxioms;
+        annotationAssertionAxiomCount = annotationAssertionAxioms;
+        objectPropertiesOnClasses = objectPropertiesOnAllClasses;
+
+        // Data property assertions are attributed to the named classes of their subject
+        for (OWLClassAssertionAxiom classAssertion : namedClassAssertions) {
+            Integer assertions = dataAssertionsBySubject.get(classAssertion.getIndividual());
+            if (assertions != null) {
+                dataPropertyAssertionCounts[namedId(classAssertion.getClassExpression())] += assertions;
+            }
+        }
+
+        superClasses = new int[n][];
+        subClasses = new int[n][];
+        toldSuperClasses = new int[n][];
+        toldSubClasses = new int[n][];
+        int[][] toldSubClassEdges = new int[n][];
+        isRoot = new boolean[n];
+        List<Integer> rootIds = new ArrayList<>();
+        List<Integer> toldRootIds = new ArrayList<>();
+        List<Integer> leafIds = new ArrayList<>();
+        for (int i = 0; i < n; i++) {
+            superClasses[i] = toArray(supers.get(i));
+            subClasses[i] = toArray(subs.get(i));
+            toldSuperClasses[i] = toArray(toldSupers.get(i));
+            toldSubClasses[i] = toArray(toldSubs.get(i));
+            annotationCounts[i] = annotationsBySubject.getOrDefault(classes[i].getIRI(), 0);
+
+            Set<Integer> edges = new LinkedHashSet<>();
+            for (int told : toldSubClasses[i]) {
+                if (told != thing) {
+                    edges.add(told);
+                }
+            }
+            toldSubClassEdges[i] = toArray(edges);
+            if (i != thing && countOther(toldSuperClasses[i], thing) == 0) {
+                toldRootIds.add(i);
+            }
+
+            // A root has no named superclass other than owl:Thing
+            if (i != thing && (superClasses[i].length == 0 || contains(superClasses[i], thing))) {
+                isRoot[i] = true;
+                rootIds.add(i);
+            }
+            if (subClasses[i].length == 0) {
+                leafIds.add(i);
+            }
+        }
+        roots = toArray(rootIds);
+        toldRoots = toArray(toldRootIds);
+        leaves = toArray(leafIds);
+
+        hierarchy = new HierarchyDag(subClasses, hasSuperClassAxiom);
+        int deepest = 0;
+        for (int depth : hierarchy.depths) {
+            deepest = Math.max(deepest, depth);
+        }
+        maxDepth = deepest;
+        toldHierarchy = new HierarchyDag(toldSubClassEdges, hasSuperClassAxiom);
+    }
+
+    private int namedId(OWLClassExpression expression) {
+        return expression.isNamed() ? idOf(expression.asOWLClass()) : -1;
+    }
+
+    private void increment(int[] counts, OWLClass cls) {
+        int id = idOf(cls);
+        if (id >= 0) {
+            counts[id]++;
+        }
+    }
+
+    private static void addId(List<Set<Integer>> adjacency, int from, int to) {
+        Set<Integer> targets = adjacency.get(from);
+        if (targets == null) {
+            targets = new LinkedHashSet<>();
+            adjacency.set(from, targets);
+        }
+        targets.add(to);
+    }
+
+    private static void appendId(List<List<Integer>> adjacency, int from, int to) {
+        if (to < 0) {
+            return;
+        }
+        List<Integer> targets = adjacency.get(from);
+        if (targets == null) {
+            targets = new ArrayList<>();
+            adjacency.set(from, targets);
+        }
+        targets.add(to);
+    }
+
+    /** Distinct data and object properties in the signature of the expression. */
+    private static int propertyCount(OWLClassExpression expression) {
+        return (int) expression.signature()
+                .filter(entity -> entity.isOWLDataProperty() || entity.isOWLObjectProperty())
+                .count();
+    }
+
+    private static void addProperties(List<Set<OWLProperty>> properties, int id, OWLClassExpression expression) {
+        expression.signature()
+                .filter(entity -> entity.isOWLDataProperty() || entity.isOWLObjectProperty())
+                .forEach(entity -> {
+                    Set<OWLProperty> classProperties = properties.get(id);
+                    if (classProperties.isEmpty()) {
+                        classProperties = new HashSet<>();
+                        properties.set(id, classProperties);
+                    }
+                    classProperties.add((OWLProperty) entity);
+                });
+    }
+
+    private static int[] toArray(Iterable<Integer> values) {
+        if (values == null) {
+            return NO_IDS;
+        }
+        List<Integer> list = new ArrayList<>();
+        values.forEach(list::add);
+        if (list.isEmpty()) {
+            return NO_IDS;
+        }
+        int[] array = new int[list.size()];
+        for (int i = 0; i < array.length; i++) {
+            array[i] = list.get(i);
+        }
+        return array;
+    }
+
+    private static int countOther(int[] values, int value) {
+        int count = 0;
+        for (int v : values) {
+            if (v != value) {
+                count++;
+            }
+        }
+        return count;
+    }
+
+    private static boolean contains(int[] values, int value) {
+        for (int v : values) {
+            if (v == value) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    public OWLOntology getOntology() {
+        return ontology;
+    }
+
+    public int classCount() {
+        return classes.length;
+    }
+
+    public OWLClass classAt(int id) {
+        return classes[id];
+    }
+
+    /** Id of a class in the signature, or -1. */
+    public int idOf(OWLClass cls) {
+        Integer id = ids.get(cls);
+        return id == null ? -1 : id;
+    }
+
+    public boolean isThing(int id) {
+        return id == thing;
+    }
+
+    /** Direct named superclasses (owl:Thing included when asserted). */
+    public int[] superClasses(int id) {
+        return superClasses[id];
+    }
+
+    /** Direct named subclasses. */
+    public int[] subClasses(int id) {
+        return subClasses[id];
+    }
+
+    /** Number of direct named superclasses other than owl:Thing. */
+    public int nonThingSuperClassCount(int id) {
+        return countOther(superClasses[id], thing);
+    }
+
+    /**
+     * Classes in the signature of the superclass expressions of the SubClassOf axioms of the
+     * class, listed once per axiom (so a class can appear more than once), owl:Thing included:
+     * EntitySearcher.getSuperClasses(cls).flatMap(classesInSignature).
+     */
+    public int[] toldSuperClasses(int id) {
+        return toldSuperClasses[id];
+    }
+
+    /**
+     * Classes in the signature of the subclass expressions of the SubClassOf axioms with the
+     * class as superclass, listed once per axiom, owl:Thing and owl:Nothing included.
+     */
+    public int[] toldSubClasses(int id) {
+        return toldSubClasses[id];
+    }
+
+    /** Entries of toldSuperClasses other than owl:Thing, repeats included. */
+    public int toldNonThingSuperClassCount(int id) {
+        return countOther(toldSuperClasses[id], thing);
+    }
+
+    /** Whether toldSubClasses has a class other than owl:Thing and owl:Nothing. */
+    public boolean hasToldSubClass(int id) {
+        for (int sub : toldSubClasses[id]) {
+            if (sub != thing && !classes[sub].isOWLNothing()) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /** Whether the class is the superclass of a SubClassOf axiom whose subclass is not owl:Nothing. */
+    public boolean hasSubClassExpression(int id) {
+        return hasSubClassExpression[id];
+    }
+
+    /** Classes other than owl:Thing without a told superclass other than owl:Thing. */
+    public int[] toldRoots() {
+        return toldRoots;
+    }
+
+    /**
+     * Like depth, but along the told subclasses other than owl:Thing, so a class used in a
+     * restriction on the subclass side sits one level below the superclass.
+     */
+    public int toldDepth(int id) {
+        return toldHierarchy.depths[id];
+    }
+
+    /** Whether the class is the subclass of any SubClassOf axiom, anonymous superclasses included. */
+    public boolean hasSuperClassAxiom(int id) {
+        return hasSuperClassAxiom[id];
+    }
+
+    /** Classes other than owl:Thing whose only named superclass, if any, is owl:Thing. */
+    public int[] roots() {
+        return roots;
+    }
+
+    public boolean isRoot(int id) {
+        return isRoot[id];
+    }
+
+    /**
+     * Length of the longest chain of named SubClassOf axioms from a class without any
+     * superclass axiom (depth 1) down to this class, a SubClassOf cycle counting as one
+     * level; 0 when no such class reaches it. See HierarchyDag.
+     */
+    public int depth(int id) {
+        return hierarchy.depths[id];
+    }
+
+    /** The greatest depth of any class, 0 for an ontology without classes. */
+    public int maxDepth() {
+        return maxDepth;
+    }
+
+    /**
+     * Every class id, each after its direct named superclasses except those on a SubClassOf
+     * cycle with it, so a single pass in this order (or in reverse, for subclasses first)
+     * can compute values from the superclasses of each class.
+     */
+    public int[] topologicalOrder() {
+        return hierarchy.order;
+    }
+
+    /** The classes on one SubClassOf cycle share a component; any other class is alone in its own. */
+    public int hierarchyComponent(int id) {
+        return hierarchy.component[id];
+    }
+
+    /** Classes without a named subclass. */
+    public int[] leaves() {
+        return leaves;
+    }
+
+    public boolean isLeaf(int id) {
+        return subClasses[id].length == 0;
+    }
+
+    /** SubClassOf axioms with this class as the subclass. */
+    public int subClassAxiomsAsSubClass(int id) {
+        return subClassAxiomsAsSubClass[id];
+    }
+
+    /** SubClassOf axioms with this class as the superclass. */
+    public int subClassAxiomsAsSuperClass(int id) {
+        return subClassAxiomsAsSuperClass[id];
+    }
+
+    /** Sum of the object properties in the signature of each SubClassOf axiom of the class. */
+    public int objectPropertiesOnSubClassAxioms(int id) {
+        return objectPropertiesOnSubClassAxioms[id];
+    }
+
+    /**
+     * Data and object properties used in the superclass expressions of the class and in the
+     * expressions it is declared equivalent to.
+     */
+    public Set<OWLProperty> propertiesAsSubClass(int id) {
+        return Collections.unmodifiableSet(propertiesAsSubClass.get(id));
+    }
+
+    /**
+     * Data and object properties in each superclass expression of the class and in each
+     * expression it is declared equivalent to, counted once per expression, so a property
+     * used in two axioms counts twice.
+     */
+    public int propertyUsageAsSubClass(int id) {
+        return propertyUsageAsSubClass[id];
+    }
+
+    /** Data and object properties used in the subclass expressions under the class. */
+    public Set<OWLProperty> propertiesAsSuperClass(int id) {
+        return Collections.unmodifiableSet(propertiesAsSuperClass.get(id));
+    }
+
+    /**
+     * SubClassOf axioms that mention the class, anonymous expressions included; an axiom
+     * mentioning it on both sides counts twice.
+     */
+    public int toldSubClassAxiomCount(int id) {
+        return toldSubClassAxiomCounts[id];
+    }
+
+    /** Sum of the object properties of each SubClassOf axiom whose subclass expression mentions the class. */
+    public int toldObjectPropertiesOnSubClassAxioms(int id) {
+        return toldObjectPropertiesOnSubClassAxioms[id];
+    }
+
+    /** Object and data property domain axioms that mention the class. */
+    public int domainCount(int id) {
+        return domainCounts[id];
+    }
+
+    /** Object property range axioms that mention the class. */
+    public int rangeCount(int id) {
+        return rangeCounts[id];
+    }
+
+    /** Annotation assertions on the class IRI. */
+    public int annotationCount(int id) {
+        return annotationCounts[id];
+    }
+
+    /** Class assertions of the class. */
+    public int instanceCount(int id) {
+        return instanceCounts[id];
+    }
+
+    /** Data property assertions on the asserted instances of the class. */
+    public int dataPropertyAssertionCount(int id) {
+        return dataPropertyAssertionCounts[id];
+    }
+
+    public int ontologyAnnotationCount() {
+        return ontologyAnnotationCount;
+    }
+
+    public int subClassOfAxiomCount() {
+        return subClassOfAxiomCount;
+    }
+
+    public int dataPropertyAssertionAxiomCount() {
+        return dataPropertyAssertionAxiomCount;
+    }
+
+    public int classAssertionAxiomCount() {
+        return classAssertionAxiomCount;
+    }
+
+    /** Object and data property domain axioms. */
+    public int propertyDomainAxiomCount() {
+        return propertyDomainAxiomCount;
+    }
+
+    public int annotationAssertionAxiomCount() {
+        return annotationAssertionAxiomCount;
+    }
+
+    /** objectPropertiesOnSubClassAxioms summed over all classes. */
+    public int objectPropertiesOnClasses() {
+        return objectPropertiesOnClasses;
+    }
+}
@@ -0,0 +1,186 @@
+package com.calculation_engine;
+
+import org.semanticweb.HermiT.ReasonerFactory;
+import com.google.gson.Gson;
+
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.OutputStreamWriter;
+import java.io.Reader;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.nio.file.attribute.FileTime;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.zip.GZIPInputStream;
+import java.util.zip.GZIPOutputStream;
+
+/**
+ * On-disk cache of HermiT's results for an ontology: the consistency verdict and whether
+ * the ontology was classified. Entries are keyed by the SHA-256 of the ontology file and
+ * the reasoner version, so an unchanged ontology is never reasoned over twice and a new
+ * HermiT invalidates the cache. A module extracted from a consistent ontology reuses that
+ * ontology's entry. The inferred hierarchy itself is not stored: the calculators read the
+ * asserted hierarchy, so nothing would read it back.
+ *
+ * The directory is ENGINE_REASONER_CACHE_DIR (caching is off when it is unset). Entries
+ * use the layout of the API's result cache, <dir>/<key[:2]>/<key>/classification.json.gz,
+ * so pointing both at one directory puts them under the same size limit and eviction.
+ */
+public final class ReasonerCache {
+    private static final int FORMAT = 1;
+    private static final String ENTRY_FILE = "classification.json.gz";
+    private static final String REASONER_VERSION = reasonerVersion();
+
+    private final Path directory;
+
+    /** Results of one reasoner run, as stored in the cache. */
+    public static final class Classification {
+        private int format = FORMAT;
+        private String reasoner = REASONER_VERSION;
+        private boolean consistent;
+        private boolean classified;
+
+        public boolean isConsistent() {
+            return consistent;
+        }
+
+        /** Whether the class hierarchy was computed, not just the consistency verdict. */
+        public boolean isClassified() {
+            return classified;
+        }
+    }
+
+    private ReasonerCache(Path directory) {
+        this.directory = directory;
+    }
+
+    /** The cache configured through ENGINE_REASONER_CACHE_DIR, or null when it is not set. */
+    public static ReasonerCache fromEnv() {
+        String configured = System.getenv("ENGINE_REASONER_CACHE_DIR");
+        if (configured == null || configured.trim().isEmpty()) {
+            return null;
+        }
+        return new ReasonerCache(Paths.get(configured.trim()));
+    }
+
+    /** Results of a HermiT run that checked consistency and, if classified, precomputed the hierarchy. */
+    public static Classification capture(boolean consistent, boolean classified) {
+        Classification classification = new Classification();
+        classification.consistent = consistent;
+        // Nothing follows from an inconsistent ontology, so its verdict serves every mode
+        classification.classified = classified || !consistent;
+        return classification;
+    }
+
+    /** The cached results for an ontology file hash, or null on a miss or an unreadable entry. */
+    public Classification load(String contentHash) {
+        Path entryDir = entryDir(contentHash);
+        Path entryFile = entryDir.resolve(ENTRY_FILE);
+        if (!Files.isRegularFile(entryFile)) {
+            return null;
+        }
+        try (Reader reader = new InputStreamReader(new GZIPInputStream(Files.newInputStream(entryFile)), StandardCharsets.UTF_8)) {
+            Classification classification = new Gson().fromJson(reader, Classification.class);
+            if (classification == null || classification.format != FORMAT
+                    || !REASONER_VERSION.equals(classification.reasoner)) {
+                return null;
+            }
+            // Mark the entry as recently used for the result cache's eviction
+            Files.setLastModifiedTime(entryDir, FileTime.fromMillis(System.currentTimeMillis()));
+            return classification;
+        } catch (Exception e) {
+            System.err.println("Ignoring unreadable reasoner cache entry " + entryFile + ": " + e.getMessage());
+            return null;
+        }
+    }
+
+    /** Store the results for an ontology file hash, replacing any previous entry. */
+    public void store(String contentHash, Classification classification) {
+        Path entryDir = entryDir(contentHash);
+        Path staging = null;
+        try {
+            Files.createDirectories(entryDir.getParent());
+            staging = Files.createTempDirectory(entryDir.getParent(), "." + contentHash.substring(0, 8) + "-");
+            try (Writer writer = new OutputStreamWriter(new GZIPOutputStream(
+                    Files.newOutputStream(staging.resolve(ENTRY_FILE))), StandardCharsets.UTF_8)) {
+                new Gson().toJson(classification, writer);
+            }
+            if (Files.exists(entryDir)) {
+                Files.deleteIfExists(entryDir.resolve(ENTRY_FILE));
+                Files.deleteIfExists(entryDir);
+            }
+            Files.move(staging, entryDir);
+            staging = null;
+        } catch (IOException e) {
+            System.err.println("Could not cache reasoner results: " + e.getMessage());
+        } finally {
+            if (staging != null) {
+                try {
+                    Files.deleteIfExists(staging.resolve(ENTRY_FILE));
+                    Files.deleteIfExists(staging);
+                } catch (IOException e) {
+                    System.err.println("Could not remove " + staging + ": " + e.getMessage());
+                }
+            }
+        }
+    }
+
+    private Path entryDir(String contentHash) {
+        String key = sha256("reasoner\n" + contentHash + "\n" + REASONER_VERSION + "\n" + FORMAT);
+        return directory.resolve(key.substring(0, 2)).resolve(key);
+    }
+
+    /** SHA-256 of a file's bytes, hex encoded. */
+    public static String hashFile(Path path) throws IOException {
+        MessageDigest digest = newDigest();
+        byte[] buffer = new byte[1 << 16];
+        try (InputStream in = Files.newInputStream(path)) {
+            int read;
+            while ((read = in.read(buffer)) > 0) {
+                digest.update(buffer, 0, read);
+            }
+        }
+        return hex(digest.digest());
+    }
+
+    private static String sha256(String value) {
+        return hex(newDigest().digest(value.getBytes(StandardCharsets.UTF_8)));
+    }
+
+    private static MessageDigest newDigest() {
+        try {
+            return MessageDigest.getInstance("SHA-256");
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException("SHA-256 is not available", e);
+        }
+    }
+
+    private static String hex(byte[] bytes) {
+        StringBuilder hex = new StringBuilder(bytes.length * 2);
+        for (byte b : bytes) {
+            hex.append(String.format("%02x", b));
+        }
+        return hex.toString();
+    }
+
+    // HermiT's version from its jar manifest; inside a shaded jar without one, the jar
+    // itself stands in, so a rebuilt engine never reads results of another HermiT
+    private static String reasonerVersion() {
+        String version = ReasonerFactory.class.getPackage().getImplementationVersion();
+        if (version != null) {
+            return "HermiT " + version;
+        }
+        try {
+            File jar = new File(ReasonerFactory.class.getProtectionDomain().getCodeSource().getLocation().toURI());
+            return "HermiT " + jar.getName() + "-" + jar.length() + "-" + jar.lastModified();
+        } catch (Exception e) {
+            return "HermiT unknown";
+        }
+    }
+}
@@ -0,0 +1,247 @@
+package com.calculation_engine;
+
+import org.semanticweb.owlapi.model.AxiomType;
+import org.semanticweb.owlapi.model.OWLClassExpression;
+import org.semanticweb.owlapi.model.OWLDataFactory;
+import org.semanticweb.owlapi.model.OWLDataPropertyAssertionAxiom;
+import org.semanticweb.owlapi.model.OWLDatatype;
+import org.semanticweb.owlapi.model.OWLLogicalAxiom;
+import org.semanticweb.owlapi.model.OWLOntology;
+import org.semanticweb.owlapi.model.parameters.Imports;
+import org.semanticweb.owlapi.profiles.OWL2DLProfile;
+import org.semanticweb.owlapi.profiles.OWL2ELProfile;
+import org.semanticweb.owlapi.profiles.OWL2QLProfile;
+import org.semanticweb.owlapi.profiles.OWL2RLProfile;
+import org.semanticweb.owlapi.profiles.OWLProfile;
+import org.semanticweb.owlapi.vocab.OWL2Datatype;
+import com.google.gson.JsonArray;
+import com.google.gson.JsonObject;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.EnumSet;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Locale;
+import java.util.Set;
+
+/**
+ * The cheapest reasoning that still answers what a scoring mode asks, chosen from the OWL 2
+ * profiles of the ontology and the constructs in its logical axioms:
+ *
+ * - NONE: nothing to run, because the structural mode was requested, or a consistency
+ *   check was requested and the ontology has no construct that can make it inconsistent
+ *   (disjointness, negation, cardinality restrictions and the others counted as "other").
+ * - STRUCTURAL: a classification was requested, the ontology cannot be inconsistent and
+ *   mentions named classes only, so the inferred hierarchy is the asserted one the
+ *   calculators already read, and no reasoner runs.
+ * - HERMIT: anything else.
+ *
+ * The metrics only read asserted axioms, so the plan changes how long scoring takes and
+ * whether an inconsistent ontology is rejected, never the scores. The OWL 2 profiles play
+ * no part in the choice and are only reported, so they are checked separately, once the
+ * scores are in (checkProfiles).
+ */
+public final class ReasoningPlan {
+
+    public enum Path {
+        NONE, STRUCTURAL, HERMIT;
+
+        public String label() {
+            return name().toLowerCase(Locale.ROOT);
+        }
+    }
+
+    private static final Set<AxiomType<?>> DISJOINTNESS = new HashSet<>(Arrays.<AxiomType<?>>asList(
+            AxiomType.DISJOINT_CLASSES, AxiomType.DISJOINT_UNION,
+            AxiomType.DISJOINT_OBJECT_PROPERTIES, AxiomType.DISJOINT_DATA_PROPERTIES));
+
+    private static final Set<AxiomType<?>> NEGATION = new HashSet<>(Arrays.<AxiomType<?>>asList(
+            AxiomType.NEGATIVE_OBJECT_PROPERTY_ASSERTION, AxiomType.NEGATIVE_DATA_PROPERTY_ASSERTION));
+
+    private static final Set<AxiomType<?>> CARDINALITY = new HashSet<>(Arrays.<AxiomType<?>>asList(
+            AxiomType.FUNCTIONAL_OBJECT_PROPERTY, AxiomType.INVERSE_FUNCTIONAL_OBJECT_PROPERTY,
+            AxiomType.FUNCTIONAL_DATA_PROPERTY));
+
+    // Other axioms that can contradict the rest of the ontology
+    private static final Set<AxiomType<?>> OTHER = new HashSet<>(Arrays.<AxiomType<?>>asList(
+            AxiomType.DIFFERENT_INDIVIDUALS, AxiomType.IRREFLEXIVE_OBJECT_PROPERTY,
+            AxiomType.ASYMMETRIC_OBJECT_PROPERTY, AxiomType.HAS_KEY, AxiomType.DATATYPE_DEFINITION,
+            AxiomType.DATA_PROPERTY_RANGE, AxiomType.SWRL_RULE));
+
+    // Literals of these datatypes are never ill-typed
+    private static final Set<OWL2Datatype> FREE_TEXT = EnumSet.of(
+            OWL2Datatype.RDF_PLAIN_LITERAL, OWL2Datatype.RDF_LANG_STRING, OWL2Datatype.XSD_STRING);
+
+    private final Path path;
+    private final String reason;
+    private final OWLOntology ontology;
+    private List<String> profiles;
+    private final int disjointness;
+    private final int negation;
+    private final int cardinality;
+    private final int other;
+    private final boolean namedClassesOnly;
+
+    private ReasoningPlan(Path path, String reason, OWLOntology ontology,
+                          int disjointness, int negation, int cardinality, int other, boolean namedClassesOnly) {
+        this.path = path;
+        this.reason = reason;
+        this.ontology = ontology;
+        this.disjointness = disjointness;
+        this.negation = negation;
+        this.cardinality = cardinality;
+        this.other = other;
+        this.namedClassesOnly = namedClassesOnly;
+    }
+
+    /** Analyse the ontology and pick the reasoning the scoring mode needs. */
+    public static ReasoningPlan choose(OWLOntology ontology, OQuaRE.ScoringMode mode) {
+        if (mode == OQuaRE.ScoringMode.STRUCTURAL) {
+            return new ReasoningPlan(Path.NONE, "structural scoring mode requested", null, 0, 0, 0, 0, false);
+        }
+
+        int disjointness = 0;
+        int negation = 0;
+        int cardinality = 0;
+        int other = 0;
+        boolean namedClassesOnly = true;
+
+        for (OWLLogicalAxiom axiom : ontology.getLogicalAxioms(Imports.INCLUDED)) {
+            AxiomType<?> type = axiom.getAxiomType();
+            if (DISJOINTNESS.contains(type)) {
+                disjointness++;
+            } else if (NEGATION.contains(type)) {
+                negation++;
+            } else if (CARDINALITY.contains(type)) {
+                cardinality++;
+            } else if (OTHER.contains(type)) {
+                other++;
+            } else if (axiom instanceof OWLDataPropertyAssertionAxiom) {
+                OWLDatatype datatype = ((OWLDataPropertyAssertionAxiom) axiom).getObject().getDatatype();
+                if (!datatype.isBuiltIn() || !FREE_TEXT.contains(datatype.getBuiltInDatatype())) {
+                    other++;
+                }
+            }
+
+            for (OWLClassExpression expression : axiom.getNestedClassExpressions()) {
+                if (expression.isOWLNothing()) {
+                    other++;
+                    continue;
+                }
+                if (!expression.isAnonymous()) {
+                    continue;
+                }
+                namedClassesOnly = false;
+                switch (expression.getClassExpressionType()) {
+                    case OBJECT_COMPLEMENT_OF:
+                        negation++;
+                        break;
+                    case OBJECT_MIN_CARDINALITY:
+                    case OBJECT_MAX_CARDINALITY:
+                    case OBJECT_EXACT_CARDINALITY:
+                    case DATA_MIN_CARDINALITY:
+                    case DATA_MAX_CARDINALITY:
+                    case DATA_EXACT_CARDINALITY:
+                        cardinality++;
+                        break;
+                    case DATA_SOME_VALUES_FROM:
+                    case DATA_ALL_VALUES_FROM:
+                    case DATA_HAS_VALUE:
+                        // Data ranges and literals can clash with each other
+                        other++;
+                        break;
+                    default:
+                        break;
+                }
+            }
+        }
+        OWLDataFactory factory = ontology.getOWLOntologyManager().getOWLDataFactory();
+        if (ontology.containsEntityInSignature(factory.getOWLBottomObjectProperty(), Imports.INCLUDED)
+                || ontology.containsEntityInSignature(factory.getOWLBottomDataProperty(), Imports.INCLUDED)) {
+            other++;
+        }
+
+        boolean consistent = disjointness == 0 && negation == 0 && cardinality == 0 && other == 0;
+
+        Path path;
+        String reason;
+        if (consistent && mode == OQuaRE.ScoringMode.CONSISTENCY) {
+            path = Path.NONE;
+            reason = "no disjointness, negation, cardinality or other construct that can make the ontology inconsistent";
+        } else if (consistent && namedClassesOnly) {
+            path = Path.STRUCTURAL;
+            reason = "cannot be inconsistent and uses named classes only, so the inferred hierarchy is the asserted one";
+        } else if (consistent) {
+            path = Path.HERMIT;
+            reason = "cannot be inconsistent, but its class expressions need DL classification";
+        } else {
+            path = Path.HERMIT;
+            reason = "has constructs that can make it inconsistent";
+        }
+        return new ReasoningPlan(path, reason, ontology, disjointness, negation, cardinality, other, namedClassesOnly);
+    }
+
+    /**
+     * Check the OWL 2 profiles of an analysed ontology for toJson, once; the profile checkers
+     * walk every axiom, so this is left until the scoring no longer waits on it.
+     */
+    public synchronized void checkProfiles() {
+        if (ontology != null && profiles == null) {
+            profiles = profiles(ontology);
+        }
+    }
+
+    // OWL 2 EL, QL and RL are sublanguages of OWL 2 DL, so only a DL ontology is checked against them
+    private static List<String> profiles(OWLOntology ontology) {
+        List<String> profiles = new ArrayList<>();
+        if (!new OWL2DLProfile().checkOntology(ontology).isInProfile()) {
+            return profiles;
+        }
+        OWLProfile[] subProfiles = {new OWL2ELProfile(), new OWL2QLProfile(), new OWL2RLProfile()};
+        String[] names = {"EL", "QL", "RL"};
+        for (int i = 0; i < subProfiles.length; i++) {
+            if (subProfiles[i].checkOntology(ontology).isInProfile()) {
+                profiles.add(names[i]);
+            }
+        }
+        profiles.add("DL");
+        return profiles;
+    }
+
+    public Path getPath() {
+        return path;
+    }
+
+    public String getReason() {
+        return reason;
+    }
+
+    /**
+     * The decision for the metrics JSON: the path taken and why, and,
+     * when the ontology was analysed, the counts of each kind of construct that can make it
+     * inconsistent and, after checkProfiles, its OWL 2 profiles (empty for OWL 2 Full).
+     */
+    public synchronized JsonObject toJson() {
+        JsonObject json = new JsonObject();
+        json.addProperty("path", path.label());
+        json.addProperty("reason", reason);
+        if (ontology != null) {
+            if (profiles != null) {
+                JsonArray profileArray = new JsonArray();
+                for (String profile : profiles) {
+                    profileArray.add(profile);
+                }
+                json.add("profiles", profileArray);
+            }
+            JsonObject constructs = new JsonObject();
+            constructs.addProperty("disjointness", disjointness);
+            constructs.addProperty("negation", negation);
+            constructs.addProperty("cardinality", cardinality);
+            constructs.addProperty("other", other);
+            json.add("constructs", constructs);
+            json.addProperty("named_classes_only", namedClassesOnly);
+        }
+        return json;
+    }
+}
@@ -1,24 +1,18 @@
 package com.calculation_engine.oquareMetrics;
 
-import java.util.Set;
-
-import org.semanticweb.owlapi.model.AxiomType;
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-
 import com.calculation_engine.MetricCalculator;
+import com.calculation_engine.OntologyIndex;
 
 public class AROntoCalculator implements MetricCalculator {
 
     @Override
-    public double calculate(OWLOntology ontology) {
+    public double calculate(OntologyIndex index) {
         double AROnto = 0;
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int dataPropertyDomainAxioms = ontology.getAxiomCount(AxiomType.DATA_PROPERTY_DOMAIN);
-        int objectPropertyDomainAxioms = ontology.getAxiomCount(AxiomType.OBJECT_PROPERTY_DOMAIN);
+        // Data and object property domain axioms
+        int propertyDomainAxioms = index.propertyDomainAxiomCount();
 
-        if (!classes.isEmpty()) {
-            AROnto = (double) (dataPropertyDomainAxioms + objectPropertyDomainAxioms) / classes.size();
+        if (index.classCount() > 0) {
+            AROnto = (double) propertyDomainAxioms / index.classCount();
         }
         return AROnto;
     }
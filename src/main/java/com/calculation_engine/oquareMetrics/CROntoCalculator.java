@@ -1,23 +1,17 @@
 package com.calculation_engine.oquareMetrics;
 
-import java.util.Set;
-
-import org.semanticweb.owlapi.model.AxiomType;
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-
 import com.calculation_engine.MetricCalculator;
+import com.calculation_engine.OntologyIndex;
 
 public class CROntoCalculator implements MetricCalculator {
 
     @Override
-    public double calculate(OWLOntology ontology) {
+    public double calculate(OntologyIndex index) {
         double CROnto = 0;
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int classAssertionAxioms = ontology.getAxiomCount(AxiomType.CLASS_ASSERTION);
+        int classAssertionAxioms = index.classAssertionAxiomCount();
 
-        if (!classes.isEmpty()) {
-            CROnto = (double) classAssertionAxioms / classes.size();
+        if (index.classCount() > 0) {
+            CROnto = (double) classAssertionAxioms / index.classCount();
         }
         return CROnto;
     }
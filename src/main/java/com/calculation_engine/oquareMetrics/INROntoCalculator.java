@@ -1,23 +1,17 @@
 package com.calculation_engine.oquareMetrics;
 
-import java.util.Set;
-
-import org.semanticweb.owlapi.model.AxiomType;
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-
 import com.calculation_engine.MetricCalculator;
+import com.calculation_engine.OntologyIndex;
 
 public class INROntoCalculator implements MetricCalculator {
 
     @Override
-    public double calculate(OWLOntology ontology) {
+    public double calculate(OntologyIndex index) {
         double INROnto = 0;
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int subClassofAxiomCount = ontology.getAxiomCount(AxiomType.SUBCLASS_OF);
+        int subClassofAxiomCount = index.subClassOfAxiomCount();
 
-        if (!classes.isEmpty()) {
-            INROnto =  (double) subClassofAxiomCount / classes.size();
+        if (index.classCount() > 0) {
+            INROnto =  (double) subClassofAxiomCount / index.classCount();
         }
         return INROnto;
     }
@@ -1,37 +1,20 @@
 package com.calculation_engine.oquareMetrics;
 
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-import org.semanticweb.owlapi.search.EntitySearcher;
-
 import com.calculation_engine.MetricCalculator;
-
-import org.semanticweb.owlapi.reasoner.OWLReasoner;
-import org.semanticweb.owlapi.reasoner.OWLReasonerFactory;
-import org.semanticweb.owlapi.reasoner.structural.StructuralReasonerFactory;
-
-import java.util.Set;
-import java.util.HashSet;
-import java.util.stream.Collectors;
+import com.calculation_engine.OntologyIndex;
 
 public class LCOMOntoCalculator implements MetricCalculator {
 
     @Override
-    public double calculate(OWLOntology ontology) {
-        OWLReasonerFactory reasonerFactory = new StructuralReasonerFactory();
-        OWLReasoner reasoner = reasonerFactory.createReasoner(ontology);
+    public double calculate(OntologyIndex index) {
+        int[] pathLengths = pathLengths(index);
+
         double LCOMOnto = 0.0;
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int totalPathLength = 0;
+        long totalPathLength = 0;
         int totalLeaves = 0;
 
-        Set<OWLClass> leafClasses = classes.stream()
-            .filter(cls -> EntitySearcher.getSubClasses(cls, ontology).collect(Collectors.toSet()).stream().noneMatch(sub -> !sub.isAnonymous()))
-            .collect(Collectors.toSet());
-
-        for (OWLClass leaf : leafClasses) {
-            int pathLength = getPathLength(leaf, ontology, reasoner);
-            totalPathLength += pathLength;
+        for (int leaf : index.leaves()) {
+            totalPathLength += pathLengths[leaf];
             totalLeaves++;
         }
 
@@ -39,24 +22,37 @@ public class LCOMOntoCalculator implements MetricCalculator {
             LCOMOnto = (double) totalPathLength / totalLeaves;
         }
 
-        reasoner.dispose();
         return LCOMOnto;
     }
 
-    private int getPathLength(OWLClass cls, OWLOntology ontology, OWLReasoner reasoner) {
-        Set<OWLClass> visited = new HashSet<>();
-        return getPathLengthHelper(cls, ontology, reasoner, visited);
+    /**
+     * Length of the longest path from every class up to owl:Thing, by class id, computed
+     * superclasses first in one pass; shared with the LCOM seed term extractor.
+     */
+    public static int[] pathLengths(OntologyIndex index) {
+        int[] pathLengths = new int[index.classCount()];
+        for (int cls : index.topologicalOrder()) {
+            pathLengths[cls] = getPathLength(cls, index, pathLengths);
+        }
+        return pathLengths;
     }
 
-    private int getPathLengthHelper(OWLClass cls, OWLOntology ontology, OWLReasoner reasoner, Set<OWLClass> visited) {
+    // Walks the direct named superclasses the way the structural reasoner reports them: a
+    // class without a named superclass other than owl:Thing sits directly under owl:Thing
+    private static int getPathLength(int cls, OntologyIndex index, int[] pathLengths) {
+        if (index.isThing(cls)) {
+            return 0;
+        }
         int length = 0;
-        visited.add(cls);
-        Set<OWLClass> superClasses = reasoner.getSuperClasses(cls, true).getFlattened();
-        for (OWLClass superClass : superClasses) {
-            if (!visited.contains(superClass)) {
-                length = 1 + getPathLengthHelper(superClass, ontology, reasoner, visited);
+        boolean hasSuperClass = false;
+        for (int superClass : index.superClasses(cls)) {
+            // Skip owl:Thing and superclasses on a SubClassOf cycle with this class (itself included)
+            if (index.isThing(superClass) || index.hierarchyComponent(superClass) == index.hierarchyComponent(cls)) {
+                continue;
             }
+            hasSuperClass = true;
+            length = Math.max(length, 1 + pathLengths[superClass]);
         }
-        return length;
+        return hasSuperClass ? length : 1;
     }
 }
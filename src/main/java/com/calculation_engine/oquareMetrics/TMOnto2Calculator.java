@@ -1,32 +1,21 @@
 package com.calculation_engine.oquareMetrics;
-import java.util.Collection;
-import java.util.Set;
-import java.util.stream.Collectors;
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-import org.semanticweb.owlapi.search.EntitySearcher;
 
 import com.calculation_engine.MetricCalculator;
-import com.calculation_engine.OntologyUtils;
+import com.calculation_engine.OntologyIndex;
 
 public class TMOnto2Calculator implements MetricCalculator {
     @Override
-    public double calculate(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
+    public double calculate(OntologyIndex index) {
         int superClassesSum = 0;  // Sum of superclasses for classes with multiple inheritance
         int classesWithMultipleInheritance = 0;
 
-        for (OWLClass cls : classes) {
-            // Get direct superclasses, excluding owl:Thing
-            Collection<OWLClass> directSuperClasses = OntologyUtils
-                .classExpr2classes(EntitySearcher.getSuperClasses(cls, ontology).collect(Collectors.toList()))
-                .stream()
-                .filter(superClass -> !superClass.isOWLThing())
-                .collect(Collectors.toSet());
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            // Direct superclasses, excluding owl:Thing
+            int directSuperClasses = index.nonThingSuperClassCount(cls);
             
             // If class has multiple inheritance, add its superclass count to the sum
-            if (directSuperClasses.size() > 1) {
-                superClassesSum += directSuperClasses.size();
+            if (directSuperClasses > 1) {
+                superClassesSum += directSuperClasses;
                 classesWithMultipleInheritance++;
             }
         }
@@ -40,4 +29,3 @@ public class TMOnto2Calculator implements MetricCalculator {
         return (double) superClassesSum / classesWithMultipleInheritance;
     }
 }
-
@@ -1,37 +1,30 @@
 package com.calculation_engine.oquareMetrics;
 
-import java.util.*;
-import java.util.stream.Collectors;
-import org.semanticweb.owlapi.model.OWLClass;
-import org.semanticweb.owlapi.model.OWLOntology;
-import org.semanticweb.owlapi.search.EntitySearcher;
-
 import com.calculation_engine.MetricCalculator;
-import com.calculation_engine.OntologyUtils;
+import com.calculation_engine.OntologyIndex;
 
 public class WMCOnto2Calculator implements MetricCalculator {
     @Override
-    public double calculate(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int totalPaths = 0;
+    public double calculate(OntologyIndex index) {
+        // Number of paths from every class up to owl:Thing, superclasses first, so each
+        // class adds up the counts of its direct superclasses once
+        long[] paths = new long[index.classCount()];
+        for (int cls : index.topologicalOrder()) {
+            paths[cls] = countPathsToClass(cls, index, paths);
+        }
+
+        double totalPaths = 0;
         int leafClassCount = 0;
 
-        for (OWLClass cls : classes) {
+        for (int cls : index.leaves()) {
             // Skip owl:Thing
-            if (cls.isOWLThing()) {
+            if (index.isThing(cls)) {
                 continue;
             }
 
-            // Check if class is a leaf class (has no subclasses)
-            Collection<OWLClass> subClasses = OntologyUtils
-                .classExpr2classes(EntitySearcher.getSubClasses(cls, ontology).collect(Collectors.toList()));
-            
-            if (subClasses.isEmpty()) {
-                // This is a leaf class
-                leafClassCount++;
-                // Count number of paths to this leaf class
-                totalPaths += countPathsToClass(cls, ontology);
-            }
+            // This is a leaf class (it has no subclasses)
+            leafClassCount++;
+            totalPaths += paths[cls];
         }
 
         // Avoid division by zero
@@ -39,30 +32,34 @@ public class WMCOnto2Calculator implements MetricCalculator {
             return 0.0;
         }
 
-        return (double) totalPaths / leafClassCount;
+        return totalPaths / leafClassCount;
     }
 
-    private int countPathsToClass(OWLClass cls, OWLOntology ontology) {
+    private long countPathsToClass(int cls, OntologyIndex index, long[] paths) {
         // Base case: if we reach Thing, we found one path
-        if (cls.isOWLThing()) {
+        if (index.isThing(cls)) {
             return 1;
         }
 
-        int pathCount = 0;
-        // Get direct superclasses
-        Collection<OWLClass> superClasses = OntologyUtils
-            .classExpr2classes(EntitySearcher.getSuperClasses(cls, ontology).collect(Collectors.toList()));
+        long pathCount = 0;
+        boolean hasSuperClass = false;
 
-        // If no superclasses are found, assume there's an implicit path to Thing
-        if (superClasses.isEmpty()) {
-            return 1;
+        // Count paths through each direct superclass; a SubClassOf cycle leads nowhere new
+        for (int superClass : index.superClasses(cls)) {
+            if (index.hierarchyComponent(superClass) == index.hierarchyComponent(cls)) {
+                continue;
+            }
+            hasSuperClass = true;
+            pathCount = saturatedAdd(pathCount, paths[superClass]);
         }
 
-        // Count paths through each superclass
-        for (OWLClass superClass : superClasses) {
-            pathCount += countPathsToClass(superClass, ontology);
-        }
+        // If no superclasses are found, assume there's an implicit path to Thing
+        return hasSuperClass ? pathCount : 1;
+    }
 
-        return pathCount;
+    // Diamond-heavy hierarchies have exponentially many paths; stop at Long.MAX_VALUE
+    private static long saturatedAdd(long a, long b) {
+        long sum = a + b;
+        return sum < 0 ? Long.MAX_VALUE : sum;
     }
 }
@@ -2,49 +2,39 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class AROntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int totalClasses = classes.size();
-        Map<OWLClass, Double> arScores = new HashMap<>();
+        return getScoredSeedTerms(ontology).keySet();
+    }
 
-        // Pre-cache domain relationships
-        Map<OWLClass, Integer> domainCounts = new HashMap<>();
-        classes.forEach(cls -> domainCounts.put(cls, 0));
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        int totalClasses = index.classCount();
+        Map<OWLClass, Double> arScores = new HashMap<>();
 
-        processDomains(ontology.getAxioms(AxiomType.DATA_PROPERTY_DOMAIN), domainCounts);
-        processDomains(ontology.getAxioms(AxiomType.OBJECT_PROPERTY_DOMAIN), domainCounts);
+        for (int cls = 0; cls < totalClasses; cls++) {
+            if (!index.hasToldSubClass(cls))
+                continue;
 
-        classes.stream()
-                .filter(cls -> !isLeafClass(cls, ontology))
-                .forEach(cls -> {
-                    double score = (double) domainCounts.get(cls) / totalClasses;
-                    arScores.put(cls, score);
-                });
+            // Data and object property domains that mention the class
+            double score = (double) index.domainCount(cls) / totalClasses;
+            arScores.put(index.classAt(cls), score);
+        }
 
         return arScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
-    }
-
-    private void processDomains(Collection<? extends OWLPropertyDomainAxiom<?>> axioms,
-            Map<OWLClass, Integer> counts) {
-        for (OWLPropertyDomainAxiom<?> axiom : axioms) {
-            axiom.getDomain().classesInSignature().forEach(cls -> {
-                counts.computeIfPresent(cls, (k, v) -> v + 1);
-            });
-        }
-    }
-
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return EntitySearcher.getSubClasses(cls, ontology)
-                .noneMatch(ce -> ce.classesInSignature()
-                        .anyMatch(sub -> !sub.isOWLThing() && !sub.isOWLNothing()));
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
-}
\ No newline at end of file
+}
@@ -2,69 +2,61 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import java.util.stream.Collectors;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class CBOntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        Set<OWLClass> rootClasses = getRootClasses(ontology);
-        int denominator = classes.size() - rootClasses.size();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        int denominator = index.classCount() - countRoots(index);
 
         if (denominator <= 0)
-            return Collections.emptySet();
+            return Collections.emptyMap();
 
         Map<OWLClass, Double> cbScores = new HashMap<>();
-        // OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
 
-        for (OWLClass cls : classes) {
-            if (cls.isOWLThing() || isLeafClass(cls, ontology))
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            if (index.isThing(cls) || !index.hasToldSubClass(cls))
                 continue;
 
-            int superClassCount = countMeaningfulSuperclasses(cls, ontology);
+            int superClassCount = index.toldNonThingSuperClassCount(cls);
             double score = (double) superClassCount / denominator;
-            cbScores.put(cls, score);
+            cbScores.put(index.classAt(cls), score);
         }
 
         return cbScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
 
-    private int countMeaningfulSuperclasses(OWLClass cls, OWLOntology ontology) {
-        return (int) EntitySearcher.getSuperClasses(cls, ontology)
-                .flatMap(ce -> ce.classesInSignature())
-                .filter(sup -> !sup.isOWLThing())
-                .count();
-    }
-
-    private Set<OWLClass> getRootClasses(OWLOntology ontology) {
-        Set<OWLClass> roots = new HashSet<>();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
-
-        for (OWLClass cls : ontology.getClassesInSignature()) {
-            if (cls.isOWLThing())
+    // Roots have no class in their superclass expressions, or owl:Thing among them
+    private int countRoots(OntologyIndex index) {
+        int roots = 0;
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            if (index.isThing(cls))
                 continue;
 
-            Set<OWLClass> superClasses = EntitySearcher.getSuperClasses(cls, ontology)
-                    .flatMap(ce -> ce.classesInSignature())
-                    .collect(Collectors.toSet());
-
-            if (superClasses.isEmpty() || superClasses.contains(thing)) {
-                roots.add(cls);
+            int[] superClasses = index.toldSuperClasses(cls);
+            boolean root = superClasses.length == 0;
+            for (int sup : superClasses) {
+                root |= index.isThing(sup);
             }
+            if (root)
+                roots++;
         }
         return roots;
     }
-
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return EntitySearcher.getSubClasses(cls, ontology)
-                .noneMatch(ce -> ce.classesInSignature()
-                        .anyMatch(sub -> !sub.isOWLThing() && !sub.isOWLNothing()));
-    }
-}
\ No newline at end of file
+}
@@ -2,35 +2,39 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class INROntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int totalClasses = classes.size();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        int totalClasses = index.classCount();
         Map<OWLClass, Double> inrScores = new HashMap<>();
 
-        classes.stream()
-                .filter(cls -> !isLeafClass(cls, ontology))
-                .forEach(cls -> {
-                    int axiomCount = ontology.getSubClassAxiomsForSubClass(cls).size()
-                            + ontology.getSubClassAxiomsForSuperClass(cls).size();
-                    double score = (double) axiomCount / totalClasses;
-                    inrScores.put(cls, score);
-                });
+        for (int cls = 0; cls < totalClasses; cls++) {
+            if (!index.hasToldSubClass(cls))
+                continue;
+
+            int axiomCount = index.subClassAxiomsAsSubClass(cls) + index.subClassAxiomsAsSuperClass(cls);
+            double score = (double) axiomCount / totalClasses;
+            inrScores.put(index.classAt(cls), score);
+        }
 
         return inrScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
-    }
-
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return EntitySearcher.getSubClasses(cls, ontology)
-                .noneMatch(ce -> ce.classesInSignature()
-                        .anyMatch(sub -> !sub.isOWLThing() && !sub.isOWLNothing()));
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
-}
\ No newline at end of file
+}
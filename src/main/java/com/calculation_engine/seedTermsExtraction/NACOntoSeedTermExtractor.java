@@ -2,41 +2,47 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class NACOntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        Map<OWLClass, Integer> leafAncestorCounts = new HashMap<>();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
+        return getScoredSeedTerms(ontology).keySet();
+    }
 
-        for (OWLClass cls : classes) {
-            if (cls.isOWLThing())
-                continue;
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
 
-            // Check if leaf class (no direct named subclasses)
-            boolean isLeaf = EntitySearcher.getSubClasses(cls, ontology)
-                    .flatMap(ce -> ce.classesInSignature())
-                    .noneMatch(sub -> !sub.equals(thing));
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        Map<OWLClass, Integer> leafAncestorCounts = new HashMap<>();
 
-            if (isLeaf) {
-                // Count explicit named superclasses
-                int ancestorCount = (int) EntitySearcher.getSuperClasses(cls, ontology)
-                        .flatMap(ce -> ce.classesInSignature())
-                        .filter(sup -> !sup.equals(thing))
-                        .count();
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            if (index.isThing(cls) || !isLeaf(cls, index))
+                continue;
 
-                leafAncestorCounts.put(cls, ancestorCount);
-            }
+            // Count the classes in its superclass expressions
+            int ancestorCount = index.toldNonThingSuperClassCount(cls);
+            leafAncestorCounts.put(index.classAt(cls), ancestorCount);
         }
 
         return leafAncestorCounts.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(entry -> Collections.singleton(entry.getKey()))
-                .orElse(Collections.emptySet());
+                .map(entry -> Collections.singletonMap(entry.getKey(), entry.getValue().doubleValue()))
+                .orElse(Collections.emptyMap());
+    }
+
+    // Leaf classes have no class other than owl:Thing in their subclass expressions
+    private boolean isLeaf(int cls, OntologyIndex index) {
+        for (int sub : index.toldSubClasses(cls)) {
+            if (!index.isThing(sub))
+                return false;
+        }
+        return true;
     }
-}
\ No newline at end of file
+}
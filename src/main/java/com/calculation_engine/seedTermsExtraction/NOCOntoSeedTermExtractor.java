@@ -2,77 +2,68 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
+
+import com.calculation_engine.OntologyIndex;
 
 public class NOCOntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        Set<OWLClass> rootClasses = getRootClasses(ontology);
-        int denominator = classes.size() - rootClasses.size();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        int denominator = index.classCount() - index.toldRoots().length;
 
         if (denominator <= 0)
-            return Collections.emptySet();
+            return Collections.emptyMap();
 
         Map<OWLClass, Double> nocScores = new HashMap<>();
 
-        for (OWLClass cls : classes) {
-            if (cls.isOWLThing())
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            if (index.isThing(cls))
                 continue;
 
-            Set<OWLClass> subclasses = getTransitiveSubclasses(cls, ontology);
+            Set<Integer> subclasses = getTransitiveSubclasses(cls, index);
             if (subclasses.isEmpty())
                 continue; // Skip leaf classes
 
             double noc = (double) subclasses.size() / denominator;
-            nocScores.put(cls, noc);
+            nocScores.put(index.classAt(cls), noc);
         }
 
         return nocScores.entrySet().stream()
                 .sorted(Map.Entry.<OWLClass, Double>comparingByValue().reversed())
                 .findFirst()
-                .map(entry -> Collections.singleton(entry.getKey()))
-                .orElse(Collections.emptySet());
+                .map(entry -> Collections.singletonMap(entry.getKey(), entry.getValue()))
+                .orElse(Collections.emptyMap());
     }
 
-    private Set<OWLClass> getTransitiveSubclasses(OWLClass cls, OWLOntology ontology) {
-        Set<OWLClass> subclasses = new HashSet<>();
-        Queue<OWLClass> queue = new LinkedList<>();
+    private Set<Integer> getTransitiveSubclasses(int cls, OntologyIndex index) {
+        Set<Integer> subclasses = new HashSet<>();
+        Queue<Integer> queue = new LinkedList<>();
 
-        EntitySearcher.getSubClasses(cls, ontology)
-                .flatMap(ce -> ce.classesInSignature())
-                .filter(sub -> !sub.isOWLThing())
-                .forEach(queue::add);
+        addSubclasses(cls, index, queue);
 
         while (!queue.isEmpty()) {
-            OWLClass current = queue.poll();
+            int current = queue.poll();
             if (subclasses.add(current)) {
-                EntitySearcher.getSubClasses(current, ontology)
-                        .flatMap(ce -> ce.classesInSignature())
-                        .filter(sub -> !sub.isOWLThing())
-                        .forEach(queue::add);
+                addSubclasses(current, index, queue);
             }
         }
         return subclasses;
     }
 
-    private Set<OWLClass> getRootClasses(OWLOntology ontology) {
-        Set<OWLClass> roots = new HashSet<>();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
-
-        for (OWLClass cls : ontology.getClassesInSignature()) {
-            if (cls.isOWLThing())
-                continue;
-
-            boolean hasNonThingSuper = EntitySearcher.getSuperClasses(cls, ontology)
-                    .flatMap(ce -> ce.classesInSignature())
-                    .anyMatch(sup -> !sup.equals(thing));
-
-            if (!hasNonThingSuper)
-                roots.add(cls);
+    private void addSubclasses(int cls, OntologyIndex index, Queue<Integer> queue) {
+        for (int sub : index.toldSubClasses(cls)) {
+            if (!index.isThing(sub))
+                queue.add(sub);
         }
-        return roots;
     }
-}
\ No newline at end of file
+}
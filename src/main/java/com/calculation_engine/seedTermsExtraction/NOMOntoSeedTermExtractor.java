@@ -3,52 +3,37 @@ package com.calculation_engine.seedTermsExtraction;
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
 
+import com.calculation_engine.OntologyIndex;
+
 public class NOMOntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        int totalClasses = classes.size();
-        Map<OWLClass, Double> nomScores = new HashMap<>();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
 
-        for (OWLClass cls : classes) {
-            Set<OWLProperty> properties = new HashSet<>();
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        int totalClasses = index.classCount();
+        Map<OWLClass, Double> nomScores = new HashMap<>();
 
-            // Process class axioms for property usage
-            processClassAxioms(cls, ontology, properties);
+        for (int cls = 0; cls < totalClasses; cls++) {
+            // Properties used in the SubClassOf and EquivalentClasses axioms of the class
+            Set<OWLProperty> properties = index.propertiesAsSubClass(cls);
 
             double score = (double) properties.size() / totalClasses;
-            nomScores.put(cls, score);
+            nomScores.put(index.classAt(cls), score);
         }
 
         return nomScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
-    }
-
-    private void processClassAxioms(OWLClass cls, OWLOntology ontology,
-            Set<OWLProperty> properties) {
-        // Process SubClassOf axioms
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSubClass(cls)) {
-            processExpression(axiom.getSuperClass(), properties);
-        }
-
-        // Process EquivalentClasses axioms
-        for (OWLEquivalentClassesAxiom axiom : ontology.getEquivalentClassesAxioms(cls)) {
-            for (OWLClassExpression expr : axiom.getClassExpressions()) {
-                if (!expr.equals(cls)) {
-                    processExpression(expr, properties);
-                }
-            }
-        }
-    }
-
-    private void processExpression(OWLClassExpression expr,
-            Set<OWLProperty> properties) {
-        expr.signature()
-                .filter(entity -> entity.isOWLDataProperty() || entity.isOWLObjectProperty())
-                .forEach(entity -> properties.add((OWLProperty) entity));
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
-}
\ No newline at end of file
+}
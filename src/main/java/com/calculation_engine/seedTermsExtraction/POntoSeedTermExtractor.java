@@ -3,37 +3,31 @@ package com.calculation_engine.seedTermsExtraction;
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
 import java.util.AbstractMap.SimpleEntry;
-import org.semanticweb.owlapi.search.EntitySearcher;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
+import java.util.stream.IntStream;
+
+import com.calculation_engine.OntologyIndex;
 
 public class POntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
-
-        return classes.stream()
-                .filter(cls -> !cls.equals(thing))
-                .filter(cls -> !isLeafClass(cls, ontology))
-                .map(cls -> new SimpleEntry<>(cls, countMeaningfulSuperclasses(cls, ontology)))
-                .sorted(Comparator.comparingInt(Map.Entry::getValue))
-                .findFirst()
-                .map(entry -> Collections.singleton(entry.getKey()))
-                .orElse(Collections.emptySet());
+        return getScoredSeedTerms(ontology).keySet();
     }
 
-    private int countMeaningfulSuperclasses(OWLClass cls, OWLOntology ontology) {
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
-        return (int) EntitySearcher.getSuperClasses(cls, ontology)
-                .flatMap(ce -> ce.classesInSignature())
-                .filter(sup -> !sup.equals(thing))
-                .count();
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
     }
 
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return EntitySearcher.getSubClasses(cls, ontology)
-                .noneMatch(ce -> ce.classesInSignature()
-                        .anyMatch(sub -> !sub.isOWLThing() && !sub.isOWLNothing()));
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        return IntStream.range(0, index.classCount())
+                .filter(cls -> !index.isThing(cls))
+                .filter(cls -> index.hasToldSubClass(cls))
+                .mapToObj(cls -> new SimpleEntry<>(index.classAt(cls), index.toldNonThingSuperClassCount(cls)))
+                .sorted(Comparator.comparingInt(Map.Entry::getValue))
+                .findFirst()
+                .map(entry -> Collections.singletonMap(entry.getKey(), entry.getValue().doubleValue()))
+                .orElse(Collections.emptyMap());
     }
-}
\ No newline at end of file
+}
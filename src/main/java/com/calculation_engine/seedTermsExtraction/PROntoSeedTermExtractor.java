@@ -2,81 +2,69 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class PROntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
         Map<OWLClass, Double> pronoScores = new HashMap<>();
 
-        for (OWLClass cls : classes) {
-            if (isLeafClass(cls, ontology))
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            // Leaves are the classes that are not the superclass of any SubClassOf axiom
+            if (index.subClassAxiomsAsSuperClass(cls) == 0)
                 continue;
 
-            PROntoMetrics metrics = calculateMetrics(cls, ontology);
+            PROntoMetrics metrics = calculateMetrics(cls, index);
             double prono = calculatePROnto(metrics);
-            pronoScores.put(cls, prono);
+            pronoScores.put(index.classAt(cls), prono);
         }
 
         return pronoScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
 
-    private PROntoMetrics calculateMetrics(OWLClass cls, OWLOntology ontology) {
+    private PROntoMetrics calculateMetrics(int cls, OntologyIndex index) {
         PROntoMetrics metrics = new PROntoMetrics();
 
         // Count superclasses (excluding Thing)
-        metrics.superClassCount = (int) EntitySearcher.getSuperClasses(cls, ontology)
-                .flatMap(ce -> ce.classesInSignature())
-                .filter(sup -> !sup.isOWLThing())
-                .count();
+        metrics.superClassCount = index.toldNonThingSuperClassCount(cls);
 
-        // Process relevant axioms
-        processAxioms(cls, ontology, metrics);
+        // Properties of the SubClassOf axioms in both directions and of equivalent classes
+        processProperties(index.propertiesAsSubClass(cls), metrics);
+        processProperties(index.propertiesAsSuperClass(cls), metrics);
 
         // Count subclass axioms involving this class
-        metrics.subClassAxioms = ontology.getSubClassAxiomsForSubClass(cls).size()
-                + ontology.getSubClassAxiomsForSuperClass(cls).size();
+        metrics.subClassAxioms = index.subClassAxiomsAsSubClass(cls)
+                + index.subClassAxiomsAsSuperClass(cls);
 
         return metrics;
     }
 
-    private void processAxioms(OWLClass cls, OWLOntology ontology, PROntoMetrics metrics) {
-        // Process SubClassOf axioms where cls is subclass
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSubClass(cls)) {
-            processExpression(axiom.getSuperClass(), metrics);
-        }
-
-        // Process SubClassOf axioms where cls is superclass
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSuperClass(cls)) {
-            processExpression(axiom.getSubClass(), metrics);
-        }
-
-        // Process equivalent class axioms
-        for (OWLEquivalentClassesAxiom axiom : ontology.getEquivalentClassesAxioms(cls)) {
-            for (OWLClassExpression expr : axiom.getClassExpressions()) {
-                if (!expr.equals(cls)) {
-                    processExpression(expr, metrics);
-                }
+    private void processProperties(Set<OWLProperty> properties, PROntoMetrics metrics) {
+        for (OWLProperty property : properties) {
+            if (property.isOWLDataProperty()) {
+                metrics.dataProps.add(property.asOWLDataProperty());
+            } else if (property.isOWLObjectProperty()) {
+                metrics.objectProps.add(property.asOWLObjectProperty());
             }
         }
     }
 
-    private void processExpression(OWLClassExpression expr, PROntoMetrics metrics) {
-        expr.signature().forEach(entity -> {
-            if (entity.isOWLDataProperty()) {
-                metrics.dataProps.add(entity.asOWLDataProperty());
-            } else if (entity.isOWLObjectProperty()) {
-                metrics.objectProps.add(entity.asOWLObjectProperty());
-            }
-        });
-    }
-
     private double calculatePROnto(PROntoMetrics metrics) {
         int denominator = metrics.dataProps.size()
                 + metrics.objectProps.size()
@@ -85,16 +73,10 @@ public class PROntoSeedTermExtractor implements SeedTermExtractor {
         return denominator > 0 ? (double) metrics.superClassCount / denominator : 0.0;
     }
 
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return ontology.getSubClassAxiomsForSuperClass(cls).isEmpty()
-                && EntitySearcher.getSubClasses(cls, ontology)
-                        .noneMatch(ce -> !ce.isOWLNothing());
-    }
-
     private static class PROntoMetrics {
         Set<OWLDataProperty> dataProps = new HashSet<>();
         Set<OWLObjectProperty> objectProps = new HashSet<>();
         int superClassCount = 0;
         int subClassAxioms = 0;
     }
-}
\ No newline at end of file
+}
@@ -2,161 +2,192 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import java.util.concurrent.atomic.AtomicInteger;
-import java.util.stream.Collectors;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class RFCOntoSeedTermExtractor implements SeedTermExtractor {
+    private static final int DEFAULT_TOP_K = 5;
 
-    @Override
-    public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
-        Set<OWLClass> rootClasses = getRootClasses(ontology);
-        int totalClasses = classes.size();
-        int rootClassesCount = rootClasses.size();
-        double denominator = totalClasses - rootClassesCount;
+    private final int topK;
 
-        if (denominator <= 0)
-            return Collections.emptySet();
+    public RFCOntoSeedTermExtractor() {
+        this(DEFAULT_TOP_K);
+    }
 
-        Set<OWLClass> candidateClasses = classes.stream()
-                .filter(cls -> !isLeafClass(cls, ontology))
-                .collect(Collectors.toSet());
+    /** Keep the topK non-leaf classes with the lowest RFC. */
+    public RFCOntoSeedTermExtractor(int topK) {
+        this.topK = topK;
+    }
+
+    @Override
+    public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(ontology).keySet();
+    }
 
-        if (candidateClasses.isEmpty())
-            return Collections.emptySet();
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
 
-        Map<OWLClass, Double> rfcScores = new HashMap<>();
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        double denominator = index.classCount() - index.toldRoots().length;
+
+        if (denominator <= 0 || topK <= 0)
+            return Collections.emptyMap();
+
+        // KEY IMPROVEMENT: the hierarchy of a class includes both its super and subclasses,
+        // i.e. every class reachable through them, so the axiom usage is summed per component
+        HierarchyComponents components = new HierarchyComponents(index);
+        long[] usage = new long[index.classCount()];
+
+        // Highest usage on top, so the heap keeps the topK lowest; ties keep the lower class id
+        Comparator<Integer> byUsage = Comparator.<Integer>comparingLong(cls -> usage[cls])
+                .thenComparingInt(cls -> cls);
+        PriorityQueue<Integer> lowest = new PriorityQueue<>(topK + 1, byUsage.reversed());
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            // Leaves are the classes without a subclass expression other than owl:Nothing
+            if (!index.hasSubClassExpression(cls))
+                continue;
 
-        for (OWLClass cls : candidateClasses) {
-            Set<OWLClass> hierarchy = getFullHierarchy(cls, ontology);
-            int[] axiomCounts = calculateAxiomUsage(hierarchy, ontology);
-            double rfc = (axiomCounts[0] + axiomCounts[1] + axiomCounts[2]) / denominator;
-            rfcScores.put(cls, rfc);
+            usage[cls] = components.axiomUsage(cls);
+            lowest.add(cls);
+            if (lowest.size() > topK)
+                lowest.poll();
         }
 
-        return rfcScores.entrySet().stream()
-                .sorted(Map.Entry.comparingByValue())
-                .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
-    }
-
-    // KEY IMPROVEMENT: Include both super and subclasses in hierarchy
-    private Set<OWLClass> getFullHierarchy(OWLClass cls, OWLOntology ontology) {
-        Set<OWLClass> hierarchy = new HashSet<>();
-        Deque<OWLClass> toProcess = new ArrayDeque<>();
-        toProcess.add(cls);
-
-        while (!toProcess.isEmpty()) {
-            OWLClass current = toProcess.poll();
-
-            if (hierarchy.add(current)) {
-                // Add superclasses
-                EntitySearcher.getSuperClasses(current, ontology)
-                        .flatMap(ce -> ce.classesInSignature())
-                        .filter(sup -> !sup.isOWLThing())
-                        .forEach(sup -> {
-                            if (!hierarchy.contains(sup))
-                                toProcess.add(sup);
-                        });
-
-                // Add subclasses
-                EntitySearcher.getSubClasses(current, ontology)
-                        .flatMap(ce -> ce.classesInSignature())
-                        .filter(sub -> !sub.isOWLThing())
-                        .forEach(sub -> {
-                            if (!hierarchy.contains(sub))
-                                toProcess.add(sub);
-                        });
-            }
+        List<Integer> selected = new ArrayList<>(lowest);
+        selected.sort(byUsage);
+        Map<OWLClass, Double> seedTerms = new LinkedHashMap<>();
+        for (int cls : selected) {
+            seedTerms.put(index.classAt(cls), usage[cls] / denominator);
         }
-        return hierarchy;
+        return seedTerms;
     }
 
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return EntitySearcher.getSubClasses(cls, ontology)
-                .noneMatch(ce -> !ce.isOWLNothing());
-    }
+    /**
+     * The classes reachable from each class through its told super- and subclasses
+     * (owl:Thing left out) and their summed axiom usage: the SubClassOf axioms of the classes
+     * and the data and object properties of each of their superclass and equivalent class
+     * expressions.
+     *
+     * A named SubClassOf axiom links its two classes both ways, so union-find merges them
+     * into components whose classes all reach the same set. A class only in the signature of
+     * an anonymous expression, such as B in A SubClassOf r some B, is reached from A but does
+     * not reach A, so those links are kept as directed edges between components, and the
+     * usage reachable from a component is summed once and shared by all its classes.
+     */
+    private static class HierarchyComponents {
+        private final OntologyIndex index;
+        private final int[] parent;
+        private final int[] size;
+        private final long[] componentUsage;
+        private final List<Set<Integer>> componentEdges;
+        private final Map<Integer, Long> reachableUsage = new HashMap<>();
+
+        HierarchyComponents(OntologyIndex index) {
+            this.index = index;
+            int n = index.classCount();
+            parent = new int[n];
+            size = new int[n];
+            for (int cls = 0; cls < n; cls++) {
+                parent[cls] = cls;
+                size[cls] = 1;
+            }
+            for (int cls = 0; cls < n; cls++) {
+                if (index.isThing(cls))
+                    continue;
+                for (int sup : index.superClasses(cls)) {
+                    if (!index.isThing(sup))
+                        union(cls, sup);
+                }
+            }
 
-    // private Set<OWLClass> getClassHierarchy(OWLClass cls, OWLOntology ontology) {
-    // Set<OWLClass> hierarchy = new HashSet<>();
-    // Queue<OWLClass> queue = new LinkedList<>();
-    // queue.add(cls);
-
-    // while (!queue.isEmpty()) {
-    // OWLClass current = queue.poll();
-    // if (hierarchy.add(current)) {
-    // Set<OWLClass> subs = EntitySearcher.getSubClasses(current, ontology)
-    // .flatMap(ce -> ce.classesInSignature())
-    // .filter(sub -> !sub.isOWLThing())
-    // .collect(Collectors.toSet());
-    // queue.addAll(subs);
-    // }
-    // }
-    // return hierarchy;
-    // }
-
-    private int[] calculateAxiomUsage(Set<OWLClass> hierarchy, OWLOntology ontology) {
-        AtomicInteger subclassCount = new AtomicInteger();
-        AtomicInteger dataProps = new AtomicInteger();
-        AtomicInteger objProps = new AtomicInteger();
-
-        for (OWLClass cls : hierarchy) {
-            subclassCount.addAndGet(ontology.getSubClassAxiomsForSubClass(cls).size());
-            processClassAxioms(cls, ontology, dataProps, objProps);
+            componentUsage = new long[n];
+            componentEdges = new ArrayList<>(Collections.<Set<Integer>>nCopies(n, null));
+            for (int cls = 0; cls < n; cls++) {
+                int component = find(cls);
+                componentUsage[component] += classUsage(cls);
+                if (index.isThing(cls))
+                    continue;
+                addEdges(component, index.toldSuperClasses(cls));
+                addEdges(component, index.toldSubClasses(cls));
+            }
         }
 
-        return new int[] {
-                subclassCount.get(),
-                dataProps.get(),
-                objProps.get()
-        };
-    }
+        /** Axiom usage of the classes reachable from cls, owl:Thing reaching only its neighbours. */
+        long axiomUsage(int cls) {
+            if (!index.isThing(cls))
+                return reachableUsage.computeIfAbsent(find(cls), component -> sumReachable(Collections.singleton(component)));
 
-    private void processClassAxioms(OWLClass cls, OWLOntology ontology,
-            AtomicInteger dataProps, AtomicInteger objProps) {
-        // Process SubClassOf axioms
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSubClass(cls)) {
-            processExpression(axiom.getSuperClass(), dataProps, objProps);
+            Set<Integer> start = new HashSet<>();
+            for (int[] neighbours : new int[][] {index.toldSuperClasses(cls), index.toldSubClasses(cls)}) {
+                for (int neighbour : neighbours) {
+                    if (!index.isThing(neighbour))
+                        start.add(find(neighbour));
+                }
+            }
+            return classUsage(cls) + sumReachable(start);
         }
 
-        // Process EquivalentClasses axioms
-        for (OWLEquivalentClassesAxiom axiom : ontology.getEquivalentClassesAxioms(cls)) {
-            for (OWLClassExpression expr : axiom.getClassExpressions()) {
-                if (!expr.equals(cls)) {
-                    processExpression(expr, dataProps, objProps);
+        private long sumReachable(Set<Integer> start) {
+            long usage = 0;
+            Set<Integer> visited = new HashSet<>(start);
+            Deque<Integer> toProcess = new ArrayDeque<>(start);
+            while (!toProcess.isEmpty()) {
+                int component = toProcess.poll();
+                usage += componentUsage[component];
+                Set<Integer> edges = componentEdges.get(component);
+                if (edges == null)
+                    continue;
+                for (int next : edges) {
+                    if (visited.add(next))
+                        toProcess.add(next);
                 }
             }
+            return usage;
         }
-    }
-
-    private void processExpression(OWLClassExpression expr,
-            AtomicInteger dataProps, AtomicInteger objProps) {
-        expr.signature().forEach(entity -> {
-            if (entity.isOWLDataProperty())
-                dataProps.incrementAndGet();
-            if (entity.isOWLObjectProperty())
-                objProps.incrementAndGet();
-        });
-    }
 
-    private Set<OWLClass> getRootClasses(OWLOntology ontology) {
-        Set<OWLClass> roots = new HashSet<>();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
+        private void addEdges(int component, int[] neighbours) {
+            for (int neighbour : neighbours) {
+                if (index.isThing(neighbour))
+                    continue;
+                int target = find(neighbour);
+                if (target == component)
+                    continue;
+                Set<Integer> edges = componentEdges.get(component);
+                if (edges == null) {
+                    edges = new HashSet<>();
+                    componentEdges.set(component, edges);
+                }
+                edges.add(target);
+            }
+        }
 
-        for (OWLClass cls : ontology.getClassesInSignature()) {
-            if (cls.isOWLThing())
-                continue;
+        private long classUsage(int cls) {
+            return index.subClassAxiomsAsSubClass(cls) + index.propertyUsageAsSubClass(cls);
+        }
 
-            boolean hasNonThingSuper = EntitySearcher.getSuperClasses(cls, ontology)
-                    .flatMap(ce -> ce.classesInSignature())
-                    .anyMatch(sup -> !sup.equals(thing));
+        private int find(int cls) {
+            while (parent[cls] != cls) {
+                parent[cls] = parent[parent[cls]];
+                cls = parent[cls];
+            }
+            return cls;
+        }
 
-            if (!hasNonThingSuper)
-                roots.add(cls);
+        private void union(int a, int b) {
+            int rootA = find(a);
+            int rootB = find(b);
+            if (rootA == rootB)
+                return;
+            if (size[rootA] < size[rootB]) {
+                int swap = rootA;
+                rootA = rootB;
+                rootB = swap;
+            }
+            parent[rootB] = rootA;
+            size[rootA] += size[rootB];
         }
-        return roots;
     }
-}
\ No newline at end of file
+}
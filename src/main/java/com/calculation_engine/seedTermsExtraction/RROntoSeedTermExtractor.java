@@ -2,75 +2,66 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class RROntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
         Map<OWLClass, Double> rroScores = new HashMap<>();
 
-        for (OWLClass cls : classes) {
-            if (isLeafClass(cls, ontology))
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            // Leaves are the classes that are not the superclass of any SubClassOf axiom
+            if (index.subClassAxiomsAsSuperClass(cls) == 0)
                 continue;
 
-            ClassMetrics metrics = calculateClassMetrics(cls, ontology);
+            ClassMetrics metrics = calculateClassMetrics(cls, index);
             double rro = calculateRROnto(metrics);
-            rroScores.put(cls, rro);
+            rroScores.put(index.classAt(cls), rro);
         }
 
         return rroScores.entrySet().stream()
                 .sorted(Map.Entry.comparingByValue())
                 .findFirst()
-                .map(e -> Collections.singleton(e.getKey()))
-                .orElse(Collections.emptySet());
+                .map(e -> Collections.singletonMap(e.getKey(), e.getValue()))
+                .orElse(Collections.emptyMap());
     }
 
-    private ClassMetrics calculateClassMetrics(OWLClass cls, OWLOntology ontology) {
+    private ClassMetrics calculateClassMetrics(int cls, OntologyIndex index) {
         ClassMetrics metrics = new ClassMetrics();
 
         // Count subclass axioms where class appears
-        metrics.subClassAxioms = ontology.getSubClassAxiomsForSubClass(cls).size()
-                + ontology.getSubClassAxiomsForSuperClass(cls).size();
+        metrics.subClassAxioms = index.subClassAxiomsAsSubClass(cls)
+                + index.subClassAxiomsAsSuperClass(cls);
 
-        // Process axioms involving the class
-        processAxioms(cls, ontology, metrics);
+        // Properties of the SubClassOf axioms in both directions and of equivalent classes
+        processProperties(index.propertiesAsSubClass(cls), metrics);
+        processProperties(index.propertiesAsSuperClass(cls), metrics);
 
         return metrics;
     }
 
-    private void processAxioms(OWLClass cls, OWLOntology ontology, ClassMetrics metrics) {
-        // Process SubClassOf axioms where cls is subclass
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSubClass(cls)) {
-            processExpression(axiom.getSuperClass(), metrics);
-        }
-
-        // Process SubClassOf axioms where cls is superclass
-        for (OWLSubClassOfAxiom axiom : ontology.getSubClassAxiomsForSuperClass(cls)) {
-            processExpression(axiom.getSubClass(), metrics);
-        }
-
-        // Process equivalent class axioms
-        for (OWLEquivalentClassesAxiom axiom : ontology.getEquivalentClassesAxioms(cls)) {
-            for (OWLClassExpression expr : axiom.getClassExpressions()) {
-                if (!expr.equals(cls)) {
-                    processExpression(expr, metrics);
-                }
+    private void processProperties(Set<OWLProperty> properties, ClassMetrics metrics) {
+        for (OWLProperty property : properties) {
+            if (property.isOWLDataProperty()) {
+                metrics.dataProps.add(property.asOWLDataProperty());
+            } else if (property.isOWLObjectProperty()) {
+                metrics.objProps.add(property.asOWLObjectProperty());
             }
         }
     }
 
-    private void processExpression(OWLClassExpression expr, ClassMetrics metrics) {
-        expr.signature().forEach(entity -> {
-            if (entity.isOWLDataProperty()) {
-                metrics.dataProps.add(entity.asOWLDataProperty());
-            } else if (entity.isOWLObjectProperty()) {
-                metrics.objProps.add(entity.asOWLObjectProperty());
-            }
-        });
-    }
-
     private double calculateRROnto(ClassMetrics metrics) {
         int dpCount = metrics.dataProps.size();
         int opCount = metrics.objProps.size();
@@ -79,15 +70,9 @@ public class RROntoSeedTermExtractor implements SeedTermExtractor {
         return total > 0 ? (double) (dpCount + opCount) / total : 0.0;
     }
 
-    private boolean isLeafClass(OWLClass cls, OWLOntology ontology) {
-        return ontology.getSubClassAxiomsForSuperClass(cls).isEmpty()
-                && EntitySearcher.getSubClasses(cls, ontology)
-                        .noneMatch(ce -> !ce.isOWLNothing());
-    }
-
     private static class ClassMetrics {
         Set<OWLDataProperty> dataProps = new HashSet<>();
         Set<OWLObjectProperty> objProps = new HashSet<>();
         int subClassAxioms = 0;
     }
-}
\ No newline at end of file
+}
@@ -7,25 +7,71 @@ import org.semanticweb.owlapi.model.OWLOntology;
 import org.semanticweb.owlapi.model.OWLOntologyCreationException;
 import org.semanticweb.owlapi.model.OWLOntologyManager;
 
+import com.calculation_engine.OQuaRE;
+import com.calculation_engine.OntologyIndex;
+
+import com.google.gson.Gson;
+import com.google.gson.JsonArray;
+import com.google.gson.JsonObject;
+
 import java.io.File;
 import java.io.FileNotFoundException;
+import java.io.FileOutputStream;
+import java.io.OutputStreamWriter;
+import java.io.PrintStream;
+import java.io.PrintWriter;
+import java.nio.charset.StandardCharsets;
 import java.util.*;
+import java.util.concurrent.CompletionService;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorCompletionService;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.function.BiConsumer;
 
 public class RunGenericExtractor {
 
+    /**
+     * Threads for the extractors, as many as for the metric calculators (ENGINE_METRIC_THREADS):
+     * the extractors only read the immutable OntologyIndex and run after the metrics are done.
+     */
+    private static final ExecutorService EXTRACTOR_POOL = Executors.newFixedThreadPool(OQuaRE.calculatorThreads(), runnable -> {
+        Thread thread = new Thread(runnable, "seed-term-extractor");
+        thread.setDaemon(true);
+        return thread;
+    });
+
     public static void main(String[] args) {
-        if (args.length < 1) {
-            System.err.println("Usage: java -cp <classpath> com.calculation_engine.seedTermsExtraction.RunGenericExtractor <ontology_path> [comma_separated_metrics]");
+        // --ndjson <file> (or "-" for stdout) writes one JSON line per metric as soon as it is done
+        String ndjsonTarget = null;
+        List<String> positional = new ArrayList<>();
+        for (int i = 0; i < args.length; i++) {
+            if (args[i].equals("--ndjson") && i + 1 < args.length) {
+                ndjsonTarget = args[++i];
+            } else {
+                positional.add(args[i]);
+            }
+        }
+
+        if (positional.isEmpty()) {
+            System.err.println("Usage: java -cp <classpath> com.calculation_engine.seedTermsExtraction.RunGenericExtractor <ontology_path> [comma_separated_metrics] [--ndjson <file|->]");
             System.exit(1);
         }
 
+        // Keep stdout for the NDJSON stream; human-readable output goes to stderr instead
+        PrintStream stdout = System.out;
+        if ("-".equals(ndjsonTarget)) {
+            System.setOut(System.err);
+        }
+
         // Get ontology path from command line arguments
-        String ontologyPath = args[0];
+        String ontologyPath = positional.get(0);
         
         // Get specific metrics to extract if provided
         final List<String> specificMetrics;
-        if (args.length > 1 && args[1] != null && !args[1].trim().isEmpty()) {
-            specificMetrics = Arrays.asList(args[1].split(","));
+        if (positional.size() > 1 && !positional.get(1).trim().isEmpty()) {
+            specificMetrics = Arrays.asList(positional.get(1).split(","));
             System.out.println("Extracting seed terms for specific metrics: " + String.join(", ", specificMetrics));
         } else {
             specificMetrics = new ArrayList<>();
@@ -45,65 +91,31 @@ public class RunGenericExtractor {
             System.out.println(
                     "Loaded ontology: " + ontology.getOntologyID().getOntologyIRI().orElse(IRI.create("Unknown")));
 
-            // 3. Create list of all available extractors
-            List<Object> allExtractors = Arrays.asList(
-                    new ANOntoSeedTermExtractor(),
-                    new AROntoSeedTermExtractor(),
-                    new CROntoSeedTermExtractor(),
-                    new DITOntoSeedTermExtractor(),
-                    new LCOMOntoSeedTermExtractor(),
-                    new CBOntoSeedTermExtractor(),
-                    new INROntoSeedTermExtractor(),
-                    new NACOntoSeedTermExtractor(),
-                    new NOCOntoSeedTermExtractor(),
-                    new NOMOntoSeedTermExtractor(),
-                    new POntoSeedTermExtractor(),
-                    new PROntoSeedTermExtractor(),
-                    new RFCOntoSeedTermExtractor(),
-                    new RROntoSeedTermExtractor(),
-                    new TMOntoSeedTermExtractor(),
-                    new WMCOntoSeedTermExtractor());
-
-            // Filter extractors based on specific metrics if provided
-            List<Object> extractors = allExtractors;
-            if (!specificMetrics.isEmpty()) {
-                // Create a new filtered list
-                List<Object> filteredExtractors = new ArrayList<>();
-                
-                // Loop through all extractors and check each one
-                for (Object extractor : allExtractors) {
-                    String fullClassName = extractor.getClass().getSimpleName();
-                    // Remove the "OntoSeedTermExtractor" suffix to get the metric name
-                    String metricName = fullClassName.replace("OntoSeedTermExtractor", "");
-                    
-                    // Check if this metric is in our specificMetrics list
-                    boolean isRequested = specificMetrics.contains(metricName);
-                    
-                    if (isRequested) {
-                        filteredExtractors.add(extractor);
-                    }
-                }
-                
-                // Update our extractors list
-                extractors = filteredExtractors;
-                
-                if (extractors.isEmpty()) {
-                    System.err.println("Warning: No matching extractors found for the specified metrics.");
-                    System.exit(1);
-                }
+            // 3. Select the extractors for the requested metrics (all of them if none were given)
+            List<SeedTermExtractor> extractors = selectExtractors(specificMetrics);
+            if (extractors.isEmpty()) {
+                System.err.println("Warning: No matching extractors found for the specified metrics.");
+                System.exit(1);
             }
 
-            // 4. Run extractors and collect results
-            Map<String, Set<OWLClass>> results = new HashMap<>();
-            for (Object extractor : extractors) {
-                try {
-                    Set<OWLClass> seedTerms = ((SeedTermExtractor) extractor).getSeedTerms(ontology);
-                    String extractorName = extractor.getClass().getSimpleName().replace("OntoSeedTermExtractor", "");
-                    results.put(extractorName, seedTerms);
-                } catch (Exception e) {
-                    System.err.println("Error running extractor: " + e.getMessage());
+            // 4. Run extractors and collect results, streaming each metric when asked to
+            if (ndjsonTarget != null) {
+                try (PrintWriter ndjson = "-".equals(ndjsonTarget)
+                        ? new PrintWriter(new OutputStreamWriter(stdout, StandardCharsets.UTF_8), true)
+                        : new PrintWriter(new OutputStreamWriter(new FileOutputStream(ndjsonTarget), StandardCharsets.UTF_8), true)) {
+                    Gson gson = new Gson();
+                    Map<String, Long> timingsMs = new HashMap<>();
+                    runExtractors(OntologyIndex.build(ontology), extractors, (metric, seedTerms) -> {
+                        JsonObject line = new JsonObject();
+                        line.addProperty("metric", metric);
+                        line.add("seed_terms", toJson(seedTerms));
+                        line.addProperty("elapsed_ms", timingsMs.get(metric));
+                        ndjson.println(gson.toJson(line));
+                    }, timingsMs);
                 }
+                return;
             }
+            Map<String, Map<OWLClass, Double>> results = runExtractors(ontology, extractors, null);
 
             // 5. Print results
             System.out.println("\nSeed Terms by Metric:");
@@ -118,7 +130,7 @@ public class RunGenericExtractor {
                             System.out.println("No seed terms found for this metric");
                         } else {
                             // Print all seed terms, not just limited to 2
-                            entry.getValue().forEach(cls -> {
+                            entry.getValue().keySet().forEach(cls -> {
                                 System.out.println("Seed term: " + cls.getIRI().getShortForm());
                                 System.out.println("Full IRI: " + cls.getIRI().toString());
                             });
@@ -138,4 +150,145 @@ public class RunGenericExtractor {
             System.exit(1);
         }
     }
+
+    /**
+     * Create the extractors for the given metric names (e.g. "CBO", "NOC"), or all of them
+     * when the list is empty.
+     */
+    public static List<SeedTermExtractor> selectExtractors(List<String> metrics) {
+        List<SeedTermExtractor> allExtractors = Arrays.asList(
+                new ANOntoSeedTermExtractor(),
+                new AROntoSeedTermExtractor(),
+                new CROntoSeedTermExtractor(),
+                new DITOntoSeedTermExtractor(),
+                new LCOMOntoSeedTermExtractor(),
+                new CBOntoSeedTermExtractor(),
+                new INROntoSeedTermExtractor(),
+                new NACOntoSeedTermExtractor(),
+                new NOCOntoSeedTermExtractor(),
+                new NOMOntoSeedTermExtractor(),
+                new POntoSeedTermExtractor(),
+                new PROntoSeedTermExtractor(),
+                new RFCOntoSeedTermExtractor(),
+                new RROntoSeedTermExtractor(),
+                new TMOntoSeedTermExtractor(),
+                new WMCOntoSeedTermExtractor());
+
+        if (metrics.isEmpty()) {
+            return allExtractors;
+        }
+
+        List<SeedTermExtractor> filteredExtractors = new ArrayList<>();
+        for (SeedTermExtractor extractor : allExtractors) {
+            if (metrics.contains(metricName(extractor))) {
+                filteredExtractors.add(extractor);
+            }
+        }
+        return filteredExtractors;
+    }
+
+    /**
+     * Run the extractors on an already loaded ontology and return the scored seed terms
+     * keyed by metric name. onMetric, when given, is called as soon as each metric is done.
+     * An extractor that fails is reported and left out of the result.
+     */
+    public static Map<String, Map<OWLClass, Double>> runExtractors(OWLOntology ontology, List<SeedTermExtractor> extractors,
+                                                                  BiConsumer<String, Map<OWLClass, Double>> onMetric) {
+        return runExtractors(OntologyIndex.build(ontology), extractors, onMetric);
+    }
+
+    /**
+     * Run the extractors on a hierarchy index that was already built, e.g. for the metric
+     * calculators.
+     */
+    public static Map<String, Map<OWLClass, Double>> runExtractors(OntologyIndex index, List<SeedTermExtractor> extractors,
+                                                                  BiConsumer<String, Map<OWLClass, Double>> onMetric) {
+        return runExtractors(index, extractors, onMetric, null);
+    }
+
+    /**
+     * Run the extractors side by side on the extractor pool. Results are collected on the
+     * calling thread as the extractors finish, so onMetric is never called concurrently, and
+     * each extractor's elapsed time and seed term count are reported. timingsMs, when given,
+     * receives the milliseconds each metric took before onMetric is called for it.
+     */
+    public static Map<String, Map<OWLClass, Double>> runExtractors(OntologyIndex index, List<SeedTermExtractor> extractors,
+                                                                  BiConsumer<String, Map<OWLClass, Double>> onMetric,
+                                                                  Map<String, Long> timingsMs) {
+        Map<String, Map<OWLClass, Double>> results = new TreeMap<>();
+        CompletionService<ExtractorResult> completion = new ExecutorCompletionService<>(EXTRACTOR_POOL);
+        Map<Future<ExtractorResult>, String> pending = new HashMap<>();
+        try {
+            for (SeedTermExtractor extractor : extractors) {
+                String metric = metricName(extractor);
+                pending.put(completion.submit(() -> {
+                    long started = System.nanoTime();
+                    Map<OWLClass, Double> seedTerms = extractor.getScoredSeedTerms(index);
+                    return new ExtractorResult(seedTerms, (System.nanoTime() - started) / 1_000_000);
+                }), metric);
+            }
+
+            while (!pending.isEmpty()) {
+                Future<ExtractorResult> done = completion.take();
+                String metric = pending.remove(done);
+                ExtractorResult result;
+                try {
+                    result = done.get();
+                } catch (ExecutionException e) {
+                    System.err.println("Error running extractor " + metric + ": " + e.getCause().getMessage());
+                    continue;
+                }
+                System.out.println("Seed terms for " + metric + ": " + result.seedTerms.size()
+                        + " in " + result.elapsedMs + " ms");
+                results.put(metric, result.seedTerms);
+                if (timingsMs != null) {
+                    timingsMs.put(metric, result.elapsedMs);
+                }
+                if (onMetric != null) {
+                    onMetric.accept(metric, result.seedTerms);
+                }
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            System.err.println("Seed term extraction was interrupted");
+        } finally {
+            // Stop extractors still running after an interrupt
+            for (Future<ExtractorResult> future : pending.keySet()) {
+                future.cancel(true);
+            }
+        }
+        return results;
+    }
+
+    private static class ExtractorResult {
+        final Map<OWLClass, Double> seedTerms;
+        final long elapsedMs;
+
+        ExtractorResult(Map<OWLClass, Double> seedTerms, long elapsedMs) {
+            this.seedTerms = seedTerms;
+            this.elapsedMs = elapsedMs;
+        }
+    }
+
+    /**
+     * Seed terms as [{"term": short form, "iri": full IRI, "score": value or null}], the
+     * layout SeedTermSelector and the module extractor read.
+     */
+    public static JsonArray toJson(Map<OWLClass, Double> seedTerms) {
+        JsonArray terms = new JsonArray();
+        for (Map.Entry<OWLClass, Double> entry : seedTerms.entrySet()) {
+            JsonObject term = new JsonObject();
+            term.addProperty("term", entry.getKey().getIRI().getShortForm());
+            term.addProperty("iri", entry.getKey().getIRI().toString());
+            Double score = entry.getValue();
+            term.addProperty("score", (score == null || score.isNaN() || score.isInfinite()) ? null : score);
+            terms.add(term);
+        }
+        return terms;
+    }
+
+    // Remove the "OntoSeedTermExtractor" suffix to get the metric name
+    private static String metricName(SeedTermExtractor extractor) {
+        return extractor.getClass().getSimpleName().replace("OntoSeedTermExtractor", "");
+    }
 }
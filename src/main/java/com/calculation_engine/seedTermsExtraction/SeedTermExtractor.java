@@ -2,9 +2,34 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.OWLClass;
 import org.semanticweb.owlapi.model.OWLOntology;
+
+import com.calculation_engine.OntologyIndex;
+
+import java.util.LinkedHashMap;
+import java.util.Map;
 import java.util.Set;
 
 public interface SeedTermExtractor {
     Set<OWLClass> getSeedTerms(OWLOntology ontology);
 
+    /**
+     * Seed terms together with the per-class score that selected them. Extractors that do
+     * not score classes report NaN.
+     */
+    default Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        Map<OWLClass, Double> scoredTerms = new LinkedHashMap<>();
+        for (OWLClass cls : getSeedTerms(ontology)) {
+            scoredTerms.put(cls, Double.NaN);
+        }
+        return scoredTerms;
+    }
+
+    /**
+     * Scored seed terms from a hierarchy index that is shared with the other extractors and
+     * the metric calculators, so that the ontology is only scanned once.
+     */
+    default Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
+        return getScoredSeedTerms(index.getOntology());
+    }
+
 }
@@ -2,33 +2,36 @@ package com.calculation_engine.seedTermsExtraction;
 
 import org.semanticweb.owlapi.model.*;
 import java.util.*;
-import uk.ac.manchester.cs.owl.owlapi.OWLDataFactoryImpl;
-import org.semanticweb.owlapi.search.EntitySearcher;
+
+import com.calculation_engine.OntologyIndex;
 
 public class TMOntoSeedTermExtractor implements SeedTermExtractor {
 
     @Override
     public Set<OWLClass> getSeedTerms(OWLOntology ontology) {
-        Set<OWLClass> classes = ontology.getClassesInSignature();
+        return getScoredSeedTerms(ontology).keySet();
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OWLOntology ontology) {
+        return getScoredSeedTerms(OntologyIndex.build(ontology));
+    }
+
+    @Override
+    public Map<OWLClass, Double> getScoredSeedTerms(OntologyIndex index) {
         Map<OWLClass, Integer> superClassCounts = new HashMap<>();
-        OWLClass thing = new OWLDataFactoryImpl().getOWLThing();
 
-        for (OWLClass cls : classes) {
-            if (cls.isOWLThing())
+        for (int cls = 0; cls < index.classCount(); cls++) {
+            if (index.isThing(cls))
                 continue;
 
-            int count = (int) EntitySearcher.getSuperClasses(cls, ontology)
-                    .flatMap(ce -> ce.classesInSignature())
-                    .filter(sup -> !sup.equals(thing))
-                    .count();
-
-            superClassCounts.put(cls, count);
+            superClassCounts.put(index.classAt(cls), index.toldNonThingSuperClassCount(cls));
         }
 
         return superClassCounts.entrySet().stream()
                 .sorted(Map.Entry.<OWLClass, Integer>comparingByValue().reversed())
                 .findFirst()
-                .map(entry -> Collections.singleton(entry.getKey()))
-                .orElse(Collections.emptySet());
+                .map(entry -> Collections.singletonMap(entry.getKey(), entry.getValue().doubleValue()))
+                .orElse(Collections.emptyMap());
     }
-}
\ No newline at end of file
+}
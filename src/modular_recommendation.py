@@ -18,11 +18,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def setup_directories():
+def setup_directories(modules_dir="output/ontologies/modules", cnl_dir="output/cnl", reports_dir="output/reports"):
     """Create necessary directories for the workflow."""
-    os.makedirs("output/ontologies/modules", exist_ok=True)
-    os.makedirs("output/cnl", exist_ok=True)
-    os.makedirs("output/reports", exist_ok=True)
+    os.makedirs(modules_dir, exist_ok=True)
+    os.makedirs(cnl_dir, exist_ok=True)
+    os.makedirs(reports_dir, exist_ok=True)
     
     # Check if simplified glossaries exist
     metrics_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'metrics')
@@ -43,10 +43,17 @@ def parse_arguments():
                       help="Recommendation mode: basic, advanced, or both (default: both)")
     parser.add_argument("--output-dir", default="output/reports",
                       help="Directory to save recommendation reports (default: output/reports)")
+    parser.add_argument("--modules-dir", default="output/ontologies/modules",
+                      help="Directory to save extracted modules (default: output/ontologies/modules)")
+    parser.add_argument("--cnl-dir", default="output/cnl",
+                      help="Directory to save module CNL files (default: output/cnl)")
     
     return parser.parse_args()
 
-def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_path, mode="both", output_dir="output/reports"):
+def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_path, mode="both", output_dir="output/reports",
+                                     modules_dir="output/ontologies/modules", cnl_dir="output/cnl",
+                                     basic_recommender=None, advanced_recommender=None,
+                                     on_stage=None, on_report=None, module_paths=None):
     """
     Generate recommendations for an ontology using modularization based on worst metrics.
     
@@ -61,22 +68,36 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
         seed_terms_path: Path to the seed terms JSON file
         mode: Recommendation mode - 'basic', 'advanced', or 'both'
         output_dir: Directory to save recommendation reports
+        modules_dir: Directory to save the extracted modules
+        cnl_dir: Directory to save the module CNL files
+        basic_recommender: BasicRecommendations instance to reuse (created once if omitted)
+        advanced_recommender: AdvancedRecommendations instance to reuse (created once if omitted)
+        on_stage: Optional callback receiving the name of each step as it starts
+        on_report: Optional callback receiving the path of each report once written
+        module_paths: Modules already extracted (e.g. while the seed terms were selected);
+                      step 1 is skipped when given
     """
     try:
         # Set up directories
-        setup_directories()
+        setup_directories(modules_dir, cnl_dir, output_dir)
         
         # Initialize components
         module_extractor = OntologyModuleExtractor()
         cnl_generator = CNLGenerator()
         
         # Step 1: Extract modules based on worst metrics
-        logger.info("Step 1: Extracting modules based on worst metrics...")
-        module_paths = module_extractor.process_ontology_modularization(
-            ontology_path=ontology_path,
-            metrics_json_path=metrics_path,
-            seed_terms_json_path=seed_terms_path
-        )
+        if module_paths:
+            logger.info(f"Step 1: Using {len(module_paths)} modules extracted with the seed terms")
+        else:
+            logger.info("Step 1: Extracting modules based on worst metrics...")
+            if on_stage:
+                on_stage('module_extraction')
+            module_paths = module_extractor.process_ontology_modularization(
+                ontology_path=ontology_path,
+                metrics_json_path=metrics_path,
+                seed_terms_json_path=seed_terms_path,
+                output_dir=modules_dir
+            )
         
         if not module_paths:
             logger.error("No modules were created. Cannot proceed.")
@@ -84,7 +105,9 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
             
         # Step 2: Generate CNL from modules
         logger.info("Step 2: Generating CNL from modules...")
-        cnl_files = cnl_generator.process_modules_to_cnl(module_paths, os.path.join("output", "cnl"))
+        if on_stage:
+            on_stage('module_cnl')
+        cnl_files = cnl_generator.process_modules_to_cnl(module_paths, cnl_dir)
         
         # If no CNL files were generated by the generator, check if owl_to_cnl.py may have
         # created them directly with .txt extension
@@ -94,7 +117,6 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
                 txt_path = Path(module_path).with_suffix('.txt')
                 if os.path.exists(txt_path) and os.path.getsize(txt_path) > 0:
                     # Copy to the cnl directory
-                    cnl_dir = "output/cnl"
                     os.makedirs(cnl_dir, exist_ok=True)
                     cnl_file = os.path.join(cnl_dir, f"{Path(module_path).stem}_cnl.txt")
                     
@@ -118,6 +140,14 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
         # Step 3: Generate recommendations based on CNL and metrics
         logger.info("Step 3: Generating recommendations...")
         
+        # Metrics and recommenders are shared by all modules
+        with open(metrics_path, 'r') as f:
+            metrics_data = f.read()
+        if mode in ["basic", "both"] and basic_recommender is None:
+            basic_recommender = BasicRecommendations()
+        if mode in ["advanced", "both"] and advanced_recommender is None:
+            advanced_recommender = AdvancedRecommendations()
+        
         for cnl_file in cnl_files:
             # Get base name for reporting
             base_name = Path(cnl_file).stem.replace('_cnl', '')
@@ -138,12 +168,11 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
                 
             # Generate recommendations based on mode, for each module
             # Save reports with module-specific filenames
+            if on_stage:
+                on_stage(f"recommendations:{base_name}")
             if mode in ["basic", "both"]:
                 logger.info(f"Generating basic recommendations for {base_name}...")
                 try:
-                    basic_recommender = BasicRecommendations()
-                    with open(metrics_path, 'r') as f:
-                        metrics_data = f.read()
                     # Save to output_dir with module name
                     basic_report_path = os.path.join(
                         output_dir,
@@ -156,25 +185,26 @@ def generate_modular_recommendations(ontology_path, metrics_path, seed_terms_pat
                         output_file=basic_report_path
                     )
                     logger.info(f"Basic recommendations saved to {basic_report_path}")
+                    if on_report:
+                        on_report(basic_report_path)
                 except Exception as e:
                     logger.error(f"Error generating basic recommendations: {e}")
             if mode in ["advanced", "both"]:
                 logger.info(f"Generating advanced recommendations for {base_name}...")
                 try:
-                    adv_recommender = AdvancedRecommendations()
-                    with open(metrics_path, 'r') as f:
-                        metrics_data = f.read()
                     adv_report_path = os.path.join(
                         output_dir,
                         f"{base_name}_advanced_recommendations.md"
                     )
-                    adv_result, _ = adv_recommender.generate_advanced_recommendations(
+                    adv_result, _ = advanced_recommender.generate_advanced_recommendations(
                         cnl_text=cnl_content,
                         metrics_data=metrics_data,
                         seed_terms_json_path=seed_terms_path,
                         output_file=adv_report_path
                     )
                     logger.info(f"Advanced recommendations saved to {adv_report_path}")
+                    if on_report:
+                        on_report(adv_report_path)
                 except Exception as e:
                     logger.error(f"Error generating advanced recommendations: {e}")
         
@@ -200,7 +230,9 @@ if __name__ == "__main__":
             metrics_path=args.metrics_path,
             seed_terms_path=args.seed_terms_path,
             mode=args.mode,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            modules_dir=args.modules_dir,
+            cnl_dir=args.cnl_dir
         )
         
         if success:
@@ -6,7 +6,9 @@ import subprocess
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import sys
+from seed_terms_selector import parse_worst_range
 
 # Configure logging
 logging.basicConfig(
@@ -60,18 +62,12 @@ class OntologyModuleExtractor:
             if not metric_row.empty:
                 worst_range = metric_row['1 (Worst)'].iloc[0]
                 
-                # Check if the score falls in the worst range
+                # Check if the score falls in the worst range, parsed like the seed term selector does
                 is_worst = False
-                if worst_range.startswith('<'):
-                    # Format: "< 0.2"
-                    threshold = float(worst_range.split()[1])
-                    is_worst = score < threshold
-                elif worst_range.startswith('>'):
-                    # Format: "> 12" or ">0. 8" (with typo)
-                    # Fix any typos in the CSV
-                    cleaned = worst_range.replace('>0.', '> 0.').replace('>0 .', '> 0.')
-                    threshold = float(cleaned.split()[1])
-                    is_worst = score > threshold
+                parsed = parse_worst_range(str(worst_range))
+                if parsed is not None:
+                    range_type, threshold = parsed
+                    is_worst = score < threshold if range_type == 'less_than' else score > threshold
                 
                 if is_worst:
                     worst_metrics.append((metric_name, score))
@@ -138,7 +134,8 @@ class OntologyModuleExtractor:
             with open(metrics_data_path, 'r') as f:
                 metrics_data = json.load(f)
             
-            metrics = metrics_data.get('metrics', {})
+            # Metrics that timed out or failed in the engine are null
+            metrics = {k: v for k, v in metrics_data.get('metrics', {}).items() if isinstance(v, (int, float))}
             
             # Identify worst metrics
             worst_metrics = self._identify_worst_metrics(metrics)
@@ -522,6 +519,59 @@ class OntologyModuleExtractor:
             logger.error(f"Error in ontology modularization process: {e}")
             return []
 
+class StreamedModuleExtraction:
+    """
+    Extracts the modules of the metrics that select_worst_metric_for_module picks while seed
+    terms are still being selected. Pass seed_terms_ready as the on_metric callback of
+    SeedTermSelector.select_seed_terms: each module is built in a background thread as soon
+    as its metric's seed terms arrive, and module_paths waits for the modules.
+    """
+    
+    def __init__(self, extractor: OntologyModuleExtractor, ontology_path: str, metrics_json_path: str,
+                 output_dir: str):
+        self.extractor = extractor
+        self.ontology_path = ontology_path
+        self.output_dir = output_dir
+        _, self.metrics = extractor.select_worst_metric_for_module(metrics_json_path, auto_select=True)
+        self._pending = {self._metric_key(metric): metric for metric in self.metrics}
+        # One worker: modules of tied metrics are written to the same file
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures = []
+    
+    @staticmethod
+    def _metric_key(metric_name: str) -> str:
+        # Seed terms are keyed by metric with or without the 'Onto' suffix
+        return metric_name[:-4] if metric_name.endswith('Onto') else metric_name
+    
+    @property
+    def started(self) -> bool:
+        return len(self._futures) > 0
+    
+    def seed_terms_ready(self, metric_name: str, seed_terms: List[Dict]):
+        """Start extracting the module of metric_name if it is one of the selected metrics."""
+        metric = self._pending.pop(self._metric_key(metric_name), None)
+        if metric is None:
+            return
+        logger.info(f"Seed terms for {metric} are ready, extracting its module in the background")
+        self._futures.append(self._executor.submit(
+            self.extractor.create_ontology_module,
+            ontology_path=self.ontology_path,
+            output_dir=self.output_dir,
+            metric_name=metric,
+            seed_terms=seed_terms
+        ))
+    
+    def module_paths(self) -> List[str]:
+        """Wait for the started extractions and return the paths of the modules created."""
+        try:
+            return [path for path in (future.result() for future in self._futures) if path]
+        finally:
+            self.close()
+    
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
 if __name__ == "__main__":
     if len(sys.argv) != 4:
         print("Usage: python module_extractor.py <ontology_path> <metrics_json_path> <seed_terms_json_path>")
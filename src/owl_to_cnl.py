@@ -1,6 +1,7 @@
+import time
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from verbalizer.process import Processor
 from verbalizer.vocabulary import Vocabulary
@@ -41,14 +42,37 @@ def convert_owl_to_cnl(owl_file_path: str, output_file: Optional[str] = None) ->
     Returns:
         Path to the generated text file
     """
-    if not Path(owl_file_path).exists():
-        raise FileNotFoundError(f"OWL file not found: {owl_file_path}")
-    
     if output_file is None:
         output_file = str(Path(owl_file_path).with_suffix('.txt'))
     
+    cnl_text = verbalize_ontology(owl_file_path)
+    
+    logger.info(f"Writing CNL to {output_file}")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(cnl_text)
+    
+    logger.info("Conversion completed successfully")
+    return output_file
+
+def verbalize_ontology(owl_file_path: str, stats: Optional[Dict] = None) -> str:
+    """
+    Convert an OWL file to CNL and return the text without writing it anywhere.
+    
+    Args:
+        owl_file_path: Path to the input OWL file
+        stats: Optional dict that receives the ontology size (triples, classes,
+               individuals) and the parse/verbalization times in seconds
+    
+    Returns:
+        The CNL text, one paragraph per verbalized class or individual
+    """
+    if not Path(owl_file_path).exists():
+        raise FileNotFoundError(f"OWL file not found: {owl_file_path}")
+    
     logger.info(f"Loading ontology from {owl_file_path}")
+    started = time.perf_counter()
     ontology = Processor.from_file(owl_file_path)
+    parsed = time.perf_counter()
     
     vocab = Vocabulary(ontology, ignore=IGNORE_URIS, rephrased=REPHRASE_URIS)
     verbalizer = Verbalizer(vocab)
@@ -63,20 +87,23 @@ def convert_owl_to_cnl(owl_file_path: str, output_file: Optional[str] = None) ->
     
     logger.info("Converting to CNL...")
     for i, concept in enumerate(classes + individuals, 1):
-        _, cnl_text, _, stats = verbalizer.verbalize(concept)
+        _, cnl_text, _, concept_stats = verbalizer.verbalize(concept)
         
-        if stats.statements > 0:
+        if concept_stats.statements > 0:
             all_statements.append(cnl_text)
         
         if i % 100 == 0:
             logger.info(f"Processed {i}/{total_concepts} concepts")
     
-    logger.info(f"Writing CNL to {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n\n'.join(all_statements))
-    
-    logger.info("Conversion completed successfully")
-    return output_file
+    if stats is not None:
+        stats.update({
+            'triples': len(ontology),
+            'classes': len(classes),
+            'individuals': len(individuals),
+            'parse_seconds': parsed - started,
+            'verbalize_seconds': time.perf_counter() - parsed,
+        })
+    return '\n\n'.join(all_statements)
 
 if __name__ == "__main__":
     import sys
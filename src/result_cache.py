@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows: there eviction is only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(paths: List[str]) -> str:
+    """Return a single SHA-256 digest over the names and contents of several files."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        digest.update(hash_file(path).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def make_key(*parts) -> str:
+    """Build a cache key from the content hash and stage parameters."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent, content-addressed store for pipeline stage artifacts.
+
+    Each entry lives in ``<cache_dir>/<key[:2]>/<key>/`` and holds one or more files.
+    Reads refresh the entry's modification time, and writes evict the least recently
+    used entries until the cache is back under ``max_bytes``. Several processes (gunicorn
+    and batch workers) can share the directory: replacing and evicting entries is
+    serialized through a lock on ``<cache_dir>/.lock``, and an entry evicted while it
+    is being read is a miss.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        logger.info(f"Result cache at {self.cache_dir} (limit {max_bytes // (1024 * 1024)} MB)")
+
+    @classmethod
+    def from_env(cls, default_dir: str) -> Optional['ResultCache']:
+        """
+        Create the cache configured through RESULT_CACHE_DIR and RESULT_CACHE_MAX_MB.
+        Returns None when RESULT_CACHE_MAX_MB is 0.
+        """
+        max_mb = int(os.getenv('RESULT_CACHE_MAX_MB', '1024'))
+        if max_mb <= 0:
+            logger.info("Result cache disabled (RESULT_CACHE_MAX_MB=0)")
+            return None
+        return cls(os.getenv('RESULT_CACHE_DIR', default_dir), max_mb * 1024 * 1024)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    @contextmanager
+    def _locked(self):
+        """Hold the lock of this process and the lock file shared with other processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.cache_dir / '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Return the files stored under key as a name -> path mapping, or None on a miss."""
+        entry_dir = self._entry_dir(key)
+        try:
+            files = {p.name: str(p) for p in entry_dir.iterdir() if p.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not files:
+            return None
+        try:
+            os.utime(entry_dir, None)
+        except OSError:
+            pass
+        return files
+
+    def get_file(self, key: str) -> Optional[str]:
+        """Return the single file stored under key, or None on a miss."""
+        files = self.get(key)
+        if not files:
+            return None
+        return next(iter(files.values()))
+
+    def restore(self, key: str, dest_path: str) -> bool:
+        """Copy the single file stored under key to dest_path. Returns False on a miss."""
+        cached = self.get_file(key)
+        if cached is None:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        try:
+            shutil.copyfile(cached, dest_path)
+        except FileNotFoundError:
+            # Evicted or replaced by another process since the lookup
+            logger.info(f"Cache entry {key} disappeared while being restored")
+            return False
+        return True
+
+    def put(self, key: str, paths: List[str]):
+        """Store copies of the given files under key, replacing any previous entry."""
+        entry_dir = self._entry_dir(key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{key[:8]}-", dir=entry_dir.parent))
+        try:
+            for path in paths:
+                shutil.copyfile(path, staging_dir / os.path.basename(path))
+            with self._locked():
+                if entry_dir.exists():
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(staging_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        self._evict()
+
+    def put_file(self, key: str, path: str):
+        """Store a single file under key."""
+        self.put(key, [path])
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._locked():
+            entries = []
+            total = 0
+            for shard in self.cache_dir.iterdir():
+                if not shard.is_dir():
+                    continue
+                for entry_dir in shard.iterdir():
+                    if not entry_dir.is_dir() or entry_dir.name.startswith('.'):
+                        continue
+                    try:
+                        size = sum(p.stat().st_size for p in entry_dir.iterdir() if p.is_file())
+                        entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+                    except FileNotFoundError:
+                        # Removed meanwhile, e.g. by the engine's reasoner cache, which does not take the lock
+                        continue
+                    total += size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort(key=lambda e: e[0])
+            evicted = 0
+            for _, size, entry_dir in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                evicted += 1
+            logger.info(f"Evicted {evicted} cache entries ({total // 1024} KB in use)")
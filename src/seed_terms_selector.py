@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
 import json
 import csv
 import logging
+import threading
 import subprocess
-import re
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -17,41 +19,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Assembled by compile.sh (mvn clean compile assembly:single)
+DEFAULT_JAR = Path(__file__).resolve().parent.parent / "target" / "calculation_engine-1.0-SNAPSHOT-jar-with-dependencies.jar"
+EXTRACTOR_MAIN_CLASS = "com.calculation_engine.seedTermsExtraction.RunGenericExtractor"
+
+# Same number syntax and whitespace as MetricRanges.java, so both sides accept the same cells
+THRESHOLD_PATTERN = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+ASCII_WHITESPACE = ' \t\n\x0b\f\r'
+
+
+def parse_worst_range(worst_range: str) -> Optional[Tuple[str, float]]:
+    """
+    Parse a "1 (Worst)" cell of oquare_metrics.csv, e.g. "< 0.2" or "> 12", into
+    ('less_than' | 'greater_than', threshold). Whitespace inside the number is ignored,
+    which fixes typos such as ">0. 8". Returns None for any other format. These are the
+    rules of MetricRanges.java, so the engine and the Python pipeline agree on the worst band.
+    """
+    cell = worst_range.strip(ASCII_WHITESPACE)
+    threshold = re.sub(f'[{ASCII_WHITESPACE}]', '', cell[1:])
+    if not THRESHOLD_PATTERN.fullmatch(threshold):
+        return None
+    if cell.startswith('<'):
+        return 'less_than', float(threshold)
+    if cell.startswith('>'):
+        return 'greater_than', float(threshold)
+    return None
+
+
 class SeedTermSelector:
-    def __init__(self, metrics_ranges_csv: str = "metrics/oquare_metrics.csv"):
-        """Initialize the selector with metrics ranges."""
+    def __init__(self, metrics_ranges_csv: str = "metrics/oquare_metrics.csv", jar_path: str = None):
+        """Initialize the selector with metrics ranges and the calculation-engine jar."""
         self.metrics_ranges = self._load_metrics_ranges(metrics_ranges_csv)
-        self.java_class_path = "target/calculation_engine-1.0-SNAPSHOT-jar-with-dependencies.jar"
+        self.java_class_path = str(jar_path or DEFAULT_JAR)
         
     def _load_metrics_ranges(self, csv_path: str) -> Dict[str, Dict[str, Any]]:
         """Load metrics ranges from CSV file."""
         metrics_ranges = {}
         try:
-            with open(csv_path, 'r') as f:
+            with open(csv_path, 'r', encoding='utf-8-sig') as f:
                 reader = csv.DictReader(f)
                 for row in reader:
-                    metric_name = row['Metric']
+                    metric_name = row['Metric'].strip()
                     # Store the worst score range (column "1 (Worst)")
-                    worst_range = row['1 (Worst)']
-                    
-                    # Parse the worst range
-                    if worst_range.startswith('<'):
-                        # Format: "< 0.2"
-                        upper_bound = float(worst_range.split()[1])
-                        range_type = 'less_than'
-                        threshold = upper_bound
-                    elif worst_range.startswith('>'):
-                        # Format: "> 12" or ">0. 8" (with typo)
-                        # Fix any typos in the CSV
-                        cleaned = worst_range.replace('>0.', '> 0.').replace('>0 .', '> 0.')
-                        lower_bound = float(cleaned.split()[1])
-                        range_type = 'greater_than'
-                        threshold = lower_bound
-                    else:
-                        # This shouldn't happen with the current CSV
+                    worst_range = row['1 (Worst)'] or ''
+                    parsed = parse_worst_range(worst_range)
+                    if parsed is None:
                         logger.warning(f"Unknown range format: {worst_range} for {metric_name}")
                         continue
                     
+                    range_type, threshold = parsed
                     metrics_ranges[metric_name] = {
                         'type': range_type,
                         'threshold': threshold
@@ -133,35 +149,7 @@ class SeedTermSelector:
             with open(metrics_data_path, 'r') as f:
                 metrics_data = json.load(f)
             
-            # Select worst metrics
-            worst_metrics = self.select_worst_metrics(metrics_data.get('metrics', {}))
-            
-            if not worst_metrics:
-                logger.warning("No worst metrics found. Using all metrics.")
-                # If no worst metrics found, call the extractor for all metrics
-                command = [
-                    "mvn", "exec:java",
-                    "-Dexec.mainClass=com.calculation_engine.seedTermsExtraction.RunGenericExtractor",
-                    f"-Dexec.args={ontology_path}"
-                ]
-            else:
-                # Join worst metrics with comma for the Java program
-                metrics_arg = ",".join(worst_metrics)
-                command = [
-                    "mvn", "exec:java",
-                    "-Dexec.mainClass=com.calculation_engine.seedTermsExtraction.RunGenericExtractor",
-                    f"-Dexec.args={ontology_path} {metrics_arg}"
-                ]
-            
-            logger.info(f"Running command: {' '.join(command)}")
-            result = subprocess.run(command, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                logger.error(f"Error extracting seed terms: {result.stderr}")
-                raise Exception(f"Seed term extraction failed with code {result.returncode}")
-            
-            # Parse the output into a structured format
-            seed_terms = self._parse_seed_terms_output(result.stdout)
+            seed_terms = self.select_seed_terms(ontology_path, metrics_data)
             
             # Save to JSON
             with open(output_json_path, 'w') as f:
@@ -174,56 +162,87 @@ class SeedTermSelector:
             logger.error(f"Error in extract_seed_terms: {e}")
             raise
 
-    def _parse_seed_terms_output(self, output: str) -> Dict:
-        """Parse the output of the Java seed term extractor into a structured format."""
+    def select_seed_terms(self, ontology_path: str, metrics_data: Dict,
+                          on_metric: Optional[Callable[[str, List[Dict]], None]] = None) -> Dict:
+        """
+        Extract seed terms for the worst metrics from already-loaded metrics data.
+        
+        Args:
+            ontology_path: Path to the ontology file (.owl/.rdf)
+            metrics_data: Parsed metrics JSON (with a 'metrics' object)
+            on_metric: Optional callback called with (metric, seed terms) as soon as each
+                       metric is done, so callers can start on it while the rest run
+            
+        Returns:
+            Dict containing the extracted seed terms
+        """
+        # The engine extracts seed terms in the same pass as the metrics when given the ranges CSV
+        if 'seed_terms' in metrics_data:
+            worst = metrics_data.get('worst_metrics') or ['all metrics']
+            logger.info(f"Using seed terms extracted with the metrics for: {', '.join(worst)}")
+            if on_metric is not None:
+                for metric, terms in metrics_data['seed_terms'].items():
+                    on_metric(metric, terms)
+            return metrics_data['seed_terms']
+        
+        # Select worst metrics
+        worst_metrics = self.select_worst_metrics(metrics_data.get('metrics', {}))
+        
+        if not worst_metrics:
+            logger.warning("No worst metrics found. Using all metrics.")
+        
         seed_terms = {}
-        current_metric = None
+        for metric, terms in self.iter_seed_terms(ontology_path, worst_metrics):
+            logger.info(f"Extracted {len(terms)} seed terms for {metric}")
+            seed_terms[metric] = terms
+            if on_metric is not None:
+                on_metric(metric, terms)
+        return seed_terms
+
+    def iter_seed_terms(self, ontology_path: str, metrics: List[str]) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Run the Java seed term extractor and yield (metric, seed terms) as each metric finishes.
         
-        # Regular expressions for parsing the output
-        metric_re = re.compile(r'Metric: (\w+)')
-        seed_term_re = re.compile(r'Seed term: (.+)')
-        iri_re = re.compile(r'Full IRI: (.+)')
+        The extractor writes one JSON line per metric to stdout (--ndjson -), each term being
+        {"term", "iri", "score"}; its log output goes to stderr and is only kept for errors.
+        An empty metrics list runs the extractors of all metrics.
+        """
+        if not os.path.exists(self.java_class_path):
+            raise FileNotFoundError(f"Calculation engine jar not found at {self.java_class_path}; run ./compile.sh first")
         
-        lines = output.strip().split('\n')
-        current_terms = []
+        # Run the extractor straight from the assembled jar, so no Maven is needed at runtime
+        command = ["java", "-cp", self.java_class_path, EXTRACTOR_MAIN_CLASS, ontology_path]
+        if metrics:
+            # Join worst metrics with comma for the Java program
+            command.append(",".join(metrics))
+        command += ["--ndjson", "-"]
         
-        for line in lines:
-            line = line.strip()
-            
-            # Match metric line
-            metric_match = metric_re.match(line)
-            if metric_match:
-                # If we were processing a previous metric, store its terms
-                if current_metric:
-                    seed_terms[current_metric] = current_terms
-                
-                # Start a new metric
-                current_metric = metric_match.group(1)
-                current_terms = []
-                continue
-            
-            # Match seed term line
-            seed_term_match = seed_term_re.match(line)
-            if seed_term_match and current_metric:
-                term = seed_term_match.group(1)
-                current_terms.append({
-                    "term": term,
-                    "iri": None  # Will be updated when we find the IRI
-                })
-                continue
-            
-            # Match IRI line
-            iri_match = iri_re.match(line)
-            if iri_match and current_metric and current_terms:
-                # Update the most recently added term with its IRI
-                iri = iri_match.group(1)
-                current_terms[-1]["iri"] = iri
+        logger.info(f"Running command: {' '.join(command)}")
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, encoding='utf-8')
+        stderr_tail = deque(maxlen=20)
+        stderr_reader = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+        stderr_reader.start()
         
-        # Don't forget to store the last metric
-        if current_metric:
-            seed_terms[current_metric] = current_terms
+        finished = False
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                yield record['metric'], record['seed_terms']
+            finished = True
+        finally:
+            # The caller stopped early or the output was malformed: do not leave the JVM running
+            if not finished:
+                process.kill()
+            returncode = process.wait()
+            stderr_reader.join(timeout=5)
         
-        return seed_terms
+        if returncode != 0:
+            logger.error(f"Error extracting seed terms: {''.join(stderr_tail)}")
+            raise Exception(f"Seed term extraction failed with code {returncode}")
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
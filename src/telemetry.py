@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import uuid
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds: from sub-second Python stages up to long LLM/JVM runs
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry: Optional['Registry'] = None
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _check_fork(self):
+        """Drop values inherited through fork. Must be called with the lock held."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._check_fork()
+            self._values[key] = self._values.get(key, 0) + amount
+        if self.registry is not None:
+            self.registry.changed()
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        """This process's value per label set."""
+        with self._lock:
+            self._check_fork()
+            return dict(self._values)
+
+    def add_samples(self, total: Dict, samples: Dict):
+        for key, value in samples.items():
+            total[key] = total.get(key, 0) + value
+
+    def collect(self, samples: Optional[Dict] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted((self.samples() if samples is None else samples).items()):
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in the Prometheus exposition layout."""
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = LATENCY_BUCKETS,
+                 labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.labelnames = tuple(labelnames)
+        self.registry: Optional['Registry'] = None
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _check_fork(self):
+        """Drop values inherited through fork. Must be called with the lock held."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._series = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._check_fork()
+            # One slot per bucket, then sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+        if self.registry is not None:
+            self.registry.changed()
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the with-block, whether or not it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Dict[Tuple[str, ...], List[float]]:
+        """This process's bucket counts, sum and count per label set."""
+        with self._lock:
+            self._check_fork()
+            return {key: list(series) for key, series in self._series.items()}
+
+    def add_samples(self, total: Dict, samples: Dict):
+        for key, series in samples.items():
+            if len(series) != len(self.buckets) + 2:
+                # Written with other buckets, e.g. by an older version of this module
+                continue
+            if key in total:
+                total[key] = [a + b for a, b in zip(total[key], series)]
+            else:
+                total[key] = list(series)
+
+    def collect(self, samples: Optional[Dict] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted((self.samples() if samples is None else samples).items()):
+            labels = dict(zip(self.labelnames, key))
+            for index, bound in enumerate(self.buckets):
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {_format_value(series[index])}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(series[-1])}")
+        return lines
+
+
+class CallbackGauge:
+    """Gauge whose value is read from a callback at scrape time (e.g. the job queue depth)."""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        try:
+            lines.append(f"{self.name} {_format_value(self.callback())}")
+        except Exception as e:
+            logger.warning(f"Could not read gauge {self.name}: {e}")
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+
+    With a directory (set_directory), counters and histograms are added up across processes:
+    every process writes its own values to a file of its own there, at most flush_interval
+    seconds after they change (and when it exits or renders), and render sums the files of
+    all processes, including those that have exited since. Gauges read from callbacks stay
+    per process.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        self._metrics = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.directory: Optional[Path] = None
+        self.flush_interval = flush_interval
+        self._path: Optional[Path] = None
+        self._pid = os.getpid()
+        # Values changed since the last write, and the timer that will write them
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._timer_pid = os.getpid()
+        atexit.register(self.flush)
+        if directory:
+            self.set_directory(directory)
+
+    def set_directory(self, directory: str):
+        """Share counters and histograms with the other processes using directory."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._write_lock:
+            self._path = None
+
+    def clear_directory(self):
+        """Delete the values of earlier runs. Call once at startup, before other processes write."""
+        if self.directory is None:
+            return
+        for entry in list(self.directory.glob('*.json')) + list(self.directory.glob('*.tmp')):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+        with self._write_lock:
+            self._path = None
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        if hasattr(metric, 'samples'):
+            metric.registry = self
+        return metric
+
+    def _shared_metrics(self) -> List:
+        with self._lock:
+            return [metric for metric in self._metrics if hasattr(metric, 'samples')]
+
+    def changed(self):
+        """Schedule writing this process's values, when values are shared through a directory."""
+        if self.directory is None:
+            return
+        with self._flush_lock:
+            self._dirty = True
+            # A timer of the parent process did not survive the fork
+            if self._timer is None or self._timer_pid != os.getpid():
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer_pid = os.getpid()
+                self._timer.start()
+
+    def flush(self):
+        """Write this process's values to its file now if they changed since the last write."""
+        if self.directory is None:
+            return
+        with self._write_lock:
+            with self._flush_lock:
+                dirty, self._dirty = self._dirty, False
+                self._timer = None
+            if not dirty:
+                return
+            # Taken under the write lock so that a later snapshot is never written first
+            data = {metric.name: [[list(key), value] for key, value in metric.samples().items()]
+                    for metric in self._shared_metrics()}
+            # A forked process starts a file of its own
+            if self._path is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._path = self.directory / f"{self._pid}-{uuid.uuid4().hex[:8]}.json"
+            temporary = self._path.with_suffix('.tmp')
+            try:
+                with open(temporary, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(temporary, self._path)
+            except OSError as e:
+                logger.warning(f"Could not write telemetry to {self._path}: {e}")
+
+    def _read_directory(self) -> Dict[str, Dict]:
+        """Sum the values written by every process, by metric name."""
+        metrics = {metric.name: metric for metric in self._shared_metrics()}
+        totals: Dict[str, Dict] = {name: {} for name in metrics}
+        for entry in self.directory.glob('*.json'):
+            try:
+                with open(entry, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                # Removed or replaced while being read
+                continue
+            for name, samples in data.items():
+                if name in metrics:
+                    metrics[name].add_samples(totals[name], {tuple(key): value for key, value in samples})
+        return totals
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        totals = None
+        if self.directory is not None:
+            self.flush()
+            totals = self._read_directory()
+        lines = []
+        for metric in metrics:
+            if totals is not None and metric.name in totals:
+                lines.extend(metric.collect(totals[metric.name]))
+            else:
+                lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'ontoinsight_stage_duration_seconds', 'Duration of each pipeline stage.', labelnames=('stage',)))
+EVALUATIONS = REGISTRY.register(Counter(
+    'ontoinsight_evaluations_total', 'Finished evaluations by kind and outcome.', ('kind', 'status')))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'ontoinsight_cache_requests_total', 'Result cache lookups by stage and result (hit/miss).', ('stage', 'result')))
+ONTOLOGY_BYTES = REGISTRY.register(Histogram(
+    'ontoinsight_ontology_size_bytes', 'Size of evaluated ontology files.',
+    buckets=(1e4, 1e5, 1e6, 1e7, 5e7, 1e8, 5e8, 1e9)))
+ONTOLOGY_TRIPLES = REGISTRY.register(Histogram(
+    'ontoinsight_ontology_triples', 'Number of triples of evaluated ontologies.',
+    buckets=(1e3, 1e4, 1e5, 1e6, 1e7, 1e8)))
+ONTOLOGY_CLASSES = REGISTRY.register(Histogram(
+    'ontoinsight_ontology_classes', 'Number of named classes of evaluated ontologies.',
+    buckets=(10, 100, 1e3, 1e4, 1e5, 1e6)))
+LLM_REQUESTS = REGISTRY.register(Counter(
+    'ontoinsight_llm_requests_total', 'LLM completion requests by recommender.', ('recommender',)))
+LLM_TOKENS = REGISTRY.register(Counter(
+    'ontoinsight_llm_tokens_total', 'LLM tokens used by recommender and type (prompt/completion).',
+    ('recommender', 'type')))
+LLM_DURATION = REGISTRY.register(Histogram(
+    'ontoinsight_llm_request_duration_seconds', 'Duration of LLM completion requests.',
+    labelnames=('recommender',)))
+
+
+def timed(stage: str):
+    """Decorator recording the duration of every call in the stage latency histogram."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with STAGE_DURATION.time(stage=stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_llm_response(recommender: str, response, duration: float):
+    """Record one chat completion: request count, latency and token usage when the API reports it."""
+    LLM_REQUESTS.inc(recommender=recommender)
+    LLM_DURATION.observe(duration, recommender=recommender)
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        LLM_TOKENS.inc(getattr(usage, 'prompt_tokens', 0) or 0, recommender=recommender, type='prompt')
+        LLM_TOKENS.inc(getattr(usage, 'completion_tokens', 0) or 0, recommender=recommender, type='completion')
+
+
+def track_evaluation(kind: str):
+    """Decorator counting a pipeline's runs by outcome and timing the whole evaluation."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                with STAGE_DURATION.time(stage=f"pipeline:{kind}"):
+                    result = func(*args, **kwargs)
+            except Exception:
+                EVALUATIONS.inc(kind=kind, status='failed')
+                raise
+            EVALUATIONS.inc(kind=kind, status='succeeded')
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+import os
+import lzma
+import time
+import uuid
+import zlib
+import shutil
+import hashlib
+import logging
+import zipfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_EXTENSIONS = {'owl', 'rdf', 'ttl'}
+COMPRESSION_EXTENSIONS = {'gz': 'gzip', 'xz': 'xz', 'zip': 'zip'}
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised when an upload is malformed (bad name, bad archive, too large...)."""
+
+
+class UploadOffsetError(UploadError):
+    """Raised when a chunk does not start where the previous one ended."""
+
+    def __init__(self, expected_offset: int, received_offset: int):
+        super().__init__(f"Chunk starts at byte {received_offset} but the upload is at byte {expected_offset}")
+        self.expected_offset = expected_offset
+
+
+def split_filename(filename: str):
+    """
+    Split an upload name into (ontology name, compression), e.g. 'go.owl.gz' -> ('go.owl', 'gzip').
+    Zip archives keep their own name since the ontology name is only known after extraction.
+    """
+    name, _, extension = filename.rpartition('.')
+    extension = extension.lower()
+    if extension in COMPRESSION_EXTENSIONS:
+        compression = COMPRESSION_EXTENSIONS[extension]
+        return (filename if compression == 'zip' else name), compression
+    return filename, None
+
+
+def is_allowed_upload(filename: str) -> bool:
+    """Check for an OWL/RDF/TTL file, optionally compressed with gzip or xz, or a zip archive."""
+    if '.' not in filename:
+        return False
+    name, compression = split_filename(filename)
+    if compression == 'zip':
+        return True
+    return '.' in name and name.rsplit('.', 1)[1].lower() in ONTOLOGY_EXTENSIONS
+
+
+class UploadSession:
+    """
+    One (possibly chunked) upload. Chunks are appended in order; gzip and xz payloads are
+    decompressed as they arrive and the decompressed bytes are hashed on the way to disk,
+    so the ontology's SHA-256 is ready as soon as the last chunk lands. Zip archives need
+    their central directory, so they are stored as-is and extracted on completion.
+    """
+
+    def __init__(self, root: Path, filename: str, total_size: Optional[int], max_bytes: int):
+        self.upload_id = uuid.uuid4().hex
+        self.filename = filename
+        self.total_size = total_size
+        self.max_bytes = max_bytes
+        self.ontology_name, self.compression = split_filename(filename)
+        self.directory = root / self.upload_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.received = 0
+        self.written = 0
+        self.sha256 = None
+        self.path: Optional[str] = None
+        self.completed = False
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.lock = threading.Lock()
+
+        self._hasher = hashlib.sha256()
+        if self.compression == 'gzip':
+            self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        elif self.compression == 'xz':
+            self._decompressor = lzma.LZMADecompressor()
+        else:
+            self._decompressor = None
+        self._target = self.directory / (self.filename if self.compression == 'zip' else self.ontology_name)
+        self._out = open(self._target, 'wb')
+
+    def write_chunk(self, stream: BinaryIO, offset: int) -> int:
+        """Append the bytes of stream, which must start at offset, and return the new offset."""
+        if self.completed:
+            raise UploadError("Upload is already complete")
+        if offset != self.received:
+            raise UploadOffsetError(self.received, offset)
+
+        while True:
+            data = stream.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            self.received += len(data)
+            if self.total_size is not None and self.received > self.total_size:
+                raise UploadError(f"Upload exceeds its declared size of {self.total_size} bytes")
+            self._decompress(data)
+        self.updated_at = time.time()
+        return self.received
+
+    def complete(self) -> Dict:
+        """Finish the upload, extracting zip archives, and return its description."""
+        if self.completed:
+            return self.to_dict()
+        if self.total_size is not None and self.received != self.total_size:
+            raise UploadError(f"Upload is incomplete: received {self.received} of {self.total_size} bytes")
+
+        if self._decompressor is not None:
+            if not self._decompressor.eof:
+                raise UploadError(f"Truncated {self.compression} stream")
+            if self.compression == 'gzip':
+                self._write(self._decompressor.flush())
+        self._out.close()
+
+        if self.compression == 'zip':
+            self._extract_zip()
+        else:
+            self.path = str(self._target)
+            self.sha256 = self._hasher.hexdigest()
+
+        self.completed = True
+        logger.info(f"Upload {self.upload_id} complete: {self.ontology_name} "
+                    f"({self.received} bytes received, {self.written} bytes stored)")
+        return self.to_dict()
+
+    def discard(self):
+        """Close the session and remove its files."""
+        if not self._out.closed:
+            self._out.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def to_dict(self) -> Dict:
+        data = {
+            'upload_id': self.upload_id,
+            'filename': self.filename,
+            'compression': self.compression,
+            'offset': self.received,
+            'size': self.total_size,
+            'completed': self.completed,
+        }
+        if self.completed:
+            data['ontology'] = self.ontology_name
+            data['sha256'] = self.sha256
+            data['bytes'] = self.written
+        return data
+
+    def _decompress(self, data: bytes):
+        """
+        Decompress data and write it out in steps of at most READ_CHUNK_SIZE bytes, so a
+        small, highly compressed chunk is rejected once it passes max_bytes instead of
+        being expanded in memory first.
+        """
+        if self._decompressor is None:
+            self._write(data)
+            return
+        if self._decompressor.eof:
+            raise UploadError("Unexpected data after the end of the compressed stream")
+        try:
+            while not self._decompressor.eof:
+                limit = max(1, min(READ_CHUNK_SIZE, self.max_bytes - self.written + 1))
+                output = self._decompressor.decompress(data, limit)
+                self._write(output)
+                if self.compression == 'gzip':
+                    # Input left over after a full output step is kept in unconsumed_tail
+                    data = self._decompressor.unconsumed_tail
+                    if not data and len(output) < limit:
+                        break
+                else:
+                    # The xz decompressor buffers left-over input itself
+                    data = b''
+                    if self._decompressor.needs_input:
+                        break
+        except (zlib.error, lzma.LZMAError) as e:
+            raise UploadError(f"Invalid {self.compression} data: {str(e)}") from e
+
+    def _write(self, data: bytes):
+        if not data:
+            return
+        self.written += len(data)
+        if self.written > self.max_bytes:
+            raise UploadError(f"Ontology exceeds the maximum size of {self.max_bytes} bytes")
+        if self.compression != 'zip':
+            self._hasher.update(data)
+        self._out.write(data)
+
+    def _extract_zip(self):
+        """Extract the single ontology member of a zip archive, hashing it while it is copied."""
+        try:
+            with zipfile.ZipFile(self._target) as archive:
+                members = [info for info in archive.infolist()
+                           if not info.is_dir() and is_allowed_upload(os.path.basename(info.filename))
+                           and split_filename(os.path.basename(info.filename))[1] is None]
+                if len(members) != 1:
+                    raise UploadError(f"Zip archive must contain exactly one .owl, .rdf or .ttl file "
+                                      f"(found {len(members)})")
+                member = members[0]
+                if member.file_size > self.max_bytes:
+                    raise UploadError(f"Ontology exceeds the maximum size of {self.max_bytes} bytes")
+
+                self.ontology_name = os.path.basename(member.filename)
+                target = self.directory / self.ontology_name
+                hasher = hashlib.sha256()
+                self.written = 0
+                with archive.open(member) as source, open(target, 'wb') as out:
+                    while True:
+                        data = source.read(READ_CHUNK_SIZE)
+                        if not data:
+                            break
+                        self.written += len(data)
+                        if self.written > self.max_bytes:
+                            raise UploadError(f"Ontology exceeds the maximum size of {self.max_bytes} bytes")
+                        hasher.update(data)
+                        out.write(data)
+        except zipfile.BadZipFile as e:
+            raise UploadError(f"Invalid zip archive: {str(e)}") from e
+
+        os.remove(self._target)
+        self.path = str(target)
+        self.sha256 = hasher.hexdigest()
+
+
+class UploadStore:
+    """
+    Keeps upload sessions under ``root``. Sessions that have not been touched for
+    ``ttl_seconds`` are discarded, whether or not they were completed.
+    """
+
+    def __init__(self, root: str, max_bytes: int, ttl_seconds: int = 3600):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, UploadSession] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, default_dir: str) -> 'UploadStore':
+        """Create an upload store configured through UPLOAD_MAX_MB and UPLOAD_TTL_SECONDS."""
+        return cls(
+            default_dir,
+            max_bytes=int(os.getenv('UPLOAD_MAX_MB', '2048')) * 1024 * 1024,
+            ttl_seconds=int(os.getenv('UPLOAD_TTL_SECONDS', '3600'))
+        )
+
+    def remove_leftovers(self):
+        """
+        Delete the files of sessions this store does not know. Sessions live in memory, so
+        at server startup anything on disk is left over from a previous run.
+        """
+        with self._lock:
+            known = set(self._sessions)
+        for entry in self.root.iterdir():
+            if entry.name not in known:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def create(self, filename: str, total_size: Optional[int] = None) -> UploadSession:
+        """Start a new upload session for filename."""
+        if not is_allowed_upload(filename):
+            raise UploadError('File format not supported. Use .owl, .rdf or .ttl, optionally as .gz, .xz or .zip')
+        self._expire()
+        session = UploadSession(self.root, filename, total_size, self.max_bytes)
+        with self._lock:
+            self._sessions[session.upload_id] = session
+        logger.info(f"Started upload {session.upload_id} for {filename}")
+        return session
+
+    def get(self, upload_id: str) -> Optional[UploadSession]:
+        """Look up an upload session by its ID."""
+        with self._lock:
+            return self._sessions.get(upload_id)
+
+    def find_by_hash(self, sha256: str) -> Optional[UploadSession]:
+        """Return a completed upload whose ontology has the given SHA-256, if any."""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.completed and session.sha256 == sha256:
+                    return session
+        return None
+
+    def ingest(self, filename: str, stream: BinaryIO) -> UploadSession:
+        """Store a whole (non-chunked) upload in one go and return the completed session."""
+        session = self.create(filename)
+        try:
+            with session.lock:
+                session.write_chunk(stream, 0)
+                session.complete()
+        except Exception:
+            self.discard(session.upload_id)
+            raise
+        return session
+
+    def discard(self, upload_id: str) -> bool:
+        """Remove an upload session and its files."""
+        with self._lock:
+            session = self._sessions.pop(upload_id, None)
+        if session is None:
+            return False
+        session.discard()
+        return True
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [upload_id for upload_id, session in self._sessions.items() if session.updated_at < cutoff]
+            expired_sessions = [self._sessions.pop(upload_id) for upload_id in expired]
+        for session in expired_sessions:
+            session.discard()
+        if expired:
+            logger.info(f"Expired {len(expired)} upload sessions")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import time
+import uuid
+import shutil
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Workspace:
+    """
+    Private scratch directory for one evaluation.
+
+    Mirrors the layout of the shared output/ tree (ontologies, seed_terms, modules,
+    cnl, reports) under ``<root>/<workspace_id>/`` so that concurrent evaluations of
+    ontologies with the same file name never read or overwrite each other's artifacts.
+    """
+
+    def __init__(self, root: str, workspace_id: Optional[str] = None):
+        self.workspace_id = workspace_id or uuid.uuid4().hex
+        self.root = Path(root) / self.workspace_id
+        self.uploads_dir = self.root / "uploads"
+        self.ontologies_dir = self.root / "ontologies"
+        self.seed_terms_dir = self.ontologies_dir / "seed_terms"
+        self.modules_dir = self.ontologies_dir / "modules"
+        self.cnl_dir = self.root / "cnl"
+        self.reports_dir = self.root / "reports"
+
+        for directory in (self.uploads_dir, self.seed_terms_dir, self.modules_dir,
+                          self.cnl_dir, self.reports_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def upload_path(self, filename: str) -> str:
+        """Location for the uploaded ontology file."""
+        return str(self.uploads_dir / filename)
+
+    def converted_ontology_path(self, base_name: str) -> str:
+        return str(self.ontologies_dir / f"{base_name}_converted.owl")
+
+    def seed_terms_path(self, base_name: str) -> str:
+        return str(self.seed_terms_dir / f"{base_name}_seed_terms.json")
+
+    def cnl_path(self, base_name: str) -> str:
+        return str(self.cnl_dir / f"{base_name}.txt")
+
+    def report_path(self, base_name: str, mode: str) -> str:
+        return str(self.reports_dir / f"{base_name}_{mode}_recommendations.md")
+
+    def cleanup(self):
+        """Remove the workspace and everything in it."""
+        shutil.rmtree(self.root, ignore_errors=True)
+        logger.info(f"Removed workspace {self.workspace_id}")
+
+    def __enter__(self) -> 'Workspace':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+    @staticmethod
+    def reap_stale(root: str, max_age_seconds: int) -> int:
+        """Remove workspaces under root that were last modified more than max_age_seconds ago."""
+        root_path = Path(root)
+        if not root_path.is_dir():
+            return 0
+
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for entry in root_path.iterdir():
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"Removed {removed} stale workspaces from {root}")
+        return removed
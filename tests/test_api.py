@@ -0,0 +1,277 @@
+import io
+import os
+import json
+import time
+import tempfile
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('pandas')
+pytest.importorskip('openai')
+
+# Settings read when api.py is imported: no engine JVMs, no result cache, telemetry out of the tree,
+# and a placeholder key so the recommender modules load (the LLM is never called)
+os.environ.setdefault('AI_API_KEY', 'test-key')
+os.environ.setdefault('ENGINE_POOL_SIZE', '0')
+os.environ.setdefault('RESULT_CACHE_MAX_MB', '0')
+os.environ.setdefault('TELEMETRY_DIR', tempfile.mkdtemp(prefix='ontoinsight-telemetry-'))
+
+import api
+from src.job_manager import JobManager
+from src.upload_store import UploadStore
+
+ONTOLOGY = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:owl="http://www.w3.org/2002/07/owl#">
+  <owl:Class rdf:about="http://example.org/pets#Dog"/>
+</rdf:RDF>
+"""
+METRICS = {'status': 'complete', 'scoring_mode': 'full', 'metrics': {'DITOnto': 2.0, 'NOCOnto': 1.0}}
+SEED_TERMS = {'DIT': [{'term': 'Dog', 'iri': 'http://example.org/pets#Dog', 'score': 1}]}
+CNL = 'Every dog is an animal.\n' * 5000
+REPORT = '# Recommendations\n\nAdd definitions.\n'
+
+
+def fake_scoring(ontology_path, scoring_mode='full', content_hash=None):
+    metrics_file = f"{ontology_path}_metrics.json"
+    with open(metrics_file, 'w', encoding='utf-8') as f:
+        json.dump(dict(METRICS, scoring_mode=scoring_mode), f)
+    return metrics_file
+
+
+def fake_seed_terms(ontology_path, metrics_content, base_name, workspace, on_metric=None):
+    path = workspace.seed_terms_path(base_name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(SEED_TERMS, f)
+    return path, SEED_TERMS
+
+
+def fake_cnl(ontology_path, base_name, workspace):
+    path = workspace.cnl_path(base_name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(CNL)
+    return path, CNL
+
+
+def fake_report(mode, cnl_text, metrics_data, seed_terms_file, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(REPORT)
+    return output_file
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client whose pipeline runs every stage but the JVM, the seed-term extractor, CNL and LLM."""
+    ready = threading.Event()
+    ready.set()
+    monkeypatch.setattr(api, '_ready', ready)
+    monkeypatch.setattr(api, 'WORKSPACES_DIR', tmp_path / 'jobs')
+    monkeypatch.setattr(api, 'upload_store', UploadStore(str(tmp_path / 'uploads'), max_bytes=1024 * 1024))
+    monkeypatch.setattr(api, 'job_manager', JobManager(max_workers=1))
+    monkeypatch.setattr(api, 'result_cache', None)
+    monkeypatch.setattr(api, 'run_oquare_scoring', fake_scoring)
+    monkeypatch.setattr(api, 'extract_seed_terms', fake_seed_terms)
+    monkeypatch.setattr(api, 'generate_cnl', fake_cnl)
+    monkeypatch.setattr(api, 'generate_report', fake_report)
+    (tmp_path / 'jobs').mkdir()
+    return api.app.test_client()
+
+
+def evaluate(client, query='', **form):
+    data = dict(form, ontology=(io.BytesIO(ONTOLOGY), 'pets.owl'))
+    return client.post(f'/api/evaluate-full{query}', data=data, content_type='multipart/form-data')
+
+
+def wait_for_job(client, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f'/api/jobs/{job_id}').get_json()
+        if status['status'] in ('succeeded', 'failed'):
+            return status
+        time.sleep(0.02)
+    pytest.fail(f"job {job_id} did not finish")
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+        if fields:
+            events.append({'id': int(fields['id']), 'event': fields['event'], 'data': json.loads(fields['data'])})
+    return events
+
+
+def test_async_evaluation_is_queued_and_reports_its_result(client):
+    response = evaluate(client, '?async=true')
+    assert response.status_code == 202
+    accepted = response.get_json()
+    assert accepted['status'] == 'accepted'
+    assert accepted['status_url'] == f"/api/jobs/{accepted['job_id']}"
+
+    status = wait_for_job(client, accepted['job_id'])
+    assert status['status'] == 'succeeded'
+    assert status['result']['metrics'] == METRICS
+    assert status['result']['report'] == REPORT
+    assert set(status['artifacts']) == {'converted_ontology', 'metrics', 'seed_terms', 'cnl', 'report'}
+
+    artifact = client.get(f"/api/jobs/{accepted['job_id']}/artifacts/report")
+    assert artifact.status_code == 200
+    assert artifact.data.decode('utf-8') == REPORT
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/jobs/missing').status_code == 404
+    assert client.get('/api/jobs/missing/events').status_code == 404
+
+
+def test_event_stream_reports_stages_artifacts_and_outcome(client):
+    job_id = evaluate(client, '?async=true').get_json()['job_id']
+    wait_for_job(client, job_id)
+
+    response = client.get(f'/api/jobs/{job_id}/events')
+    assert response.mimetype == 'text/event-stream'
+    events = parse_events(response.get_data(as_text=True))
+
+    assert [event['id'] for event in events] == list(range(len(events)))
+    starts = [event['data']['stage'] for event in events if event['event'] == 'stage-start']
+    assert starts == ['preprocessing', 'oquare_scoring', 'seed_terms', 'cnl', 'recommendations']
+    assert all('elapsed' in event['data'] for event in events if event['event'] == 'stage-end')
+    # The metrics arrive with their content as soon as scoring is done, before the report
+    names = [event['data']['name'] for event in events if event['event'] == 'artifact']
+    assert names.index('metrics') < names.index('report')
+    metrics_event = next(event for event in events
+                         if event['event'] == 'artifact' and event['data']['name'] == 'metrics')
+    assert metrics_event['data']['content'] == METRICS
+    assert events[-1]['event'] == 'succeeded'
+
+    # A reconnecting client only gets what it missed
+    resumed = client.get(f'/api/jobs/{job_id}/events', headers={'Last-Event-ID': str(events[-3]['id'])})
+    assert parse_events(resumed.get_data(as_text=True)) == events[-2:]
+
+
+def test_failed_job_ends_its_event_stream_with_the_error(client, monkeypatch):
+    def failing_scoring(ontology_path, scoring_mode='full', content_hash=None):
+        raise RuntimeError('engine crashed')
+    monkeypatch.setattr(api, 'run_oquare_scoring', failing_scoring)
+
+    job_id = evaluate(client, '?async=true').get_json()['job_id']
+    status = wait_for_job(client, job_id)
+    assert status['status'] == 'failed'
+    assert status['error'] == 'engine crashed'
+
+    events = parse_events(client.get(f'/api/jobs/{job_id}/events').get_data(as_text=True))
+    assert events[-1]['event'] == 'failed'
+    assert events[-1]['data']['error'] == 'engine crashed'
+
+
+@pytest.fixture
+def batch_client(client, monkeypatch):
+    """Batch items run on a thread pool, where the stubbed stages apply, instead of the process pool."""
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(api, 'get_batch_pool', lambda: pool)
+    yield client
+    pool.shutdown()
+
+
+def zip_archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_batch_archive_returns_a_metrics_table_and_every_report(batch_client):
+    archive = zip_archive({'pets.owl': ONTOLOGY, 'farm/animals.owl': ONTOLOGY, 'README.txt': b'not an ontology'})
+    response = batch_client.post('/api/evaluate-batch', data={'archive': (archive, 'batch.zip')},
+                                 content_type='multipart/form-data')
+    assert response.status_code == 200
+    result = response.get_json()
+
+    assert result['count'] == 2 and result['failed'] == 0
+    assert result['metrics_table']['columns'] == ['ontology', 'sha256', 'status', 'DITOnto', 'NOCOnto']
+    assert [row[0] for row in result['metrics_table']['rows']] == ['pets.owl', 'farm/animals.owl']
+    assert all(row[2:] == ['success', 2.0, 1.0] for row in result['metrics_table']['rows'])
+    assert [item['report'] for item in result['results']] == [REPORT, REPORT]
+
+
+def test_batch_reports_failed_items_without_failing(batch_client, monkeypatch):
+    def scoring(ontology_path, scoring_mode='full', content_hash=None):
+        if 'broken' in ontology_path:
+            raise RuntimeError('Ontology is inconsistent')
+        return fake_scoring(ontology_path, scoring_mode, content_hash)
+    monkeypatch.setattr(api, 'run_oquare_scoring', scoring)
+
+    archive = zip_archive({'pets.owl': ONTOLOGY, 'broken.owl': ONTOLOGY})
+    result = batch_client.post('/api/evaluate-batch', data={'archive': (archive, 'batch.zip')},
+                               content_type='multipart/form-data').get_json()
+
+    assert result['failed'] == 1
+    statuses = {item['ontology']: item['status'] for item in result['results']}
+    assert statuses == {'pets.owl': 'success', 'broken.owl': 'failed'}
+    failed = next(item for item in result['results'] if item['status'] == 'failed')
+    assert failed['error'] == 'Ontology is inconsistent'
+
+
+def test_batch_of_upload_hashes(batch_client):
+    session = api.upload_store.ingest('pets.owl', io.BytesIO(ONTOLOGY))
+    result = batch_client.post('/api/evaluate-batch', json={'hashes': [session.sha256]}).get_json()
+    assert result['count'] == 1
+    assert result['results'][0]['sha256'] == session.sha256
+
+    response = batch_client.post('/api/evaluate-batch', json={'hashes': ['0' * 64]})
+    assert response.status_code == 404
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_fields_select_the_result_fields(client):
+    response = evaluate(client, '?fields=metrics')
+    assert response.status_code == 200
+    assert set(response.get_json()) == {'status', 'mode', 'scoring_mode', 'base_name', 'metrics'}
+
+    response = evaluate(client, '?fields=metrics,bogus')
+    assert response.status_code == 400
+    assert 'bogus' in response.get_json()['error']
+
+
+def test_ndjson_streams_large_text_fields_in_chunks(client):
+    response = evaluate(client, '?format=ndjson&fields=cnl,metrics')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = read_ndjson(response)
+
+    values = {line['field']: line['value'] for line in lines if 'value' in line}
+    assert values['metrics'] == METRICS
+    chunks = [line['chunk'] for line in lines if line['field'] == 'cnl']
+    assert len(chunks) > 1
+    assert all(len(chunk) <= api.NDJSON_CHUNK_SIZE for chunk in chunks)
+    assert ''.join(chunks) == CNL
+
+
+def test_links_replace_artifacts_and_keep_them_downloadable(client):
+    result = evaluate(client, '?links=true&fields=report,cnl').get_json()
+    report_url = result['report']['artifact']
+    assert result['cnl']['artifact'].endswith('/artifacts/cnl')
+
+    artifact = client.get(report_url)
+    assert artifact.status_code == 200
+    assert artifact.data.decode('utf-8') == REPORT
+
+
+def test_job_status_applies_the_response_options(client):
+    job_id = evaluate(client, '?async=true').get_json()['job_id']
+    wait_for_job(client, job_id)
+
+    status = client.get(f'/api/jobs/{job_id}?fields=report').get_json()
+    assert status['status'] == 'succeeded'
+    assert set(status['result']) == {'status', 'mode', 'scoring_mode', 'base_name', 'report'}
+
+    lines = read_ndjson(client.get(f'/api/jobs/{job_id}?format=ndjson&fields=report'))
+    assert lines[0]['job']['job_id'] == job_id
+    assert ''.join(line['chunk'] for line in lines[1:] if line['field'] == 'report') == REPORT
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+
+import pytest
+
+from src.engine_client import EnginePool, EngineError, EngineLostError, EngineUnavailableError
+
+# Stands in for `Main --daemon`: the same JSON-lines protocol, with the behaviour picked by the
+# ontology's file name. Each metrics file it writes holds its pid, so tests can tell engines apart
+FAKE_DAEMON = r'''
+import os
+import sys
+import json
+import time
+
+if sys.argv[1:] == ['--fail-startup']:
+    sys.exit(3)
+print(json.dumps({'status': 'ready'}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    response = {'id': request['id']}
+    if request.get('command') == 'ping':
+        response.update(status='ok', pong=True)
+    else:
+        name = os.path.basename(request['ontology'])
+        metrics_file = request['ontology'] + '_metrics.json'
+        with open(metrics_file, 'w') as f:
+            json.dump({'pid': os.getpid(), 'request': request}, f)
+        if name.startswith('slow'):
+            time.sleep(60)
+        if name.startswith('crash'):
+            sys.exit(1)
+        if name.startswith('inconsistent'):
+            response.update(status='error', message='Ontology is inconsistent')
+        elif name.startswith('partial'):
+            response.update(status='error', message='timed out', restart=True, partial=True, metrics_file=metrics_file)
+        else:
+            response.update(status='ok', metrics_file=metrics_file, elapsed_ms=1)
+            if name.startswith('leaky'):
+                response['restart'] = True
+    print(json.dumps(response), flush=True)
+    if response.get('restart'):
+        sys.exit(2)
+'''
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    script = tmp_path / 'fake_daemon.py'
+    script.write_text(FAKE_DAEMON, encoding='utf-8')
+    pools = []
+
+    def make(*args, **kwargs):
+        pool = EnginePool('unused.jar', size=1, startup_timeout=10, **kwargs)
+        pool.command = [sys.executable, str(script)] + list(args)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def score(pool, path, **kwargs):
+    """Score path and return the pid of the engine that wrote the metrics file."""
+    metrics_file = pool.score(str(path), **kwargs)
+    with open(metrics_file, encoding='utf-8') as f:
+        return json.load(f)['pid']
+
+
+def test_engine_is_kept_warm_between_requests(make_pool, tmp_path):
+    pool = make_pool()
+    first = score(pool, tmp_path / 'a.owl', scoring_mode='consistency', content_hash='ab' * 32)
+    second = score(pool, tmp_path / 'b.owl')
+
+    assert first == second
+    with open(tmp_path / 'a.owl_metrics.json', encoding='utf-8') as f:
+        request = json.load(f)['request']
+    assert request['scoring_mode'] == 'consistency'
+    assert request['content_hash'] == 'ab' * 32
+    health = pool.health()
+    assert (health['running'], health['healthy_idle'], health['restarts']) == (1, 1, 0)
+
+
+def test_engine_asking_for_a_restart_is_replaced(make_pool, tmp_path):
+    pool = make_pool()
+    leaky = score(pool, tmp_path / 'leaky.owl')
+    assert pool.restarts == 1
+    assert score(pool, tmp_path / 'a.owl') != leaky
+
+
+def test_partial_metrics_of_a_timed_out_engine_are_returned(make_pool, tmp_path):
+    pool = make_pool()
+    assert pool.score(str(tmp_path / 'partial.owl')) == str(tmp_path / 'partial.owl_metrics.json')
+    assert pool.restarts == 1
+
+
+def test_engine_error_keeps_the_engine(make_pool, tmp_path):
+    pool = make_pool()
+    before = score(pool, tmp_path / 'a.owl')
+    with pytest.raises(EngineError, match='inconsistent') as raised:
+        pool.score(str(tmp_path / 'inconsistent.owl'))
+    assert not isinstance(raised.value, (EngineLostError, EngineUnavailableError))
+    assert score(pool, tmp_path / 'b.owl') == before
+    assert pool.restarts == 0
+
+
+def test_request_timeout_replaces_the_engine_without_falling_back(make_pool, tmp_path):
+    pool = make_pool(request_timeout=0.5)
+    before = score(pool, tmp_path / 'a.owl')
+    with pytest.raises(EngineLostError, match='did not answer') as raised:
+        pool.score(str(tmp_path / 'slow.owl'))
+    # The API falls back to a one-shot JVM only on EngineUnavailableError
+    assert not isinstance(raised.value, EngineUnavailableError)
+    assert pool.restarts == 1
+    assert score(pool, tmp_path / 'b.owl') != before
+
+
+def test_engine_dying_mid_request_is_lost(make_pool, tmp_path):
+    pool = make_pool()
+    with pytest.raises(EngineLostError, match='exited'):
+        pool.score(str(tmp_path / 'crash.owl'))
+    assert pool.restarts == 1
+    assert pool.health()['running'] == 0
+
+
+def test_engine_that_does_not_start_is_unavailable(make_pool, tmp_path):
+    pool = make_pool('--fail-startup')
+    with pytest.raises(EngineUnavailableError):
+        pool.score(str(tmp_path / 'a.owl'))
+    assert pool.health()['running'] == 0
+    assert pool.start() == 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_forked_process_starts_engines_of_its_own(make_pool, tmp_path):
+    pool = make_pool()
+    parent_engine = score(pool, tmp_path / 'a.owl')
+
+    child = os.fork()
+    if child == 0:
+        # Report through the exit code; the parent's engine must not be used or stopped
+        code = 1
+        try:
+            if pool.health()['running'] == 0 and score(pool, tmp_path / 'child.owl') != parent_engine:
+                code = 0
+            pool.close()
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(child, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert score(pool, tmp_path / 'b.owl') == parent_engine
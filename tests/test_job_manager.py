@@ -0,0 +1,103 @@
+import time
+import threading
+
+import pytest
+
+from src.job_manager import JobManager, EvaluationJob, JobQueueFullError
+
+
+def wait_until_finished(job, timeout=5):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        job.wait_for_events(len(job.events) - 1, 0.1)
+    assert job.finished
+
+
+def test_job_reports_stages_artifacts_and_result():
+    manager = JobManager(max_workers=1)
+
+    def pipeline(job, name):
+        job.set_stage('metrics')
+        job.add_artifact('metrics', f'/tmp/{name}_metrics.json', content={'DITOnto': 3})
+        job.set_stage('report')
+        return {'base_name': name}
+
+    job = manager.submit('full', pipeline, 'pizza', params={'mode': 'basic'})
+    wait_until_finished(job)
+
+    status = job.to_dict()
+    assert status['status'] == 'succeeded'
+    assert status['result'] == {'base_name': 'pizza'}
+    assert status['artifacts'] == ['metrics']
+    assert status['params'] == {'mode': 'basic'}
+    events = [(event['event'], event['data'].get('stage')) for event in job.events]
+    assert events == [('stage-start', 'metrics'), ('artifact', None), ('stage-end', 'metrics'),
+                      ('stage-start', 'report'), ('stage-end', 'report'), ('succeeded', None)]
+    assert manager.get(job.job_id) is job
+
+
+def test_failed_job_records_the_error():
+    manager = JobManager(max_workers=1)
+
+    def pipeline(job):
+        raise RuntimeError('engine crashed')
+
+    job = manager.submit('full', pipeline)
+    wait_until_finished(job)
+
+    status = job.to_dict()
+    assert status['status'] == 'failed'
+    assert status['error'] == 'engine crashed'
+    assert 'result' not in status
+
+
+def test_submissions_over_the_pending_limit_are_rejected():
+    manager = JobManager(max_workers=1, max_pending=1)
+    release = threading.Event()
+    job = manager.submit('full', lambda job: release.wait(5))
+    try:
+        with pytest.raises(JobQueueFullError):
+            manager.submit('full', lambda job: None)
+        assert manager.pending_count() == 1
+    finally:
+        release.set()
+    wait_until_finished(job)
+    assert manager.pending_count() == 0
+
+
+def test_finished_jobs_expire_and_run_their_cleanup():
+    manager = JobManager(max_workers=1, ttl_seconds=60)
+    cleaned = []
+
+    old = EvaluationJob('full')
+    old.add_cleanup(lambda: cleaned.append(old.job_id))
+    old.finish(result={})
+    old.finished_at -= 120
+    running = EvaluationJob('full')
+    running.created_at -= 120
+    manager.register(old)
+    manager.register(running)
+
+    # Expiry runs on the next registration or submission
+    fresh = EvaluationJob('full')
+    fresh.finish(result={})
+    manager.register(fresh)
+
+    assert manager.get(old.job_id) is None
+    assert cleaned == [old.job_id]
+    assert manager.get(running.job_id) is running
+    assert manager.get(fresh.job_id) is fresh
+
+
+def test_finished_jobs_expire_when_jobs_are_looked_up():
+    manager = JobManager(max_workers=1, ttl_seconds=60)
+    cleaned = []
+    old = EvaluationJob('full')
+    old.add_cleanup(lambda: cleaned.append(old.job_id))
+    old.finish(result={})
+    manager.register(old)
+    old.finished_at -= 120
+
+    assert manager.list_jobs() == []
+    assert cleaned == [old.job_id]
+    assert manager.get(old.job_id) is None
@@ -0,0 +1,62 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from seed_terms_selector import SeedTermSelector, parse_worst_range
+
+JAR_FILE = Path(__file__).resolve().parent.parent / 'target' / 'calculation_engine-1.0-SNAPSHOT-jar-with-dependencies.jar'
+
+# Cells as they appear in oquare_metrics.csv, typos included, and cells neither side accepts
+RANGES_CSV = '﻿' + '\n'.join([
+    'Metric,1 (Worst),5 (Best)',
+    'ANOnto,< 0.2,> 0.8',
+    'AROnto,<0.2,> 0.8',
+    'CBOnto,> 12,<= 2',
+    'CROnto,>0. 8,< 0.2',
+    'DITOnto,>0 .8,< 2',
+    'LCOMOnto, > 1e1 ,< 2',
+    'NOMOnto,n/a,< 2',
+    'RFCOnto,>,< 2',
+    'TMOnto,> 0.8x,< 0.2',
+    'WMCOnto,>= 3,< 2',
+]) + '\n'
+
+EXPECTED = {
+    'ANOnto': {'type': 'less_than', 'threshold': 0.2},
+    'AROnto': {'type': 'less_than', 'threshold': 0.2},
+    'CBOnto': {'type': 'greater_than', 'threshold': 12.0},
+    'CROnto': {'type': 'greater_than', 'threshold': 0.8},
+    'DITOnto': {'type': 'greater_than', 'threshold': 0.8},
+    'LCOMOnto': {'type': 'greater_than', 'threshold': 10.0},
+}
+
+
+@pytest.fixture
+def ranges_csv(tmp_path):
+    path = tmp_path / 'oquare_metrics.csv'
+    path.write_text(RANGES_CSV, encoding='utf-8')
+    return path
+
+
+def test_parse_worst_range_fixes_whitespace_typos():
+    assert parse_worst_range('>0. 8') == ('greater_than', 0.8)
+    assert parse_worst_range('< 0.2') == ('less_than', 0.2)
+    assert parse_worst_range('>= 3') is None
+    assert parse_worst_range('') is None
+
+
+def test_selector_loads_the_expected_table(ranges_csv):
+    selector = SeedTermSelector(str(ranges_csv), jar_path='unused.jar')
+    assert selector.metrics_ranges == EXPECTED
+    assert selector.select_worst_metrics({'CROnto': 0.9, 'ANOnto': 0.5, 'CBOnto': 12, 'DITOnto': None}) == ['CR']
+
+
+@pytest.mark.skipif(shutil.which('java') is None or not JAR_FILE.exists(),
+                    reason='needs java and the engine jar (./compile.sh)')
+def test_engine_parses_the_same_table(ranges_csv):
+    output = subprocess.run(['java', '-cp', str(JAR_FILE), 'com.calculation_engine.MetricRanges', str(ranges_csv)],
+                            capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == EXPECTED
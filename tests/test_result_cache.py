@@ -0,0 +1,91 @@
+import os
+import time
+import shutil
+
+from src.result_cache import ResultCache, hash_file, hash_files, make_key
+
+
+def write(path, size):
+    path.write_bytes(b'x' * size)
+    return str(path)
+
+
+def age(cache, key, seconds):
+    """Move an entry's last use into the past."""
+    entry_dir = cache.cache_dir / key[:2] / key
+    then = time.time() - seconds
+    os.utime(entry_dir, (then, then))
+
+
+def test_put_and_restore_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=10_000)
+    source = tmp_path / 'metrics.json'
+    source.write_text('{"DITOnto": 3}')
+    key = make_key(hash_file(str(source)), 'metrics', 'full')
+
+    assert cache.get(key) is None
+    cache.put_file(key, str(source))
+    dest = tmp_path / 'out' / 'metrics.json'
+    assert cache.restore(key, str(dest))
+    assert dest.read_text() == '{"DITOnto": 3}'
+
+
+def test_entry_removed_during_restore_is_a_miss(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=10_000)
+    key = make_key('onto', 'metrics')
+    cache.put_file(key, write(tmp_path / 'metrics.json', 10))
+    entry_dir = cache.cache_dir / key[:2] / key
+
+    # Another process evicts the entry between the lookup and the copy
+    get_file = cache.get_file
+    def get_file_then_evict(k):
+        path = get_file(k)
+        shutil.rmtree(entry_dir)
+        return path
+    monkeypatch.setattr(cache, 'get_file', get_file_then_evict)
+
+    assert not cache.restore(key, str(tmp_path / 'out' / 'metrics.json'))
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=2500)
+    keys = [make_key('onto', index) for index in range(3)]
+    for index, key in enumerate(keys[:2]):
+        cache.put_file(key, write(tmp_path / f'artifact{index}', 1000))
+    age(cache, keys[0], 300)
+    age(cache, keys[1], 200)
+
+    # Reading the oldest entry makes it the most recently used one
+    assert cache.get(keys[0]) is not None
+    cache.put_file(keys[2], write(tmp_path / 'artifact2', 1000))
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_put_replaces_an_existing_entry(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=10_000)
+    key = make_key('onto', 'report')
+    first = tmp_path / 'first'
+    first.write_text('old')
+    cache.put_file(key, str(first))
+    second = tmp_path / 'second'
+    second.write_text('new')
+    cache.put(key, [str(second)])
+
+    files = cache.get(key)
+    assert list(files) == ['second']
+
+
+def test_hash_files_depends_on_names_and_contents(tmp_path):
+    a = tmp_path / 'a.owl'
+    b = tmp_path / 'b.owl'
+    a.write_text('one')
+    b.write_text('two')
+    digest = hash_files([str(a), str(b)])
+
+    assert digest == hash_files([str(b), str(a)])
+    b.write_text('changed')
+    assert digest != hash_files([str(a), str(b)])
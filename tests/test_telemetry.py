@@ -0,0 +1,83 @@
+import time
+
+from src.telemetry import Counter, Histogram, Registry
+
+
+def make_registry(directory):
+    registry = Registry(str(directory))
+    counter = registry.register(Counter('test_requests_total', 'Requests.', ('kind',)))
+    histogram = registry.register(Histogram('test_duration_seconds', 'Durations.', buckets=(1, 10)))
+    return registry, counter, histogram
+
+
+def test_render_without_directory_is_per_registry():
+    registry = Registry()
+    counter = registry.register(Counter('test_requests_total', 'Requests.', ('kind',)))
+    counter.inc(kind='full')
+    counter.inc(2, kind='full')
+
+    assert 'test_requests_total{kind="full"} 3' in registry.render()
+
+
+def test_values_are_added_up_across_processes(tmp_path):
+    # Two registries sharing a directory stand in for two processes
+    first, first_counter, first_histogram = make_registry(tmp_path)
+    second, second_counter, second_histogram = make_registry(tmp_path)
+    first_counter.inc(kind='full')
+    second_counter.inc(kind='full')
+    second_counter.inc(kind='modular')
+    first_histogram.observe(0.5)
+    second_histogram.observe(5)
+    # What their timers do within a second
+    first.flush()
+    second.flush()
+
+    for output in (first.render(), second.render()):
+        assert 'test_requests_total{kind="full"} 2' in output
+        assert 'test_requests_total{kind="modular"} 1' in output
+        assert 'test_duration_seconds_bucket{le="1"} 1' in output
+        assert 'test_duration_seconds_bucket{le="10"} 2' in output
+        assert 'test_duration_seconds_bucket{le="+Inf"} 2' in output
+        assert 'test_duration_seconds_sum 5.5' in output
+        assert 'test_duration_seconds_count 2' in output
+
+
+def test_values_of_exited_processes_are_kept_until_cleared(tmp_path):
+    exited, exited_counter, _ = make_registry(tmp_path)
+    exited_counter.inc(kind='full')
+    # What happens at exit
+    exited.flush()
+    del exited, exited_counter
+
+    registry, counter, _ = make_registry(tmp_path)
+    counter.inc(kind='full')
+    assert 'test_requests_total{kind="full"} 2' in registry.render()
+
+    registry.clear_directory()
+    counter.inc(kind='full')
+    assert 'test_requests_total{kind="full"} 2' in registry.render()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+
+def test_changes_are_written_in_batches(tmp_path):
+    registry = Registry(str(tmp_path), flush_interval=60)
+    counter = registry.register(Counter('test_requests_total', 'Requests.', ('kind',)))
+    counter.inc(kind='full')
+    counter.inc(kind='full')
+    assert not list(tmp_path.glob('*.json'))
+
+    registry.flush()
+    files = list(tmp_path.glob('*.json'))
+    assert len(files) == 1
+    assert files[0].read_text(encoding='utf-8') == '{"test_requests_total": [[["full"], 2]]}'
+
+
+def test_timer_writes_the_changes(tmp_path):
+    registry = Registry(str(tmp_path), flush_interval=0.05)
+    counter = registry.register(Counter('test_requests_total', 'Requests.', ('kind',)))
+    counter.inc(kind='full')
+
+    deadline = time.time() + 5
+    while not list(tmp_path.glob('*.json')) and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(list(tmp_path.glob('*.json'))) == 1
@@ -0,0 +1,101 @@
+import io
+import gzip
+import lzma
+import zipfile
+import hashlib
+
+import pytest
+
+from src.upload_store import UploadStore, UploadError, UploadOffsetError
+
+ONTOLOGY = b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>\n' * 2000
+MAX_BYTES = 1024 * 1024
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(str(tmp_path / 'uploads'), max_bytes=MAX_BYTES)
+
+
+def upload_in_chunks(session, data, chunk_size=4096):
+    offset = 0
+    for start in range(0, len(data), chunk_size):
+        offset = session.write_chunk(io.BytesIO(data[start:start + chunk_size]), offset)
+    return offset
+
+
+@pytest.mark.parametrize('suffix, compress', [('', lambda data: data),
+                                              ('.gz', gzip.compress),
+                                              ('.xz', lzma.compress)])
+def test_chunked_upload_hashes_the_decompressed_ontology(store, suffix, compress):
+    payload = compress(ONTOLOGY)
+    session = store.create('onto.owl' + suffix, total_size=len(payload))
+    upload_in_chunks(session, payload)
+    result = session.complete()
+
+    assert result['ontology'] == 'onto.owl'
+    assert result['sha256'] == hashlib.sha256(ONTOLOGY).hexdigest()
+    with open(session.path, 'rb') as stored:
+        assert stored.read() == ONTOLOGY
+    assert store.find_by_hash(result['sha256']) is session
+
+
+def test_upload_resumes_from_the_acknowledged_offset(store):
+    session = store.create('onto.owl', total_size=len(ONTOLOGY))
+    offset = session.write_chunk(io.BytesIO(ONTOLOGY[:1000]), 0)
+
+    # A retried chunk that does not start at the acknowledged offset is refused
+    with pytest.raises(UploadOffsetError) as error:
+        session.write_chunk(io.BytesIO(ONTOLOGY[500:2000]), 500)
+    assert error.value.expected_offset == offset == 1000
+
+    session.write_chunk(io.BytesIO(ONTOLOGY[offset:]), offset)
+    assert session.complete()['sha256'] == hashlib.sha256(ONTOLOGY).hexdigest()
+
+
+def test_incomplete_upload_cannot_complete(store):
+    session = store.create('onto.owl', total_size=len(ONTOLOGY))
+    session.write_chunk(io.BytesIO(ONTOLOGY[:100]), 0)
+    with pytest.raises(UploadError):
+        session.complete()
+
+
+def test_upload_over_the_size_limit_is_rejected(store):
+    session = store.create('big.owl')
+    with pytest.raises(UploadError, match='maximum size'):
+        session.write_chunk(io.BytesIO(b'x' * (MAX_BYTES + 1)), 0)
+
+
+@pytest.mark.parametrize('suffix, compress', [('.gz', gzip.compress), ('.xz', lzma.compress)])
+def test_decompression_bomb_is_rejected_without_expanding_it(store, suffix, compress):
+    bomb = compress(b'\0' * (64 * MAX_BYTES))
+    assert len(bomb) < MAX_BYTES
+    session = store.create('bomb.owl' + suffix)
+    with pytest.raises(UploadError, match='maximum size'):
+        session.write_chunk(io.BytesIO(bomb), 0)
+    # Decompression stops within one read step of the limit
+    assert session.written <= MAX_BYTES + 1024 * 1024
+
+
+def test_truncated_compressed_stream_is_rejected(store):
+    payload = gzip.compress(ONTOLOGY)
+    session = store.create('onto.owl.gz')
+    session.write_chunk(io.BytesIO(payload[:len(payload) // 2]), 0)
+    with pytest.raises(UploadError, match='Truncated'):
+        session.complete()
+
+
+def test_zip_archive_with_one_ontology_is_extracted(store):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('nested/onto.ttl', ONTOLOGY)
+        zf.writestr('README.txt', b'ignored')
+    session = store.ingest('bundle.zip', io.BytesIO(archive.getvalue()))
+
+    assert session.ontology_name == 'onto.ttl'
+    assert session.sha256 == hashlib.sha256(ONTOLOGY).hexdigest()
+
+
+def test_unsupported_file_name_is_rejected(store):
+    with pytest.raises(UploadError):
+        store.create('notes.txt')
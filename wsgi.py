@@ -0,0 +1,12 @@
+"""
+WSGI entry point for the production server.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app enabled the module is imported once in the gunicorn master, so the
+recommenders are built before the workers are forked and every worker starts warm.
+Calculation-engine JVMs are started per worker by the post_fork hook in gunicorn.conf.py.
+"""
+from api import app, warm_up
+
+warm_up(start_engines=False)